@@ -1,10 +1,18 @@
+import asyncio
+import json
 import logging
+import math
+import os
 import time
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional, Any
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional, Any, Union
 
 # Phase 9 — logging setup
 logging.basicConfig(
@@ -14,18 +22,130 @@ logging.basicConfig(
 )
 logger = logging.getLogger("arCh")
 
-from lexer.lexer import Lexer
-from lexer.tokens import Token
+from lexer.engines import make_lexer
 
-from parser.parserV2 import Parser
+from parser.ast_parser import ASTParser
 
-from semantic.ast_builder import ASTBuilder
 from semantic.semantic import SemanticAnalyzer
+from semantic.ast import ASTNode
 
 from tac.tac_generator import TACGenerator, tac_instruction_to_str
 from tac.tac_optimizer import TACOptimizer, optimization_summary
 from tac.tac_codegen   import TACCodeGen
-from tac.tac_runtime   import TACInterpreter
+from tac.engines       import make_interpreter
+from tac.budget        import ExecutionBudget
+
+from compile_cache import CompileCache, CompileArtifacts, source_key
+from lex_sessions import LexSessions, StaleVersion
+from artifact_store import ArtifactStore
+from worker_pool import WorkerPool, WorkerCrashed
+from metrics import MetricsRegistry
+
+
+# Lexer engine: "table" (compiled transition table), "regex" (master regex
+# fast path) or "state" (hand-written reference machine).  All three produce
+# identical tokens and errors.
+LEXER_ENGINE = os.environ.get("ARCH_LEXER_ENGINE", "table")
+
+# Runtime engine for /run: "compiled" (instructions pre-compiled to closures)
+# or "dict" (reference interpreter).  Both produce identical results.
+RUNTIME_ENGINE = os.environ.get("ARCH_RUNTIME_ENGINE", "compiled")
+
+
+def _env_limit(name: str, default: str, cast=int):
+    """A budget limit from the environment; 0 lifts it."""
+    return cast(os.environ.get(name, default)) or None
+
+
+# Execution budget for /run (see tac/budget.py).  A request can tighten any
+# of these limits through its "budget" field, never loosen them.  With
+# ARCH_RUN_MAX_INSTRUCTIONS=0 the interpreter's MAX_ITERATIONS applies, and
+# with ARCH_RUN_MAX_CALL_DEPTH=0 its MAX_CALL_DEPTH.
+#
+# There is no time limit unless ARCH_RUN_MAX_SECONDS sets one: the
+# instruction limit already bounds every run, and a time limit the dict
+# engine hits before it would report a non-terminating program as timed out
+# instead of "Infinite loop detected".
+RUN_BUDGET = ExecutionBudget(
+    max_instructions=_env_limit("ARCH_RUN_MAX_INSTRUCTIONS", "10000000"),
+    max_seconds=_env_limit("ARCH_RUN_MAX_SECONDS", "0", float),
+    max_output_lines=_env_limit("ARCH_RUN_MAX_OUTPUT_LINES", "100000"),
+    max_output_bytes=_env_limit("ARCH_RUN_MAX_OUTPUT_BYTES", str(1024 * 1024)),
+    max_memory_cells=_env_limit("ARCH_RUN_MAX_MEMORY_CELLS", "10000000"),
+    max_call_depth=_env_limit("ARCH_RUN_MAX_CALL_DEPTH", "10000"),
+)
+
+# Profile every /run (see tac/profiler.py); with 0 only requests that set
+# "profile" get one.
+RUN_PROFILE = int(os.environ.get("ARCH_RUN_PROFILE", "0")) > 0
+
+# Compile-result cache: most recently used sources, bounded by entry count
+# and (estimated) bytes.  ARCH_CACHE_ENTRIES=0 disables it.
+COMPILE_CACHE = CompileCache(
+    max_entries=int(os.environ.get("ARCH_CACHE_ENTRIES", "128")),
+    max_bytes=int(os.environ.get("ARCH_CACHE_BYTES", str(64 * 1024 * 1024))),
+)
+
+# Incremental /lex sessions, least recently edited evicted first.  They live
+# in the server process: with several server processes an editor must stick
+# to one (an unknown session gets a 404 and the client re-opens it).
+LEX_SESSIONS = LexSessions(max_sessions=int(os.environ.get("ARCH_LEX_SESSIONS", "256")))
+
+# On-disk store of compiled programs, shared by workers and kept across
+# restarts.  Enabled by pointing ARCH_ARTIFACT_DIR at a writable directory.
+ARTIFACT_DIR = os.environ.get("ARCH_ARTIFACT_DIR")
+ARTIFACT_STORE = (
+    ArtifactStore(ARTIFACT_DIR,
+                  max_bytes=int(os.environ.get("ARCH_ARTIFACT_BYTES", str(256 * 1024 * 1024))))
+    if ARTIFACT_DIR else None
+)
+
+# Metrics served by /metrics (see metrics.py).  Worker processes send theirs
+# back with every job result.
+METRICS = MetricsRegistry()
+PHASE_SECONDS = METRICS.histogram(
+    "arch_phase_seconds",
+    "Time spent in each pipeline phase (parse includes building the AST).",
+    ["phase"])
+REQUEST_SECONDS = METRICS.histogram(
+    "arch_request_seconds", "Time taken to handle HTTP requests.", ["path", "status"])
+CACHE_LOOKUPS = METRICS.counter(
+    "arch_compile_cache_lookups_total",
+    "Compile cache lookups by phase and result (hit / miss).", ["phase", "result"])
+ARTIFACT_LOOKUPS = METRICS.counter(
+    "arch_artifact_store_lookups_total",
+    "Artifact store lookups by result (hit / miss).", ["result"])
+TOKENS = METRICS.counter("arch_tokens_total", "Tokens produced by the lexer.")
+AST_NODES = METRICS.counter("arch_ast_nodes_total", "AST nodes built by the parser.")
+TAC_INSTRUCTIONS = METRICS.counter(
+    "arch_tac_instructions_total",
+    "TAC instructions generated, and left after optimization.", ["stage"])
+EXECUTED = METRICS.counter(
+    "arch_executed_instructions_total", "Instructions executed by the interpreter.",
+    ["engine"])
+
+
+def _drain_metrics():
+    """This worker's metrics since its last job (WorkerPool collect)."""
+    return METRICS.drain()
+
+
+# Worker processes for the /run and /compile pipelines (see worker_pool.py):
+# a number, or "auto" for one per core.  0 runs them in the server process,
+# on uvicorn's threadpool.  Workers are recycled after about
+# ARCH_WORKER_MAX_JOBS jobs each (0 = never).
+_WORKERS = os.environ.get("ARCH_WORKERS", "0")
+WORKERS = (os.cpu_count() or 1) if _WORKERS == "auto" else int(_WORKERS)
+WORKER_POOL = (
+    WorkerPool(WORKERS,
+               max_jobs=int(os.environ.get("ARCH_WORKER_MAX_JOBS", "1000")),
+               warm=[__name__],
+               collect=_drain_metrics, merge=METRICS.merge)
+    if WORKERS > 0 else None
+)
+
+# Most items one /batch/run or /batch/compile request may carry.
+BATCH_MAX_ITEMS = int(os.environ.get("ARCH_BATCH_MAX_ITEMS", "10000"))
 
 
 # =============================================================================
@@ -37,6 +157,46 @@ class LexRequest(BaseModel):
     stdin: List[str] = []   # pre-supplied input lines, one value per write() call
 
 
+class LexEdit(BaseModel):
+    """Replace source[start:start+deleted] with `inserted` (offsets in the
+    normalized source: CRLF as one newline, no BOM)."""
+    start:    int = Field(ge=0)
+    deleted:  int = Field(0, ge=0)
+    inserted: str = ""
+
+
+class LexEditRequest(BaseModel):
+    """/lex body: a whole source, or an edit to an incremental session.
+
+    {"source": ...}                         — lex the source
+    {"source": ..., "incremental": true}    — also open a session on it
+    {"session": ..., "version": n, "edit": {...}}
+                                            — apply an edit made against
+                                              version n of the session
+    """
+    source:      Optional[str]     = None
+    incremental: bool              = False
+    session:     Optional[str]     = None
+    version:     Optional[int]     = None
+    edit:        Optional[LexEdit] = None
+
+
+class RunBudget(BaseModel):
+    """Per-request execution limits for /run; omitted ones use RUN_BUDGET's.
+    Every limit given must be positive (else the request gets a 422)."""
+    max_instructions: Optional[int]   = Field(None, gt=0)
+    max_seconds:      Optional[float] = Field(None, gt=0)
+    max_output_lines: Optional[int]   = Field(None, gt=0)
+    max_output_bytes: Optional[int]   = Field(None, gt=0)
+    max_memory_cells: Optional[int]   = Field(None, gt=0)
+    max_call_depth:   Optional[int]   = Field(None, gt=0)
+
+
+class RunRequest(LexRequest):
+    budget:  Optional[RunBudget] = None
+    profile: bool                = False   # return a RunProfile with the result
+
+
 class TokenResponse(BaseModel):
     tokenType: str
     lexeme: str
@@ -58,6 +218,8 @@ class ErrorResponse(BaseModel):
 class LexResult(BaseModel):
     tokens: List[TokenResponse]
     errors: List[ErrorResponse]
+    session: Optional[str] = None   # incremental session, with the version
+    version: Optional[int] = None   # the tokens are for
 
 
 class ParseResult(BaseModel):
@@ -68,6 +230,40 @@ class SemanticResult(BaseModel):
     errors: List[ErrorResponse]
 
 
+class LimitReport(BaseModel):
+    limit: str                  # the ExecutionBudget field that was exceeded
+    max:   Union[int, float]    # its value
+    used:  Union[int, float]    # what the run reached
+
+
+class ProfileLine(BaseModel):
+    line:  int      # source line
+    count: int      # instructions executed for it
+
+
+class ProfileInstruction(BaseModel):
+    index: int      # into optimized_tac
+    line:  int
+    tac:   str
+    count: int
+
+
+class ProfileFunction(BaseModel):
+    name:         str
+    line:         int
+    calls:        int
+    instructions: int     # executed in its body
+    seconds:      float   # spent in its body, callees excluded
+
+
+class RunProfile(BaseModel):
+    """Where a run spent its instructions (see tac/profiler.py)."""
+    instructions: int
+    lines:        List[ProfileLine]         # by source line
+    hot:          List[ProfileInstruction]  # most executed first
+    functions:    List[ProfileFunction]     # most instructions first
+
+
 class RunResult(BaseModel):
     """
     Response model for the /run endpoint (full pipeline).
@@ -82,6 +278,8 @@ class RunResult(BaseModel):
     output          — list of lines printed by the program's view() calls.
     memory          — final global variable values (temporaries excluded).
     runtime_errors  — non-fatal errors detected during interpretation.
+    limit           — the execution budget limit that stopped the run, if any.
+    profile         — execution counts and function times, when profiled.
     """
     errors:         List[ErrorResponse]   = []
     tac:            List[str]             = []
@@ -91,12 +289,28 @@ class RunResult(BaseModel):
     output:         List[str]             = []
     memory:         dict                  = {}
     runtime_errors: List[str]             = []
+    limit:          Optional[LimitReport] = None
+    profile:        Optional[RunProfile]  = None
 
 
 # =============================================================================
 # Helpers
 # =============================================================================
 
+def _run_budget(requested: Optional[RunBudget]) -> ExecutionBudget:
+    """RUN_BUDGET, tightened by the limits a /run request asked for."""
+    if requested is None:
+        return RUN_BUDGET
+    return RUN_BUDGET.tightened(ExecutionBudget(
+        max_instructions=requested.max_instructions,
+        max_seconds=requested.max_seconds,
+        max_output_lines=requested.max_output_lines,
+        max_output_bytes=requested.max_output_bytes,
+        max_memory_cells=requested.max_memory_cells,
+        max_call_depth=requested.max_call_depth,
+    ))
+
+
 def _make_errors(raw: list, kind: str) -> List[dict]:
     """Attach a kind tag to every raw error from the compiler phases.
 
@@ -135,11 +349,233 @@ def _make_errors(raw: list, kind: str) -> List[dict]:
     return out
 
 
+def _count_ast_nodes(root) -> int:
+    count = 0
+    stack = [root]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, ASTNode):
+            count += 1
+            stack.extend(vars(value).values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return count
+
+
+def _cache_hit(phase: str):
+    COMPILE_CACHE.hit(phase)
+    CACHE_LOOKUPS.inc(phase=phase, result="hit")
+
+
+def _cache_miss(phase: str):
+    COMPILE_CACHE.miss(phase)
+    CACHE_LOOKUPS.inc(phase=phase, result="miss")
+
+
+# =============================================================================
+# Cached pipeline phases
+# =============================================================================
+#
+# Each helper makes sure its phase is stored in the entry, running it (and
+# counting a miss) only when an earlier request has not already done so.
+# Callers run the phases in order and check the previous phase's errors
+# before asking for the next one.
+
+def _lex_phase(entry: CompileArtifacts):
+    if entry.has("lex"):
+        _cache_hit("lex")
+        return
+    _cache_miss("lex")
+    with PHASE_SECONDS.time(phase="lex"):
+        lexer = make_lexer(entry.source, LEXER_ENGINE)
+        entry.tokens = lexer.scan_stream()
+        entry.lex_errors = lexer.errors
+    TOKENS.inc(len(entry.tokens))
+    COMPILE_CACHE.stored(entry)
+
+
+def _parse_phase(entry: CompileArtifacts):
+    """Parse and build the AST in the same pass."""
+    if entry.has("parse"):
+        _cache_hit("parse")
+        return
+    _cache_miss("parse")
+    with PHASE_SECONDS.time(phase="parse"):
+        parser = ASTParser(entry.tokens)
+        parser.parse()
+        entry.ast = parser.ast
+        entry.parse_errors = parser.errors
+    if entry.ast is not None:
+        AST_NODES.inc(_count_ast_nodes(entry.ast))
+    COMPILE_CACHE.stored(entry)
+
+
+def _semantic_phase(entry: CompileArtifacts):
+    if entry.has("semantic"):
+        _cache_hit("semantic")
+        return
+    _cache_miss("semantic")
+    with PHASE_SECONDS.time(phase="semantic"):
+        analyzer = SemanticAnalyzer()
+        entry.semantic_errors = analyzer.analyze(entry.ast)
+    COMPILE_CACHE.stored(entry)
+
+
+def _tac_phase(entry: CompileArtifacts):
+    if entry.has("tac"):
+        _cache_hit("tac")
+        return
+    _cache_miss("tac")
+    with PHASE_SECONDS.time(phase="tac"):
+        gen = TACGenerator()
+        instructions = gen.generate(entry.ast)
+        entry.tac_lines = [tac_instruction_to_str(i) for i in instructions]
+    TAC_INSTRUCTIONS.inc(len(instructions), stage="generated")
+    entry.tac = instructions
+    COMPILE_CACHE.stored(entry)
+
+
+def _optimize_phase(entry: CompileArtifacts):
+    """Optimize the TAC; on optimizer failure fall back to the unoptimized TAC."""
+    if entry.has("optimize"):
+        _cache_hit("optimize")
+        return
+    _cache_miss("optimize")
+    start = time.perf_counter()
+    try:
+        optimizer = TACOptimizer(entry.tac)
+        opt_result = optimizer.optimize()
+        opt_instructions = opt_result["instructions"]
+        logger.info(f"  Phase 6: {opt_result.get('stats', {})}")
+        entry.opt_tac_lines = [tac_instruction_to_str(i) for i in opt_instructions]
+        entry.opt_summary = optimization_summary(opt_result)
+        entry.opt_result = opt_result
+    except Exception as exc:
+        logger.warning(f"  Phase 6 skipped: {exc}")
+        opt_instructions = entry.tac
+        entry.opt_tac_lines = entry.tac_lines
+        entry.opt_summary = f"Optimization skipped: {exc}"
+        entry.opt_result = None
+    PHASE_SECONDS.observe(time.perf_counter() - start, phase="optimize")
+    TAC_INSTRUCTIONS.inc(len(opt_instructions), stage="optimized")
+    entry.opt_instructions = opt_instructions
+    COMPILE_CACHE.stored(entry)
+
+
+def _load_compiled(entry: CompileArtifacts) -> bool:
+    """Fill the entry's TAC listing and optimized TAC from the artifact store.
+
+    Only successful compiles are stored, so a record means phases 1-4
+    reported no errors.  Tokens and AST are not stored; /lex, /parse and
+    /semantic recompute them when asked.
+    """
+    if ARTIFACT_STORE is None:
+        return False
+    record = ARTIFACT_STORE.get(entry.key)
+    ARTIFACT_LOOKUPS.inc(result="miss" if record is None else "hit")
+    if record is None:
+        return False
+    entry.tac_lines = record["tac_lines"]
+    entry.opt_tac_lines = record["opt_tac_lines"]
+    entry.opt_summary = record["opt_summary"]
+    entry.opt_instructions = record["opt_instructions"]
+    COMPILE_CACHE.stored(entry)
+    return True
+
+
+def _store_compiled(entry: CompileArtifacts):
+    if ARTIFACT_STORE is None:
+        return
+    ARTIFACT_STORE.put(entry.key, {
+        "tac_lines": entry.tac_lines,
+        "opt_tac_lines": entry.opt_tac_lines,
+        "opt_summary": entry.opt_summary,
+        "opt_instructions": entry.opt_instructions,
+    })
+
+
+def _compile(entry: CompileArtifacts) -> List[dict]:
+    """Run phases 1-6 for the entry, reusing whatever is cached.
+
+    Returns the errors that stopped the pipeline ([] on success, when the
+    entry holds tac_lines, opt_instructions, opt_tac_lines and opt_summary).
+    """
+    if entry.has("optimize"):
+        _cache_hit("optimize")
+        return []
+    if entry.lex_errors is None and _load_compiled(entry):
+        logger.info("  Phases 1-6: loaded from artifact store")
+        return []
+
+    try:
+        logger.info("  Phase 1: Lexical analysis")
+        _lex_phase(entry)
+        if entry.lex_errors:
+            logger.warning(f"  Phase 1 errors: {len(entry.lex_errors)}")
+            return _make_errors(entry.lex_errors, "lex")
+
+        logger.info("  Phase 2: Syntax analysis")
+        _parse_phase(entry)
+        if entry.parse_errors:
+            logger.warning(f"  Phase 2 errors: {len(entry.parse_errors)}")
+            return _make_errors(entry.parse_errors, "syntax")
+
+        logger.info("  Phase 3: AST construction (during parse)")
+        if entry.ast is None:
+            logger.error("  Phase 3: failed to build AST")
+            return _make_errors([{
+                "message": "Internal error: failed to build AST", "line": 1, "col": 1}], "semantic")
+
+        logger.info("  Phase 4: Semantic analysis")
+        _semantic_phase(entry)
+        if entry.semantic_errors:
+            logger.warning(f"  Phase 4 errors: {len(entry.semantic_errors)}")
+            return _make_errors(entry.semantic_errors, "semantic")
+
+    except Exception as exc:
+        logger.exception(f"  Compiler phase error: {exc}")
+        return _make_errors([{
+            "message": f"Compiler error: {exc}", "line": 1, "col": 1}], "semantic")
+
+    try:
+        logger.info("  Phase 5: TAC generation")
+        _tac_phase(entry)
+    except Exception as exc:
+        logger.exception(f"  TAC generation error: {exc}")
+        return _make_errors([{
+            "message": f"TAC generation error: {exc}", "line": 1, "col": 1}], "semantic")
+
+    # Optimization failure is non-fatal: _optimize_phase falls back to the
+    # unoptimized TAC.
+    logger.info("  Phase 6: Code optimization")
+    _optimize_phase(entry)
+    _store_compiled(entry)
+    return []
+
+
+async def _in_worker(pipeline, *args):
+    """pipeline(*args) on the worker pool, or on the threadpool without one.
+
+    Raises WorkerCrashed when the worker running it dies."""
+    if WORKER_POOL is None:
+        return await run_in_threadpool(pipeline, *args)
+    return await WORKER_POOL.run(pipeline, *args)
+
+
 # =============================================================================
 # FastAPI app
 # =============================================================================
 
-app = FastAPI()
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    if WORKER_POOL is not None:
+        await WORKER_POOL.start()
+    yield
+    if WORKER_POOL is not None:
+        WORKER_POOL.shutdown()
+
+
+app = FastAPI(lifespan=_lifespan)
 
 # Phase 9 — log every incoming request with timing
 @app.middleware("http")
@@ -147,8 +583,12 @@ async def log_requests(request: Request, call_next):
     start = time.time()
     logger.info(f"→ {request.method} {request.url.path}")
     response = await call_next(request)
-    ms = (time.time() - start) * 1000
-    logger.info(f"← {request.url.path} {response.status_code} ({ms:.1f}ms)")
+    seconds = time.time() - start
+    logger.info(f"← {request.url.path} {response.status_code} ({seconds * 1000:.1f}ms)")
+    # Labelled by route, so unknown paths do not each get a series.
+    route = request.scope.get("route")
+    REQUEST_SECONDS.observe(seconds, path=route.path if route is not None else "other",
+                            status=response.status_code)
     return response
 
 # ── CORS (React / Vite dev server) ───────────────────────────────────────────
@@ -174,9 +614,31 @@ app.add_middleware(
 # ── /lex ─────────────────────────────────────────────────────────────────────
 
 @app.post("/lex", response_model=LexResult)
-def lex_source(body: LexRequest):
-    lexer = Lexer(body.source)
-    tokens: list[Token] = lexer.scanTokens()
+def lex_source(body: LexEditRequest):
+    session = version = None
+    if body.edit is not None:
+        if body.session is None or body.version is None:
+            raise HTTPException(422, "An edit needs the session and the version it was made against")
+        try:
+            version, tokens, lex_errors = LEX_SESSIONS.edit(
+                body.session, body.version,
+                body.edit.start, body.edit.deleted, body.edit.inserted)
+        except KeyError:
+            raise HTTPException(404, f"Unknown lex session {body.session!r}") from None
+        except StaleVersion as exc:
+            raise HTTPException(409, str(exc)) from None
+        except ValueError as exc:
+            raise HTTPException(422, str(exc)) from None
+        session = body.session
+    elif body.source is None:
+        raise HTTPException(422, "Send a source, or a session edit")
+    elif body.incremental:
+        session, version, tokens, lex_errors = LEX_SESSIONS.open(body.source)
+    else:
+        entry = COMPILE_CACHE.entry(body.source)
+        _lex_phase(entry)
+        tokens = entry.tokens
+        lex_errors = entry.lex_errors
 
     token_responses = [
         TokenResponse(
@@ -199,61 +661,58 @@ def lex_source(body: LexRequest):
             end_col=e.get("end_col"),
             kind="lex",
         )
-        for e in lexer.errors
+        for e in lex_errors
     ]
 
-    return LexResult(tokens=token_responses, errors=error_responses)
+    return LexResult(tokens=token_responses, errors=error_responses,
+                     session=session, version=version)
 
 
 # ── /parse ────────────────────────────────────────────────────────────────────
 
 @app.post("/parse", response_model=ParseResult)
 def parse_source(body: LexRequest):
-    lexer = Lexer(body.source)
-    tokens = lexer.scanTokens()
+    entry = COMPILE_CACHE.entry(body.source)
+    _lex_phase(entry)
 
-    if lexer.errors:
-        return {"errors": _make_errors(lexer.errors, "lex")}
+    if entry.lex_errors:
+        return {"errors": _make_errors(entry.lex_errors, "lex")}
 
-    parser = Parser(tokens)
-    parser.parse()
+    # The AST is built here too, so a following /semantic or /run reuses it.
+    _parse_phase(entry)
 
-    return {"errors": _make_errors(parser.errors, "syntax")}
+    return {"errors": _make_errors(entry.parse_errors, "syntax")}
 
 
 # ── /semantic ─────────────────────────────────────────────────────────────────
 
 @app.post("/semantic", response_model=SemanticResult)
 def semantic_analyze(body: LexRequest):
-    # Step 1: Lex
-    lexer = Lexer(body.source)
-    tokens = lexer.scanTokens()
+    entry = COMPILE_CACHE.entry(body.source)
 
-    if lexer.errors:
-        return {"errors": _make_errors(lexer.errors, "lex")}
+    # Step 1: Lex
+    _lex_phase(entry)
 
-    # Step 2: Parse
-    parser = Parser(tokens)
-    parser.parse()
+    if entry.lex_errors:
+        return {"errors": _make_errors(entry.lex_errors, "lex")}
 
-    if parser.errors:
-        return {"errors": _make_errors(parser.errors, "syntax")}
+    # Step 2: Parse (builds the AST in the same pass)
+    _parse_phase(entry)
 
-    # Step 3: Build AST
-    builder = ASTBuilder(tokens)
-    ast = builder.build_program()
+    if entry.parse_errors:
+        return {"errors": _make_errors(entry.parse_errors, "syntax")}
 
-    if ast is None:
+    # Step 3: AST
+    if entry.ast is None:
         return {"errors": _make_errors([{
             "message": "Internal error: failed to build AST",
             "line": 1, "col": 1,
         }], "semantic")}
 
     # Step 4: Semantic analysis
-    analyzer = SemanticAnalyzer()
-    semantic_errors = analyzer.analyze(ast)
+    _semantic_phase(entry)
 
-    return {"errors": _make_errors(semantic_errors, "semantic")}
+    return {"errors": _make_errors(entry.semantic_errors, "semantic")}
 
 
 # =============================================================================
@@ -263,8 +722,8 @@ def semantic_analyze(body: LexRequest):
 # Pipeline
 # --------
 #  1. Lex                 → stop and return errors on failure
-#  2. Parse               → stop and return errors on failure
-#  3. Build AST           → stop and return errors on failure
+#  2. Parse + build AST   → stop and return errors on failure
+#  3. AST check         → stop and return errors on failure
 #  4. Semantic Analysis   → stop and return errors on failure
 #  5. TAC Generation      → produces instruction list
 #  6. Code Optimization   → constant folding, dead code, temp elimination
@@ -274,78 +733,43 @@ def semantic_analyze(body: LexRequest):
 # =============================================================================
 
 @app.post("/run", response_model=RunResult)
-def run_program(body: LexRequest):
-    """Execute the full compiler pipeline and return TAC + program output."""
+async def run_program(body: RunRequest):
+    """Execute the full compiler pipeline and return TAC + program output.
 
+    The pipeline runs in a worker process when the worker pool is enabled.
+    """
     try:
-        # ── Phase 1: Lex ─────────────────────────────────────────────────────
-        lexer = Lexer(body.source)
-        tokens = lexer.scanTokens()
-
-        if lexer.errors:
-            return RunResult(errors=_make_errors(lexer.errors, "lex"))
-
-        # ── Phase 2: Parse ───────────────────────────────────────────────────
-        parser = Parser(tokens)
-        parser.parse()
-
-        if parser.errors:
-            return RunResult(errors=_make_errors(parser.errors, "syntax"))
-
-        # ── Phase 3: Build AST ───────────────────────────────────────────────
-        builder = ASTBuilder(tokens)
-        ast = builder.build_program()
-
-        if ast is None:
-            return RunResult(errors=_make_errors([{
-                "message": "Internal error: failed to build AST",
-                "line": 1, "col": 1,
-            }], "semantic"))
+        return await _in_worker(_run_pipeline, body)
+    except WorkerCrashed as exc:
+        logger.error(f"  /run: {exc}")
+        return RunResult(errors=_make_errors([{
+            "message": f"Runtime error: {exc}", "line": 1, "col": 1}], "runtime"))
 
-        # ── Phase 4: Semantic analysis ───────────────────────────────────────
-        analyzer = SemanticAnalyzer()
-        semantic_errors = analyzer.analyze(ast)
 
-        if semantic_errors:
-            return RunResult(errors=_make_errors(semantic_errors, "semantic"))
+def _run_pipeline(body: RunRequest) -> RunResult:
+    """Phases 1-8 for a /run request.
 
-    except Exception as exc:
-        return RunResult(errors=_make_errors([{
-            "message": f"Compiler error: {exc}",
-            "line": 1, "col": 1,
-        }], "semantic"))
+    Phases 1-6 are taken from the compile cache when this source was seen
+    before; only code generation and execution always run.  Execution is
+    bounded by RUN_BUDGET, tightened by the request's budget.
+    """
+    entry = COMPILE_CACHE.entry(body.source)
 
-    # ── Phase 5: TAC Generation ──────────────────────────────────────────────
-    try:
-        gen = TACGenerator()
-        instructions = gen.generate(ast)
-        tac_lines = [tac_instruction_to_str(i) for i in instructions]
-    except Exception as exc:
-        return RunResult(errors=_make_errors([{
-            "message": f"TAC generation error: {exc}",
-            "line": 1, "col": 1,
-        }], "semantic"))
+    # ── Phases 1-6: Lex, parse + AST, semantic, TAC, optimization ───────────
+    errors = _compile(entry)
+    if errors:
+        return RunResult(errors=errors)
 
-    # ── Phase 6: Code Optimization ───────────────────────────────────────────
-    try:
-        optimizer = TACOptimizer(instructions)
-        opt_result = optimizer.optimize()
-        opt_instructions = opt_result["instructions"]
-        opt_tac_lines = [tac_instruction_to_str(i) for i in opt_instructions]
-        opt_summary = optimization_summary(opt_result)
-        # Report any optimizer errors as warnings (do not stop compilation)
-        opt_errors = opt_result.get("errors", [])
-    except Exception as exc:
-        # Optimization failure is non-fatal: fall back to unoptimized TAC
-        opt_instructions = instructions
-        opt_tac_lines = tac_lines
-        opt_summary = f"Optimization skipped: {exc}"
-        opt_errors = []
+    tac_lines = entry.tac_lines
+    opt_instructions = entry.opt_instructions
+    opt_tac_lines = entry.opt_tac_lines
+    opt_summary = entry.opt_summary
 
     # ── Phase 7: Code Generation ─────────────────────────────────────────────
     try:
-        codegen = TACCodeGen(opt_instructions)
-        cg_result = codegen.generate()
+        with PHASE_SECONDS.time(phase="codegen"):
+            codegen = TACCodeGen(opt_instructions)
+            cg_result = codegen.generate()
         pseudo_code = cg_result["code"]
         cg_errors = cg_result.get("errors", [])
     except Exception as exc:
@@ -355,8 +779,12 @@ def run_program(body: LexRequest):
     # ── Phase 8: Runtime Execution ────────────────────────────────────────────
     # Execute the OPTIMIZED instruction list for correct output.
     try:
-        interp = TACInterpreter(opt_instructions, stdin=list(body.stdin))
-        result = interp.run()
+        with PHASE_SECONDS.time(phase="run"):
+            interp = make_interpreter(opt_instructions, list(body.stdin), RUNTIME_ENGINE,
+                                      _run_budget(body.budget),
+                                      profile=body.profile or RUN_PROFILE)
+            result = interp.run()
+        EXECUTED.inc(interp.executed, engine=RUNTIME_ENGINE)
     except Exception as exc:
         return RunResult(
             tac=tac_lines,
@@ -386,9 +814,13 @@ def run_program(body: LexRequest):
             optimized_tac=opt_tac_lines,
             pseudo_code=pseudo_code,
             opt_summary=opt_summary,
-            output=[],          # cleared — output from errored run is unreliable
+            # The interpreter clears output from an errored run, except what
+            # ran before the fault that halted it (see TACInterpreter._result).
+            output=result["output"],
             memory=result["memory"],
             runtime_errors=true_runtime_errors,
+            limit=result["limit"],
+            profile=result.get("profile"),
         )
 
     return RunResult(
@@ -400,6 +832,7 @@ def run_program(body: LexRequest):
         output=result["output"],
         memory=result["memory"],
         runtime_errors=[],
+        profile=result.get("profile"),
     )
 
 
@@ -413,66 +846,255 @@ class CompileResult(BaseModel):
 
 
 @app.post("/compile", response_model=CompileResult)
-def compile_program(body: LexRequest):
+async def compile_program(body: LexRequest):
     """Run Phases 1-6, return optimized TAC instructions as JSON.
 
     The frontend JS interpreter executes these instead of the Python runtime,
     enabling interactive stdin (the interpreter pauses at write() and waits
-    for the user to type, exactly like Programiz).
+    for the user to type, exactly like Programiz).  Like /run, this runs in
+    a worker process when the worker pool is enabled.
     """
     try:
-        logger.info("  Phase 1: Lexical analysis")
-        lexer = Lexer(body.source)
-        tokens = lexer.scanTokens()
-        if lexer.errors:
-            logger.warning(f"  Phase 1 errors: {len(lexer.errors)}")
-            return CompileResult(errors=_make_errors(lexer.errors, "lex"))
+        return await _in_worker(_compile_pipeline, body)
+    except WorkerCrashed as exc:
+        logger.error(f"  /compile: {exc}")
+        return CompileResult(errors=_make_errors([{
+            "message": f"Compiler error: {exc}", "line": 1, "col": 1}], "semantic"))
 
-        logger.info("  Phase 2: Syntax analysis")
-        parser = Parser(tokens)
-        parser.parse()
-        if parser.errors:
-            logger.warning(f"  Phase 2 errors: {len(parser.errors)}")
-            return CompileResult(errors=_make_errors(parser.errors, "syntax"))
-
-        logger.info("  Phase 3: AST construction")
-        builder = ASTBuilder(tokens)
-        ast = builder.build_program()
-        if ast is None:
-            logger.error("  Phase 3: failed to build AST")
-            return CompileResult(errors=_make_errors([{
-                "message": "Internal error: failed to build AST", "line": 1, "col": 1}], "semantic"))
 
-        logger.info("  Phase 4: Semantic analysis")
-        analyzer = SemanticAnalyzer()
-        semantic_errors = analyzer.analyze(ast)
-        if semantic_errors:
-            logger.warning(f"  Phase 4 errors: {len(semantic_errors)}")
-            return CompileResult(errors=_make_errors(semantic_errors, "semantic"))
+def _compile_pipeline(body: LexRequest) -> CompileResult:
+    """Phases 1-6 for a /compile request."""
+    entry = COMPILE_CACHE.entry(body.source)
+    errors = _compile(entry)
+    if errors:
+        return CompileResult(errors=errors)
 
-    except Exception as exc:
-        logger.exception(f"  Compiler phase error: {exc}")
-        return CompileResult(errors=_make_errors([{
-            "message": f"Compiler error: {exc}", "line": 1, "col": 1}], "semantic"))
+    opt_instructions = entry.opt_instructions
+    logger.info(f"  Compile OK — {len(opt_instructions)} instructions")
+    return CompileResult(instructions=opt_instructions)
 
+
+# =============================================================================
+# /run/stream  —  interactive execution over a WebSocket
+#
+# The program runs on the server in slices (TACInterpreter.stream): view()
+# output is sent while the program runs, and a write() with no input left
+# pauses the run until the client sends a value.
+#
+#   client → {"source": ..., "stdin": [...], "budget": {...}}   (a RunRequest)
+#   server → {"type": "output", "lines": [...]}
+#   server → {"type": "input", "name": "x", "spec": "#d"}
+#   client → {"input": "42"}
+#   server → {"type": "done", "errors": [...], "memory": {...},
+#             "runtime_errors": [...], "limit": {...} | null,
+#             "profile": {...} | null}
+#
+# Compile errors end the session at once with a "done" carrying them.
+# Compilation goes through the worker pool like /compile; the run itself
+# stays in this process (a paused run is a live generator), each slice in
+# the threadpool.
+# =============================================================================
+
+@app.websocket("/run/stream")
+async def run_stream(websocket: WebSocket):
+    """Compile a RunRequest's source and run it, streaming output and
+    asking the client for input as write() needs it."""
+    await websocket.accept()
     try:
-        logger.info("  Phase 5: TAC generation")
-        gen = TACGenerator()
-        instructions = gen.generate(ast)
-    except Exception as exc:
-        logger.exception(f"  TAC generation error: {exc}")
-        return CompileResult(errors=_make_errors([{
-            "message": f"TAC generation error: {exc}", "line": 1, "col": 1}], "semantic"))
+        body = RunRequest(**await websocket.receive_json())
+    except (ValueError, TypeError):
+        await websocket.close(code=1003, reason="expected a RunRequest")
+        return
+    except WebSocketDisconnect:
+        return
 
     try:
-        logger.info("  Phase 6: Code optimization")
-        optimizer = TACOptimizer(instructions)
-        opt_result = optimizer.optimize()
-        opt_instructions = opt_result["instructions"]
-        logger.info(f"  Phase 6: {opt_result.get('stats', {})}")
+        compiled = await _in_worker(_compile_pipeline, LexRequest(source=body.source))
+    except WorkerCrashed as exc:
+        logger.error(f"  /run/stream: {exc}")
+        compiled = CompileResult(errors=_make_errors([{
+            "message": f"Compiler error: {exc}", "line": 1, "col": 1}], "semantic"))
+    try:
+        if compiled.errors:
+            await websocket.send_json({"type": "done",
+                                       "errors": jsonable_encoder(compiled.errors)})
+        else:
+            await _stream_run(websocket, compiled.instructions, body)
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info("  /run/stream: client disconnected")
+
+
+async def _stream_run(websocket: WebSocket, instructions: List[dict], body: RunRequest):
+    """Phase 8 for /run/stream: relay the interpreter's events."""
+    events = await run_in_threadpool(
+        lambda: make_interpreter(instructions, list(body.stdin), RUNTIME_ENGINE,
+                                 _run_budget(body.budget),
+                                 profile=body.profile or RUN_PROFILE).stream())
+    try:
+        kind, data = await run_in_threadpool(next, events)
+        while kind != "done":
+            value = None
+            if kind == "output":
+                await websocket.send_json({"type": "output", "lines": data})
+            else:
+                await websocket.send_json({"type": "input", **data})
+                message = await websocket.receive_json()
+                value = message.get("input", "") if isinstance(message, dict) else message
+            kind, data = await run_in_threadpool(events.send, value)
+    except WebSocketDisconnect:
+        raise
     except Exception as exc:
-        logger.warning(f"  Phase 6 skipped: {exc}")
-        opt_instructions = instructions
+        await websocket.send_json({"type": "done", "errors": _make_errors([{
+            "message": f"Runtime error: {exc}", "line": 1, "col": 1}], "runtime")})
+        return
+    finally:
+        events.close()
+
+    runtime_errors = list(data["errors"])
+    await websocket.send_json(jsonable_encoder({
+        "type":           "done",
+        "errors":         _make_errors([{"message": msg, "line": 1, "col": 1}
+                                        for msg in runtime_errors], "runtime"),
+        "memory":         data["memory"],
+        "runtime_errors": runtime_errors,
+        "limit":          data["limit"],
+        "profile":        data.get("profile"),
+    }))
 
-    logger.info(f"  Compile OK — {len(opt_instructions)} instructions")
-    return CompileResult(instructions=opt_instructions)
\ No newline at end of file
+
+# =============================================================================
+# /batch/run, /batch/compile  —  many programs in one request
+#
+# Items with the same source are grouped, and each group is cut into chunks
+# that run as one job: a chunk compiles its source once (or finds it in the
+# worker's cache) and runs every item of it.  Groups larger than the pool
+# are cut into one chunk per worker, at most BATCH_CHUNK items each, so one
+# assignment's test inputs still spread over every core.  Results stream
+# back as newline-delimited JSON, {"id": ..., "result": ...} per item, in
+# the order chunks finish.
+# =============================================================================
+
+# Most items one batch job runs before its results are streamed.
+BATCH_CHUNK = 32
+
+
+class BatchItem(BaseModel):
+    id:     Union[str, int]
+    source: str
+    stdin:  List[str] = []   # ignored by /batch/compile
+
+
+class BatchRequest(BaseModel):
+    items:  List[BatchItem]
+    budget: Optional[RunBudget] = None   # /batch/run: applied to every item
+
+
+def _batch_chunks(items: List[BatchItem]) -> List[List[BatchItem]]:
+    groups = {}
+    for item in items:
+        groups.setdefault(source_key(item.source), []).append(item)
+    chunks = []
+    for group in groups.values():
+        size = min(BATCH_CHUNK, math.ceil(len(group) / max(WORKERS, 1)))
+        chunks.extend(group[i:i + size] for i in range(0, len(group), size))
+    return chunks
+
+
+def _run_batch(items: List[BatchItem], budget: Optional[RunBudget]) -> List[dict]:
+    """Phases 1-8 for each item of one /batch/run chunk."""
+    return [{"id": item.id,
+             "result": _run_pipeline(RunRequest(source=item.source, stdin=item.stdin,
+                                                budget=budget))}
+            for item in items]
+
+
+def _compile_batch(items: List[BatchItem]) -> List[dict]:
+    """Phases 1-6 for each item of one /batch/compile chunk."""
+    return [{"id": item.id,
+             "result": _compile_pipeline(LexRequest(source=item.source))}
+            for item in items]
+
+
+def _stream_batch(body: BatchRequest, pipeline, failed, *args) -> StreamingResponse:
+    """Run every chunk of the batch as a job and stream the item results.
+
+    failed(message) is the result for items whose job could not finish."""
+    if len(body.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(413, f"A batch holds at most {BATCH_MAX_ITEMS} items")
+
+    async def job(chunk: List[BatchItem]) -> List[dict]:
+        try:
+            return await _in_worker(pipeline, chunk, *args)
+        except WorkerCrashed as exc:
+            message = str(exc)
+        except Exception as exc:
+            logger.exception(f"  Batch job error: {exc}")
+            message = f"internal error: {exc}"
+        return [{"id": item.id, "result": failed(message)} for item in chunk]
+
+    async def lines():
+        jobs = [asyncio.ensure_future(job(chunk)) for chunk in _batch_chunks(body.items)]
+        try:
+            for done in asyncio.as_completed(jobs):
+                for item_result in await done:
+                    yield json.dumps(jsonable_encoder(item_result)) + "\n"
+        finally:
+            for j in jobs:
+                j.cancel()      # client went away: drop what has not started
+
+    logger.info(f"  Batch: {len(body.items)} items")
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.post("/batch/run")
+async def batch_run(body: BatchRequest):
+    """/run for every item; streams {"id", "result": RunResult} lines."""
+    return _stream_batch(
+        body, _run_batch,
+        lambda message: RunResult(errors=_make_errors([{
+            "message": f"Runtime error: {message}", "line": 1, "col": 1}], "runtime")),
+        body.budget)
+
+
+@app.post("/batch/compile")
+async def batch_compile(body: BatchRequest):
+    """/compile for every item; streams {"id", "result": CompileResult} lines."""
+    return _stream_batch(
+        body, _compile_batch,
+        lambda message: CompileResult(errors=_make_errors([{
+            "message": f"Compiler error: {message}", "line": 1, "col": 1}], "semantic")))
+
+
+# =============================================================================
+# /cache/stats  —  compile cache counters
+# =============================================================================
+
+@app.get("/cache/stats")
+def cache_stats():
+    """Entry / byte usage and per-phase hit and miss counts of the compile
+    cache, plus the artifact store's counters when it is enabled and the
+    incremental /lex session count.
+
+    With the worker pool enabled each worker keeps its own compile cache;
+    the counters here are the server process's, and "workers" reports the
+    pool's."""
+    stats = COMPILE_CACHE.stats()
+    stats["disk"] = ARTIFACT_STORE.stats() if ARTIFACT_STORE is not None else None
+    stats["workers"] = WORKER_POOL.stats() if WORKER_POOL is not None else None
+    stats["lex_sessions"] = LEX_SESSIONS.stats()
+    return stats
+
+
+# =============================================================================
+# /metrics  —  Prometheus scrape endpoint
+# =============================================================================
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Per-phase timings and pipeline counters in the Prometheus text format.
+
+    With the worker pool enabled these include every worker's, as of the
+    last job each finished."""
+    return PlainTextResponse(METRICS.render(),
+                             media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,175 @@
+import hashlib
+import marshal
+import os
+import sys
+import threading
+import zlib
+from typing import Any, Dict, Optional
+
+# ---------------------------------------------------------------------------
+# On-disk store for compiled programs.
+#
+# Successful compiles are written to a directory so that a restarted worker
+# (or a sibling worker) can skip phases 1-6 for sources it has not seen
+# itself.  A record is addressed by the SHA-256 of the source key combined
+# with COMPILER_FINGERPRINT, a hash of the compiler's own source files: a
+# deploy that changes the lexer, parser, semantic analyzer or TAC phases
+# addresses a fresh set of records, and the stale ones age out.
+#
+# Records are marshal-encoded and zlib-compressed, behind a small header.
+# Writes go through a temporary file and os.replace, so concurrent workers
+# never see a partial record.  Reads refresh the file's mtime; when the
+# directory grows past max_bytes the least recently used records are
+# deleted.
+# ---------------------------------------------------------------------------
+
+_MAGIC = b"ARCT"
+_FORMAT = 1
+_HEADER = _MAGIC + bytes([_FORMAT])
+_SUFFIX = ".tac"
+
+_COMPILER_PACKAGES = ("lexer", "parser", "semantic", "tac")
+
+
+def _compiler_fingerprint() -> str:
+    root = os.path.dirname(os.path.abspath(__file__))
+    h = hashlib.sha256(f"{sys.version_info[0]}.{sys.version_info[1]}".encode())
+    for package in _COMPILER_PACKAGES:
+        folder = os.path.join(root, package)
+        for name in sorted(os.listdir(folder)):
+            if name.endswith(".py"):
+                h.update(name.encode())
+                with open(os.path.join(folder, name), "rb") as f:
+                    h.update(f.read())
+    return h.hexdigest()
+
+
+COMPILER_FINGERPRINT = _compiler_fingerprint()
+
+
+class ArtifactStore:
+    """Size-bounded, content-addressed directory of compiled-program records.
+
+    A record is a dict of marshal-compatible values (for the API: the TAC
+    listing, the optimized TAC instructions and listing, and the
+    optimization summary).
+
+    Usage
+    -----
+        store = ArtifactStore("/var/cache/arch", max_bytes=256 * 2**20)
+        record = store.get(source_key)     # None on a miss
+        store.put(source_key, record)
+    """
+
+    def __init__(self, root: str, max_bytes: int = 256 * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        os.makedirs(root, exist_ok=True)
+        self._bytes = sum(size for _, size, _ in self._scan())
+
+    # -- records -------------------------------------------------------------
+
+    def get(self, source_key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(source_key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            if not data.startswith(_HEADER):
+                raise ValueError("bad header")
+            record = marshal.loads(zlib.decompress(data[len(_HEADER):]))
+            os.utime(path)
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except (OSError, ValueError, EOFError, TypeError, zlib.error):
+            # Unreadable or corrupt (e.g. truncated by a full disk): drop it.
+            self._remove(path)
+            self._count("misses")
+            return None
+        self._count("hits")
+        return record
+
+    def put(self, source_key: str, record: Dict[str, Any]):
+        data = _HEADER + zlib.compress(marshal.dumps(record), 1)
+        path = self._path(source_key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(data)
+            # An overwrite replaces the old record's bytes rather than adding to them.
+            replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp, path)
+        except OSError:
+            self._remove(tmp)
+            return
+        with self._lock:
+            self.writes += 1
+            self._bytes += len(data) - replaced
+            over = self._bytes > self.max_bytes
+        if over:
+            self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "root": self.root,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+            }
+
+    # -- internals -----------------------------------------------------------
+
+    def _path(self, source_key: str) -> str:
+        digest = hashlib.sha256(f"{COMPILER_FINGERPRINT}:{source_key}".encode()).hexdigest()
+        return os.path.join(self.root, digest[:2], digest + _SUFFIX)
+
+    def _scan(self):
+        """(path, size, mtime) of every record under root."""
+        for sub in os.scandir(self.root):
+            if not sub.is_dir():
+                continue
+            for rec in os.scandir(sub.path):
+                if rec.name.endswith(_SUFFIX):
+                    try:
+                        st = rec.stat()
+                    except OSError:
+                        continue
+                    yield rec.path, st.st_size, st.st_mtime
+
+    def _evict(self):
+        # Other workers write to the same directory, so re-measure from disk
+        # and delete oldest first down to 90% of the bound.
+        records = sorted(self._scan(), key=lambda r: r[2])
+        total = sum(size for _, size, _ in records)
+        target = self.max_bytes * 9 // 10
+        evicted = 0
+        for path, size, _ in records:
+            if total <= target:
+                break
+            if self._remove(path):
+                total -= size
+                evicted += 1
+        with self._lock:
+            self._bytes = total
+            self.evictions += evicted
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
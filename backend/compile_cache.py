@@ -0,0 +1,196 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from lexer.lexer import normalize_source
+
+# ---------------------------------------------------------------------------
+# Compile-result cache.
+#
+# One CompileArtifacts entry per distinct source, keyed by the SHA-256 of the
+# normalized source (see normalize_source, so CRLF / BOM variants share an
+# entry).  An entry is filled phase by phase as endpoints get to them; a
+# later request for the same source picks up from the deepest phase already
+# stored.  Artifacts are shared between requests and must be treated as
+# read-only.
+#
+# The cache is a process-wide LRU bounded both by entry count and by an
+# estimate of the bytes its artifacts hold.
+# ---------------------------------------------------------------------------
+
+PHASES = ("lex", "parse", "semantic", "tac", "optimize")
+
+# Rough per-item costs used for the byte bound.
+_ERROR_BYTES = 256
+_AST_BYTES_PER_TOKEN = 160
+_INSTRUCTION_BYTES = 320
+
+
+def source_key(source: str) -> str:
+    return hashlib.sha256(normalize_source(source).encode("utf-8")).hexdigest()
+
+
+class CompileArtifacts:
+    """Per-phase results for one source.
+
+    A phase's fields are None until that phase has run.
+
+    Attributes
+    ----------
+    lex       — tokens (TokenStream), lex_errors
+    parse     — parse_errors, ast (None when there were syntax errors)
+    semantic  — semantic_errors
+    tac       — tac (instruction dicts), tac_lines
+    optimize  — opt_result (TACOptimizer.optimize() dict, or None when the
+                optimizer failed), opt_instructions, opt_tac_lines,
+                opt_summary
+    """
+
+    __slots__ = (
+        "key", "source", "nbytes",
+        "tokens", "lex_errors",
+        "parse_errors", "ast",
+        "semantic_errors",
+        "tac", "tac_lines",
+        "opt_result", "opt_instructions", "opt_tac_lines", "opt_summary",
+    )
+
+    def __init__(self, key: str, source: str):
+        self.key = key
+        self.source = source
+        self.nbytes = len(source)
+        self.tokens = None
+        self.lex_errors: Optional[List[dict]] = None
+        self.parse_errors: Optional[List[dict]] = None
+        self.ast = None
+        self.semantic_errors: Optional[List[dict]] = None
+        self.tac: Optional[List[dict]] = None
+        self.tac_lines: Optional[List[str]] = None
+        self.opt_result: Optional[dict] = None
+        self.opt_instructions: Optional[List[dict]] = None
+        self.opt_tac_lines: Optional[List[str]] = None
+        self.opt_summary: Optional[str] = None
+
+    def has(self, phase: str) -> bool:
+        if phase == "lex":
+            return self.lex_errors is not None
+        if phase == "parse":
+            return self.parse_errors is not None
+        if phase == "semantic":
+            return self.semantic_errors is not None
+        if phase == "tac":
+            return self.tac is not None
+        if phase == "optimize":
+            return self.opt_instructions is not None
+        raise ValueError(f"Unknown phase {phase!r}")
+
+    def estimate_bytes(self) -> int:
+        n = len(self.source)
+        tokens = self.tokens
+        if tokens is not None:
+            n += sum(len(col) * col.itemsize for col in (
+                tokens.types, tokens.id_numbers, tokens.lexeme_ids, tokens.lines, tokens.columns))
+            n += sum(49 + len(lexeme) for lexeme in tokens.lexemes)
+            if self.ast is not None:
+                n += len(tokens) * _AST_BYTES_PER_TOKEN
+        for errors in (self.lex_errors, self.parse_errors, self.semantic_errors):
+            if errors:
+                n += len(errors) * _ERROR_BYTES
+        for instructions in (self.tac, self.opt_instructions):
+            if instructions:
+                n += len(instructions) * _INSTRUCTION_BYTES
+        for lines in (self.tac_lines, self.opt_tac_lines):
+            if lines:
+                n += sum(49 + len(line) for line in lines)
+        return n
+
+
+class CompileCache:
+    """Thread-safe LRU of CompileArtifacts with per-phase hit / miss counters.
+
+    Usage
+    -----
+        entry = cache.entry(source)
+        if entry.has("lex"):
+            cache.hit("lex")
+        else:
+            cache.miss("lex")
+            ...fill entry.tokens / entry.lex_errors...
+            cache.stored(entry)
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CompileArtifacts]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits: Dict[str, int] = dict.fromkeys(PHASES, 0)
+        self.misses: Dict[str, int] = dict.fromkeys(PHASES, 0)
+        self.evictions = 0
+
+    def entry(self, source: str) -> CompileArtifacts:
+        """The entry for `source` (created empty if absent), marked most recently used."""
+        key = source_key(source)
+        if self.max_entries <= 0:
+            return CompileArtifacts(key, source)    # caching disabled
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+            entry = CompileArtifacts(key, source)
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+            self._evict(keep=key)
+            return entry
+
+    def stored(self, entry: CompileArtifacts):
+        """Re-measure `entry` after a phase was added to it, evicting as needed."""
+        nbytes = entry.estimate_bytes()
+        with self._lock:
+            if self._entries.get(entry.key) is not entry:
+                return    # already evicted; the caller still holds its artifacts
+            self._bytes += nbytes - entry.nbytes
+            entry.nbytes = nbytes
+            self._evict(keep=entry.key)
+
+    def hit(self, phase: str):
+        with self._lock:
+            self.hits[phase] += 1
+
+    def miss(self, phase: str):
+        with self._lock:
+            self.misses[phase] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "hits": dict(self.hits),
+                "misses": dict(self.misses),
+            }
+
+    def _evict(self, keep: Optional[str] = None):
+        # Oldest first.  An entry larger than max_bytes on its own is kept
+        # until the next insertion pushes it out.
+        entries = self._entries
+        while entries and (len(entries) > self.max_entries or self._bytes > self.max_bytes):
+            key = next(iter(entries))
+            if key == keep:
+                if len(entries) == 1:
+                    break
+                entries.move_to_end(key)
+                key = next(iter(entries))
+            self._bytes -= entries.pop(key).nbytes
+            self.evictions += 1
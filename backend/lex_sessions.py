@@ -0,0 +1,93 @@
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+from lexer.incremental import IncrementalLexer
+from lexer.tokens import Token
+
+# ---------------------------------------------------------------------------
+# Incremental /lex sessions.
+#
+# An editor opens a session with its whole source and then sends edits
+# (start, deleted, inserted) against the version it last saw.  Each session
+# keeps an IncrementalLexer (lexer/incremental.py), so an edit only re-scans
+# the units around it.  Versions count the edits applied; an edit naming any
+# other version is refused and the client re-opens with its whole source.
+#
+# The sessions are a process-wide LRU bounded by count.
+# ---------------------------------------------------------------------------
+
+
+class StaleVersion(Exception):
+    """An edit was made against a version the session has moved past."""
+
+    def __init__(self, session: str, expected: int, got: int):
+        super().__init__(f"Session {session} is at version {expected}, not {got}")
+        self.expected = expected
+
+
+class LexSessions:
+    """Thread-safe LRU of IncrementalLexers keyed by session id.
+
+    Usage
+    -----
+        session, version, tokens, errors = sessions.open(source)
+        version, tokens, errors = sessions.edit(session, version,
+                                                start, deleted, inserted)
+
+    open() and edit() return copies of the tokens and errors, since later
+    edits update the session's tokens in place.
+    """
+
+    def __init__(self, max_sessions: int = 256):
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, Tuple[IncrementalLexer, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def open(self, source: str) -> Tuple[str, int, List[Token], List[dict]]:
+        """Start a session on `source`: (session id, version 0, tokens, errors)."""
+        lexer = IncrementalLexer(source)
+        session = uuid.uuid4().hex
+        result = (session, 0) + self._copies(lexer)
+        with self._lock:
+            self._sessions[session] = (lexer, 0)
+            while len(self._sessions) > max(self.max_sessions, 1):
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def edit(self, session: str, version: int, start: int, deleted: int,
+             inserted: str) -> Tuple[int, List[Token], List[dict]]:
+        """Apply an edit made against `version`: (new version, tokens, errors).
+
+        Raises KeyError for an unknown (or evicted) session, StaleVersion
+        for a version other than the session's, and ValueError for a range
+        outside the source.
+        """
+        with self._lock:
+            lexer, current = self._sessions[session]
+            self._sessions.move_to_end(session)
+            if version != current:
+                raise StaleVersion(session, current, version)
+            lexer.apply_edit(start, deleted, inserted)
+            self._sessions[session] = (lexer, current + 1)
+            return (current + 1,) + self._copies(lexer)
+
+    def close(self, session: str):
+        with self._lock:
+            self._sessions.pop(session, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "evictions": self.evictions,
+            }
+
+    @staticmethod
+    def _copies(lexer: IncrementalLexer) -> Tuple[List[Token], List[dict]]:
+        tokens = [Token(t.lexeme, t.tokenType, t.line, t.column) for t in lexer.tokens]
+        return tokens, [dict(e) for e in lexer.errors]
@@ -0,0 +1,21 @@
+from .lexer import Lexer
+from .table_lexer import TableLexer
+from .regex_lexer import RegexLexer
+
+# ============================================================
+# Engine selection
+# ============================================================
+
+LEXER_ENGINES = {
+    "state": Lexer,        # hand-written if/elif machine (reference)
+    "table": TableLexer,   # compiled transition table
+    "regex": RegexLexer,   # master regex, state machine around errors
+}
+
+
+def make_lexer(source: str, engine: str = "table") -> Lexer:
+    """Return a lexer for `source` using the named engine."""
+    try:
+        return LEXER_ENGINES[engine](source)
+    except KeyError:
+        raise ValueError(f"Unknown lexer engine {engine!r}") from None
@@ -0,0 +1,296 @@
+from bisect import bisect_left
+from typing import List, Optional
+
+from .lexer import Lexer, normalize_source, normalize_text
+from .tokens import Token
+
+# ---------------------------------------------------------------------------
+# Incremental re-lexing.
+#
+# The source is covered by "scan units": one Lexer.scan_token call each,
+# producing exactly one token or one error.  A unit's result depends only on
+# its own characters plus the one character after it (the delimiter check).
+# Every unit starts in state 0, so any unit start is a restart point.
+#
+# An edit (start, deleted, inserted) therefore only needs re-scanning from the
+# first unit that can see the edited range, and stops as soon as a new unit
+# ends exactly where an untouched old unit begins.  Units after that point are
+# reused; only their offsets / line / column are shifted.
+#
+# Offsets refer to the normalized source (see normalize_source).  An edit
+# that leaves a BOM at the front (by deleting what preceded it) has it
+# stripped, as normalize_source would, and the source is lexed afresh.
+# ---------------------------------------------------------------------------
+
+
+def _is_id_type(token_type: str) -> bool:
+    return token_type.startswith("id") and token_type[2:].isdigit()
+
+
+class IncrementalLexer:
+    """Keeps a lexed document and updates it edit by edit.
+
+    tokens / errors always equal what Lexer(source).scanTokens() and
+    Lexer.errors would give for the current source.  Token objects are
+    owned by the IncrementalLexer: later edits update line / column /
+    tokenType of the tokens they keep, in place.
+    """
+
+    def __init__(self, source: str):
+        self.source = normalize_source(source)
+
+        # Parallel unit lists: start/end offsets (end exclusive) and the
+        # Token or error dict the unit produced.
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._items: list = []
+
+        self.id_table: dict[str, int] = {}
+        self._first_unit: dict[str, int] = {}   # lexeme -> unit of first occurrence
+        self._eof: Optional[Token] = None
+        self._lex_all()
+
+    # ============================================================
+    # Public API
+    # ============================================================
+
+    @property
+    def tokens(self) -> List[Token]:
+        out = [item for item in self._items if type(item) is Token]
+        out.append(self._eof)
+        return out
+
+    @property
+    def errors(self) -> List[dict]:
+        return [item for item in self._items if type(item) is dict]
+
+    def apply_edit(self, start: int, deleted: int, inserted: str) -> List[Token]:
+        """Replace source[start:start+deleted] with `inserted`, re-lex, return tokens."""
+        old_src = self.source
+        if not (0 <= start <= len(old_src)) or deleted < 0 or start + deleted > len(old_src):
+            raise ValueError(
+                f"Edit ({start}, {deleted}) outside source of length {len(old_src)}"
+            )
+
+        inserted = normalize_text(inserted)
+        self.source = old_src[:start] + inserted + old_src[start + deleted:]
+        if self.source.startswith("\ufeff"):
+            self.source = self.source.lstrip("\ufeff")
+            self._lex_all()
+            return self.tokens
+        delta = len(inserted) - deleted
+        edit_end_new = start + len(inserted)
+        edit_end_old = start + deleted
+
+        # First unit whose characters (or delimiter look-ahead) touch the edit.
+        k = bisect_left(self._ends, start)
+        if k < len(self._items):
+            first = self._items[k]
+            pos = self._starts[k]
+            line, col = self._position(first)
+        elif self._items:
+            # Appending after the last unit: it saw EOF as its delimiter.
+            k = len(self._items) - 1
+            pos = self._starts[k]
+            line, col = self._position(self._items[k])
+        else:
+            k, pos, line, col = 0, 0, 1, 1
+
+        # Old units that start after the edited range may be reused.
+        j0 = bisect_left(self._starts, edit_end_old)
+
+        old_items = self._items
+        old_starts = self._starts
+        old_ends = self._ends
+        self._starts, self._ends, self._items = old_starts[:k], old_ends[:k], old_items[:k]
+
+        lexer = self._scanner(pos, line, col)
+        resume = self._scan_units(
+            lexer,
+            stop_at=lambda p: self._resync_index(p, delta, edit_end_new, j0, old_starts),
+        )
+
+        old_window = old_items[k:resume] if resume is not None else old_items[k:]
+        new_window = self._items[k:]
+
+        if resume is None:
+            self._eof = Token("$", "EOF", lexer.line, lexer.column)
+        else:
+            old_line, old_col = self._position(old_items[resume])
+            line_delta = lexer.line - old_line
+            col_delta = lexer.column - old_col
+            self._reuse_tail(
+                old_items[resume:], old_starts[resume:], old_ends[resume:],
+                delta, old_line, line_delta, col_delta,
+            )
+
+        if self._ids_stable(k, old_window, new_window):
+            self._retype_window(k, len(old_window), len(new_window))
+        else:
+            self._renumber_ids(k)
+
+        return self.tokens
+
+    # ============================================================
+    # Scanning
+    # ============================================================
+
+    def _lex_all(self):
+        """Lex the whole source into fresh units."""
+        self._starts, self._ends, self._items = [], [], []
+        self.id_table, self._first_unit = {}, {}
+        lexer = self._scanner(0, 1, 1)
+        self._scan_units(lexer, stop_at=None)
+        self._renumber_ids()
+        self._eof = Token("$", "EOF", lexer.line, lexer.column)
+
+    def _scanner(self, pos: int, line: int, col: int) -> Lexer:
+        """Reference Lexer positioned inside the (already normalized) source."""
+        lexer = Lexer("")
+        lexer.source = self.source
+        lexer.pos = pos
+        lexer.line = line
+        lexer.column = col
+        lexer.current = self.source[pos] if pos < len(self.source) else None
+        return lexer
+
+    def _scan_units(self, lexer: Lexer, stop_at) -> Optional[int]:
+        """Append units until EOF, or until stop_at(pos) names an old unit to resume at."""
+        starts, ends, items = self._starts, self._ends, self._items
+        tokens, errors = lexer.tokens, lexer.errors
+        while lexer.current is not None:
+            unit_start = lexer.pos
+            n_tokens, n_errors = len(tokens), len(errors)
+            lexer.scan_token()
+            starts.append(unit_start)
+            ends.append(lexer.pos)
+            items.append(tokens[n_tokens] if len(tokens) > n_tokens else errors[n_errors])
+            if stop_at is not None:
+                resume = stop_at(lexer.pos)
+                if resume is not None:
+                    return resume
+        return None
+
+    def _resync_index(self, pos, delta, edit_end_new, j0, old_starts) -> Optional[int]:
+        """Index of the old unit starting at new offset `pos`, if it is reusable."""
+        if pos < edit_end_new:
+            return None
+        old_pos = pos - delta
+        j = bisect_left(old_starts, old_pos, j0)
+        if j < len(old_starts) and old_starts[j] == old_pos:
+            return j
+        return None
+
+    def _reuse_tail(self, items, starts, ends, delta, old_line, line_delta, col_delta):
+        """Append reused units, shifting offsets and line/column."""
+        if delta:
+            self._starts.extend([s + delta for s in starts])
+            self._ends.extend([e + delta for e in ends])
+        else:
+            self._starts.extend(starts)
+            self._ends.extend(ends)
+
+        # Columns only move on the line where the edit ended; lines move for
+        # everything after it.  Tokens are updated in place.
+        out = self._items
+        index = 0
+        for index, item in enumerate(items):
+            line, col = self._position(item)
+            d_col = col_delta if line == old_line else 0
+            if not line_delta and not d_col:
+                break
+            if type(item) is Token:
+                item.line = line + line_delta
+                item.column = col + d_col
+                out.append(item)
+            else:
+                # Error messages embed line numbers: re-scan the unit in place.
+                lexer = self._scanner(starts[index] + delta, line + line_delta, col + d_col)
+                lexer.scan_token()
+                out.append(lexer.errors[0] if lexer.errors else lexer.tokens[0])
+        else:
+            index = len(items)
+        out.extend(items[index:])
+
+        eof = self._eof
+        if eof.line == old_line:
+            eof.column += col_delta
+        eof.line += line_delta
+
+    # ============================================================
+    # Identifier numbering
+    # ============================================================
+
+    @staticmethod
+    def _position(item) -> tuple:
+        if type(item) is Token:
+            return item.line, item.column
+        return item["start_line"], item["start_col"]
+
+    @staticmethod
+    def _id_sequence(items) -> list:
+        return [
+            item.lexeme for item in items
+            if type(item) is Token and _is_id_type(item.tokenType)
+        ]
+
+    def _ids_stable(self, k: int, old_window, new_window) -> bool:
+        """True when the edit cannot change any idN assignment.
+
+        Either the window's identifier sequence is unchanged, or every
+        identifier in it already occurs before the window (unit k), so no
+        first occurrence moved.
+        """
+        old_ids = self._id_sequence(old_window)
+        new_ids = self._id_sequence(new_window)
+        if old_ids == new_ids:
+            return True
+        first = self._first_unit
+        return all(first.get(lexeme, k) < k for lexeme in old_ids + new_ids)
+
+    def _retype_window(self, k: int, old_len: int, new_len: int):
+        """Give re-scanned ids their existing idN and move first-occurrence marks."""
+        first = self._first_unit
+        shift = new_len - old_len
+        in_window = set()
+        for lexeme, unit in first.items():
+            if unit >= k + old_len:
+                first[lexeme] = unit + shift
+            elif unit >= k:
+                in_window.add(lexeme)
+
+        for i in range(k, k + new_len):
+            item = self._items[i]
+            if type(item) is Token and _is_id_type(item.tokenType):
+                item.tokenType = f"id{self.id_table[item.lexeme]}"
+                if item.lexeme in in_window:
+                    first[item.lexeme] = i
+                    in_window.discard(item.lexeme)
+
+    def _renumber_ids(self, k: int = 0):
+        """Re-assign idN in first-occurrence order (Lexer.get_id_token_type).
+
+        Identifiers first seen before unit k keep their numbers, so only
+        units k.. are visited.
+        """
+        first = {lexeme: unit for lexeme, unit in self._first_unit.items() if unit < k}
+        table = {lexeme: self.id_table[lexeme] for lexeme in first}
+        # Numbers are dense in first-occurrence order; re-insert in that order
+        # so len(table) + 1 stays the next free number.
+        table = dict(sorted(table.items(), key=lambda kv: kv[1]))
+        items = self._items
+        for i in range(k, len(items)):
+            item = items[i]
+            if type(item) is not Token:
+                continue
+            tok_type = item.tokenType
+            if tok_type[:2] != "id" or not tok_type[2:].isdigit():
+                continue
+            lexeme = item.lexeme
+            idx = table.get(lexeme)
+            if idx is None:
+                idx = table[lexeme] = len(table) + 1
+                first[lexeme] = i
+            item.tokenType = f"id{idx}"
+        self.id_table = table
+        self._first_unit = first
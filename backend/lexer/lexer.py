@@ -1,5 +1,6 @@
 from typing import List
 from .tokens import Token
+from .token_stream import TokenStream
 
 # numbers { 0 , 1 , 2 , 3 , 4 , 5 , 6 , 7 , 8 , 9 }
 numbers = {
@@ -84,20 +85,31 @@ ascii4 = {
 class LexerError(Exception):
     pass
 
+
+def normalize_source(source: str) -> str:
+    # Copy Paste Fix ---------------------------------------------------------------------
+    source = source.lstrip('\ufeff')
+    # ------------------------------------------------------------------------------------
+    return normalize_text(source)
+
+
+def normalize_text(text: str) -> str:
+    """normalize_source for text that may not start the source (no BOM strip)."""
+    # Copy Paste Fix ---------------------------------------------------------------------
+    text = text.replace('\r\n', '\n')
+    text = text.replace('\r', '\n')
+    text = text.replace('\u00a0', ' ')
+    text = text.replace('\u200b', '')
+    # ------------------------------------------------------------------------------------
+    return text
+
+
 #lexer class starts when called in api, sets all values to default at start / source/lexer body is source code
 class Lexer:
     def __init__(self, source: str):
         
-        # Copy Paste Fix ---------------------------------------------------------------------
-        source = source.lstrip('\ufeff')              
-        source = source.replace('\r\n', '\n')         
-        source = source.replace('\r', '\n')           
-        source = source.replace('\u00a0', ' ')       
-        source = source.replace('\u200b', '')     
-        # ------------------------------------------------------------------------------------
-
         # Source = Program String LAHAT
-        self.source = source
+        self.source = normalize_source(source)
 
         # Positions
         self.pos = 0
@@ -144,17 +156,24 @@ class Lexer:
         })
 
 
-    def get_id_token_type(self, lexeme: str) -> str:
+    def get_id_number(self, lexeme: str) -> int:
         """
-        Map each distinct identifier lexeme to a stable idN name.
-        Example: x,y,z,x -> id1, id2, id3, id1
+        Map each distinct identifier lexeme to a stable index N (of idN).
+        Example: x,y,z,x -> 1, 2, 3, 1
         """
         idx = self.id_table.get(lexeme)
         if idx is None:
             idx = self.next_id_index
             self.id_table[lexeme] = idx
             self.next_id_index += 1
-        return f"id{idx}"
+        return idx
+
+    def get_id_token_type(self, lexeme: str) -> str:
+        """
+        Map each distinct identifier lexeme to a stable idN name.
+        Example: x,y,z,x -> id1, id2, id3, id1
+        """
+        return f"id{self.get_id_number(lexeme)}"
 
 # TO BE DISCUSSED ------------------------------------------------------------------------------------
 
@@ -460,32 +479,37 @@ class Lexer:
     # scan tokens get called to api
     def scanTokens(self) -> List[Token]:
         while self.current is not None:
-            self.token_start_pos = self.pos
-            self.token_start_line = self.line
-            self.token_start_col = self.column
+            self.scan_token()
 
-            try:
+        # EOF token
+        eof = Token("$", "EOF", self.line, self.column)
+        self.tokens.append(eof)
+        return self.tokens
 
-                self.lex_from_state0()
+    def scan_stream(self) -> TokenStream:
+        """Lex the whole source into a columnar TokenStream."""
+        return TokenStream.from_tokens(self.scanTokens())
 
-            except LexerError as e:
+    def scan_token(self):
+        """Lex one token (or record one error) at the current position."""
+        self.token_start_pos = self.pos
+        self.token_start_line = self.line
+        self.token_start_col = self.column
 
-                self.add_error(
-                    str(e),
-                    start_line=self.token_start_line,
-                    start_col=self.token_start_col,
-                )
+        try:
 
-                if self.current is not None and self.pos == self.token_start_pos:
-                    self.advance()
+            self.lex_from_state0()
 
-                continue
+        except LexerError as e:
 
+            self.add_error(
+                str(e),
+                start_line=self.token_start_line,
+                start_col=self.token_start_col,
+            )
 
-        # EOF token
-        eof = Token("$", "EOF", self.line, self.column)
-        self.tokens.append(eof)
-        return self.tokens
+            if self.current is not None and self.pos == self.token_start_pos:
+                self.advance()
 
     # ============================================================
     # Transition Table
@@ -2531,6 +2555,10 @@ class Lexer:
                 if self.is_delim24(ch):
                     state = 194
                     continue
+                # Not a delim24 character: still end the whitespace token so
+                # state 0 reports the character instead of looping forever.
+                state = 194
+                continue
 
             elif state == 194:
                 lexeme = self.source[start_pos:self.pos]
@@ -2541,6 +2569,10 @@ class Lexer:
                 if self.is_delim24(ch):
                     state = 196
                     continue
+                # Not a delim24 character: still end the whitespace token so
+                # state 0 reports the character instead of looping forever.
+                state = 196
+                continue
 
 
             elif state == 196:
@@ -2552,6 +2584,10 @@ class Lexer:
                 if self.is_delim24(ch):
                     state = 198
                     continue
+                # Not a delim24 character: still end the whitespace token so
+                # state 0 reports the character instead of looping forever.
+                state = 198
+                continue
 
             elif state == 198:
                 lexeme = self.source[start_pos:self.pos]
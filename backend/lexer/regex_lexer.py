@@ -0,0 +1,282 @@
+import re
+from typing import List
+
+from .lexer import Lexer
+from .tokens import Token
+from .token_stream import TokenStream
+from .token_codes import TOKEN_CODES, TOKEN_NAMES, ID, EOF, split_type
+from .table_lexer import _RULES, _ACCEPT_TYPE, _GOTO, SHIFT
+
+# ---------------------------------------------------------------------------
+# Master-regex lexer.
+#
+# Most submissions are lexically valid, so the common case is matched by ONE
+# precompiled regular expression whose alternatives carry the delimiter check
+# of each token as a lookahead.  The regex is deliberately conservative: it
+# only matches a token when the state machine would produce exactly that
+# token.  Anything it does not match — errors, ids over 20 characters,
+# literals near the digit limits, odd delimiters — is handed to
+# Lexer.scan_token for that one token, so error messages and recovery are the
+# state machine's own.
+#
+# Delimiter lookaheads are generated from the Lexer's is_delim* helpers, and
+# the keyword list is read off the table lexer's rules, so neither can drift
+# from the reference machine.
+# ---------------------------------------------------------------------------
+
+_P = Lexer("")
+
+
+def _lookahead(pred, exclude: str = "") -> str:
+    """(?=...) accepting the ASCII characters (and EOF) that `pred` accepts.
+
+    Non-ASCII followers are left to the state machine.
+    """
+    chars = "".join(
+        chr(i) for i in range(128)
+        if chr(i) not in exclude and pred(chr(i))
+    )
+    alts = []
+    if chars:
+        alts.append("[" + "".join(re.escape(c) for c in chars) + "]")
+    if pred(None):
+        alts.append(r"\Z")
+    return "(?=" + "|".join(alts) + ")"
+
+
+def _follow_set(pred) -> frozenset:
+    """Characters accepted by `pred`; EOF is represented by ''."""
+    chars = {chr(i) for i in range(128) if pred(chr(i))}
+    if pred(None):
+        chars.add("")
+    return frozenset(chars)
+
+
+def _keywords() -> dict:
+    """lexeme -> (token type, follow set), for every word the keyword states accept.
+
+    Walks the letter edges of the table lexer from state 0; this also picks
+    up spellings that share a tail (e.g. 'rite' reaches the 'write' final).
+    """
+    found = {}
+    stack = [(0, "")]
+    while stack:
+        state, word = stack.pop()
+        for pred, kind, target in _RULES[state]:
+            if kind == SHIFT and isinstance(pred, str) and pred.isalpha() and target < 126:
+                stack.append((target, word + pred))
+            elif kind == _GOTO and target in _ACCEPT_TYPE and word:
+                found[word] = (_ACCEPT_TYPE[target], _follow_set(pred))
+    return found
+
+
+_KEYWORDS = _keywords()
+
+# Operators and punctuation: (lexeme, follow predicate).  Longer forms come
+# first, and a shorter form never matches in front of a character that would
+# extend it — mirroring the edge-before-delimiter order of the state machine.
+_OPERATORS = [
+    ("==", _P.is_delim7),  ("=",  _P.is_delim6),
+    ("++", _P.is_delim9),  ("+=", _P.is_delim10), ("+", _P.is_delim8),
+    ("--", _P.is_delim9),  ("-=", _P.is_delim10), ("-", _P.is_delim11),
+    ("*=", _P.is_delim10), ("*",  _P.is_delim10),
+    ("/=", _P.is_delim10), ("/",  _P.is_delim10),
+    ("%=", _P.is_delim10), ("%",  _P.is_delim10),
+    (">=", _P.is_delim7),  (">",  _P.is_delim7),
+    ("<=", _P.is_delim7),  ("<",  _P.is_delim7),
+    ("!=", _P.is_delim7),  ("!",  _P.is_delim7),
+    ("&&", _P.is_delim7),  ("&",  _P.is_alpha_id),
+    ("||", _P.is_delim7),
+    ("{",  _P.is_delim12), ("}",  _P.is_delim13),
+    ("(",  _P.is_delim14), (")",  _P.is_delim15),
+    ("[",  _P.is_delim16), ("]",  _P.is_delim17),
+    (".",  _P.is_alpha_id), (",", _P.is_delim18),
+    (":",  lambda ch: _P.is_whitespace(ch) or ch == '{' or _P.is_alpha_num(ch)),
+    (";",  _P.is_delim19),
+]
+
+# Characters that extend a one-character operator into a longer one (or a
+# comment / negative literal); they must never satisfy its lookahead.
+_EXTENDS = {
+    "=": "=", "+": "+=", "-": "-=0123456789", "*": "=", "/": "/*=",
+    "%": "=", ">": "=", "<": "=", "!": "=", "&": "&",
+}
+
+
+def _operator_alternatives() -> str:
+    alts = []
+    for lexeme, pred in _OPERATORS:
+        alts.append(re.escape(lexeme) + _lookahead(pred, _EXTENDS.get(lexeme, "")))
+    return "|".join(alts)
+
+
+# Fast-path literal limits stay strictly inside the state machine's limits
+# (15 integer digits, 7 decimals) so the digit-limit checks never apply.
+# An 8-digit integer part is excluded from floats: state 253 ends a tile_lit
+# on '.', which the state machine must handle.
+_INT_DIGITS  = r"[0-9]{1,15}"
+_FLOAT_INT   = r"(?:[0-9]{1,7}|[0-9]{9,15})"
+_FLOAT_FRAC  = r"[0-9]{1,7}"
+_ESCAPE      = r"\\[nt'\"\\0]"
+_ASCII1      = "[" + "".join(re.escape(c) for c in sorted(
+    chr(i) for i in range(128) if _P.is_ascii1(chr(i)))) + "]"
+
+_MASTER = re.compile(
+    "|".join([
+        r"(?P<ws>[ \t\n])",
+        r"(?P<lcom>//[^\n]*)",
+        r"(?P<bcom>/\*[\s\S]*?\*/)",
+        r"(?P<word>[A-Za-z_][A-Za-z0-9_]*)" + _lookahead(_P.is_delim20),
+        r"(?P<glass>-?" + _FLOAT_INT + r"\." + _FLOAT_FRAC + ")" + _lookahead(_P.is_delim22),
+        r"(?P<tile>-?" + _INT_DIGITS + ")" + _lookahead(_P.is_delim21, "."),
+        r"(?P<brick>'(?:" + _ASCII1 + "|" + _ESCAPE + ")')" + _lookahead(_P.is_delim21),
+        r'(?P<wall>"(?:[^"\\\n]|' + _ESCAPE + ')*")' + _lookahead(_P.is_delim23),
+        r"(?P<op>" + _operator_alternatives() + ")",
+    ])
+)
+
+# Token codes for the fast path.
+_KEYWORD_CODES = {
+    lexeme: (TOKEN_CODES[tok_type], follow) for lexeme, (tok_type, follow) in _KEYWORDS.items()
+}
+_WS_CODES = {" ": TOKEN_CODES["space"], "\t": TOKEN_CODES["tab"], "\n": TOKEN_CODES["newline"]}
+_TILE_LIT     = TOKEN_CODES["tile_lit"]
+_GLASS_LIT    = TOKEN_CODES["glass_lit"]
+_WALL_LIT     = TOKEN_CODES["wall_lit"]
+_BRICK_LIT    = TOKEN_CODES["brick_lit"]
+_LINE_COMMENT = TOKEN_CODES["Single-Line Comment"]
+_BLOCK_COMMENT = TOKEN_CODES["Multi-Line Comment"]
+
+
+# ============================================================
+# Regex lexer
+# ============================================================
+
+class RegexLexer(Lexer):
+    """Lexer whose scanTokens matches valid tokens with one master regex.
+
+    Produces the same Token list and errors list as Lexer.scanTokens; any
+    position the regex does not vouch for is lexed by Lexer.scan_token.
+    """
+
+    def scanTokens(self) -> List[Token]:
+        tokens = self.tokens
+        append = tokens.append
+        names = TOKEN_NAMES
+
+        def emit(lexeme, code, id_number, line, col):
+            append(Token(lexeme, f"id{id_number}" if id_number else names[code], line, col))
+
+        self._scan(emit)
+        return tokens
+
+    def scan_stream(self) -> TokenStream:
+        stream = TokenStream()
+        self._scan(stream.append_code)
+        return stream
+
+    def _scan(self, emit):
+        """Match the source, calling emit(lexeme, code, id_number, line, col) per token."""
+        src = self.source
+        n = len(src)
+        match = _MASTER.match
+        keywords = _KEYWORD_CODES
+        codes = TOKEN_CODES
+        tokens = self.tokens
+
+        pos = self.pos
+        line = self.line
+        line_start = pos - (self.column - 1)
+        synced = pos
+
+        while pos < n:
+            k = src.count('\n', synced, pos)
+            if k:
+                line += k
+                line_start = src.rfind('\n', synced, pos) + 1
+            synced = pos
+            col = pos - line_start + 1
+
+            m = match(src, pos)
+            if m is not None:
+                kind = m.lastgroup
+                lexeme = m.group()
+                end = m.end()
+
+                if kind == "ws":
+                    emit(lexeme, _WS_CODES[lexeme], 0, line, col)
+                    pos = end
+                    continue
+
+                if kind == "word":
+                    keyword = keywords.get(lexeme)
+                    if keyword is None:
+                        if len(lexeme) <= 20:
+                            emit(lexeme, ID, self.get_id_number(lexeme), line, col)
+                            pos = end
+                            continue
+                    elif src[end:end + 1] in keyword[1]:
+                        emit(lexeme, keyword[0], 0, line, col)
+                        pos = end
+                        continue
+
+                elif kind == "op":
+                    emit(lexeme, codes[lexeme], 0, line, col)
+                    pos = end
+                    continue
+
+                elif kind == "tile":
+                    emit(self.normalize_int(lexeme), _TILE_LIT, 0, line, col)
+                    pos = end
+                    continue
+
+                elif kind == "glass":
+                    emit(self.normalize_float(lexeme), _GLASS_LIT, 0, line, col)
+                    pos = end
+                    continue
+
+                elif kind == "wall":
+                    emit(lexeme, _WALL_LIT, 0, line, col)
+                    pos = end
+                    continue
+
+                elif kind == "brick":
+                    emit(lexeme, _BRICK_LIT, 0, line, col)
+                    pos = end
+                    continue
+
+                elif kind == "lcom":
+                    emit(lexeme, _LINE_COMMENT, 0, line, col)
+                    pos = end + 1 if src[end:end + 1] == '\n' else end
+                    continue
+
+                elif kind == "bcom":
+                    emit(lexeme, _BLOCK_COMMENT, 0, line, col)
+                    pos = end
+                    continue
+
+            # Not vouched for by the regex: one token through the state machine.
+            self.pos = pos
+            self.line = line
+            self.column = col
+            self.current = src[pos]
+            mark = len(tokens)
+            self.scan_token()
+            if len(tokens) > mark:
+                t = tokens.pop()
+                emit(t.lexeme, *split_type(t.tokenType), t.line, t.column)
+            pos = self.pos
+            line = self.line
+            line_start = pos - (self.column - 1)
+            synced = pos
+
+        k = src.count('\n', synced, pos)
+        if k:
+            line += k
+            line_start = src.rfind('\n', synced, pos) + 1
+        self.pos = pos
+        self.line = line
+        self.column = pos - line_start + 1
+        self.current = None
+
+        emit("$", EOF, 0, self.line, self.column)
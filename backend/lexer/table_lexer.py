@@ -0,0 +1,642 @@
+from typing import List
+
+from .lexer import Lexer
+from .tokens import Token
+from .token_stream import TokenStream
+from .token_codes import TOKEN_CODES, TOKEN_NAMES, ID, EOF
+
+# ---------------------------------------------------------------------------
+# Table-driven lexer.
+#
+# Lexer.lex_from_state0 walks an `if state == N / elif ...` chain for every
+# character and calls several is_* helpers per comparison.  This module
+# describes the SAME machine — same state numbers, same delimiter sets,
+# same error messages — as a list of ordered rules per state, and compiles
+# those rules once at import into a dense  state x character-class  table.
+#
+# Scanning then costs one dict lookup (char -> class) and one list index
+# (table[state][class]) per character.
+#
+# Rule predicates reuse the delimiter helpers of the hand-written Lexer
+# (is_delim1 ... is_delim24, is_alpha_num, ...) so both machines always
+# agree on what a delimiter is.
+# ---------------------------------------------------------------------------
+
+# Action kinds.  A table cell holding a plain state number (< _ACTION) is a
+# SHIFT: consume the character and move to that state.  Anything else is
+# _ACTION + (target << 3 | kind).
+_GOTO        = 1   # move to target without consuming (epsilon)
+_ACCEPT      = 2   # emit the token described by _ACCEPT_TYPE[target]
+_ERROR       = 3   # raise _MESSAGES[target]
+_LIMIT_INT   = 4   # digit in state 267: check the 15 significant digit limit
+_LIMIT_FRAC  = 5   # digit in state 282: check the 7 decimal digit limit
+_SHIFT_ACCEPT = 6  # consume, then accept target (253 --'.'--> 266)
+
+_ACTION = 1 << 20
+
+# Special accept kinds (everything else is a literal token type).
+_ID           = "<id>"
+_INT          = "<tile_lit>"
+_FLOAT        = "<glass_lit>"
+_LINE_COMMENT = "<line_comment>"
+
+# ---------------------------------------------------------------------------
+# Error messages — must stay byte-identical to lexer.py.
+# Fields: start_line, lexeme, ch, raw, line, col.
+# ---------------------------------------------------------------------------
+
+_M_DELIM        = "Error on line {start_line}: {lexeme!r} is an Invalid Lexeme - Invalid Delimiter"
+_M_DELIM_TYPO   = "Error on line {start_line}: {lexeme!r} is an iInvalid Lexeme - Invalid Delimiter"
+_M_DELIM_SPACE  = "Error on line {start_line}: {lexeme!r} is an Invalid Lexeme - Invalid Delimiter "
+_M_ID_LIMIT     = "Error on line {start_line}: {lexeme!r} is an Invalid Lexeme - Invalid Delimiter - ID Limit 20 Characters"
+_M_NEED_DIGIT   = "Error on line {start_line}: {lexeme!r} is an Invalid Lexeme - Invalid Delimiter (expected digit after '.')"
+_M_UNTERMINATED = "Error on line {start_line}: {lexeme!r} is an Invalid Lexeme - Unterminated"
+_M_UNIDENTIFIED = "Error on line {line}, col {col}: {ch!r} is an Invalid Lexeme - Unidentified Character"
+_M_INT_LIMIT    = "Error on line {start_line}: {raw!r} is an Invalid Lexeme - Limit 15 Digits"
+_M_FRAC_LIMIT   = "Error on line {start_line}: {raw!r} is an Invalid Lexeme - Limit 7 Decimal Digits"
+_M_BRICK_CHAR   = "Invalid Lexeme {lexeme!r}: invalid character {ch!r}."
+_M_ESC_UNTERM   = "Invalid Lexeme {lexeme!r}: unterminated escape sequence."
+_M_BRICK_ESC    = "Invalid Lexeme {lexeme!r}: invalid escape sequence '\\{ch}'."
+_M_BRICK_LEN    = "Invalid Lexeme {lexeme!r}: Brick Can Only Contain 1 Character"
+_M_WALL_ESC     = "Invalid Lexeme {lexeme!r}: invalid escape sequence."
+
+_MESSAGES: List[str] = []
+
+
+def _msg(template: str) -> int:
+    if template not in _MESSAGES:
+        _MESSAGES.append(template)
+    return _MESSAGES.index(template)
+
+
+# ---------------------------------------------------------------------------
+# Machine description
+#
+# _RULES[state] is an ordered list of (predicate, action, target).
+# predicate: a single character, a callable(ch) -> bool, or None (always).
+# The first matching rule wins, exactly like the if-chain in lexer.py.
+# ---------------------------------------------------------------------------
+
+_P = Lexer("")   # predicate host — only its is_* helpers are used
+
+_RULES: dict = {}
+_ACCEPT_TYPE: dict = {}
+
+SHIFT = 0
+
+
+def _is_nl_or_eof(ch) -> bool:
+    return ch is None or ch == '\n'
+
+
+def _not_number(ch) -> bool:
+    return not _P.is_number(ch)
+
+
+def _prefix(state: int, *edges):
+    """Keyword prefix: known next letters, anything else re-reads as an id."""
+    _RULES[state] = [(ch, SHIFT, nxt) for ch, nxt in edges] + [(None, _GOTO, 199)]
+
+
+def _keyword(state: int, delim, accept: int, token_type: str,
+             edges=(), message: str = _M_DELIM):
+    """Last letter of a keyword: delimiter -> token, alnum -> id, else error."""
+    _RULES[state] = (
+        [(delim, _GOTO, accept)]
+        + [(ch, SHIFT, nxt) for ch, nxt in edges]
+        + [(_P.is_alpha_num, _GOTO, 199), (None, _ERROR, _msg(message))]
+    )
+    _ACCEPT_TYPE[accept] = token_type
+
+
+def _symbol(state: int, delim, accept: int, token_type: str,
+            edges=(), message: str = _M_DELIM):
+    """Operator / punctuation: longer forms first, then its delimiter set."""
+    _RULES[state] = (
+        [(ch, SHIFT, nxt) for ch, nxt in edges]
+        + [(delim, _GOTO, accept), (None, _ERROR, _msg(message))]
+    )
+    _ACCEPT_TYPE[accept] = token_type
+
+
+# ── state 0 ──────────────────────────────────────────────────────────────────
+
+_RULES[0] = [
+    (' ', SHIFT, 193), ('\t', SHIFT, 195), ('\n', SHIFT, 197),
+    ('b', SHIFT, 1), ('c', SHIFT, 20), ('d', SHIFT, 32), ('e', SHIFT, 38),
+    ('f', SHIFT, 43), ('g', SHIFT, 59), ('h', SHIFT, 71), ('i', SHIFT, 80),
+    ('m', SHIFT, 83), ('r', SHIFT, 88), ('s', SHIFT, 95), ('t', SHIFT, 101),
+    ('v', SHIFT, 106), ('w', SHIFT, 111),
+    (_P.is_number, SHIFT, 239),
+    ('=', SHIFT, 126), ('+', SHIFT, 130), ('-', SHIFT, 136), ('*', SHIFT, 142),
+    ('/', SHIFT, 146), ('%', SHIFT, 150), ('>', SHIFT, 154), ('<', SHIFT, 158),
+    ('!', SHIFT, 162), ('&', SHIFT, 166), ('|', SHIFT, 170),
+    ('{', SHIFT, 173), ('}', SHIFT, 175), ('(', SHIFT, 177), (')', SHIFT, 179),
+    ('[', SHIFT, 181), (']', SHIFT, 183), ('.', SHIFT, 185), (',', SHIFT, 187),
+    (':', SHIFT, 189), (';', SHIFT, 191),
+    ("'", SHIFT, 284), ('"', SHIFT, 289),
+    (_P.is_alpha_id, SHIFT, 199),
+    (None, _ERROR, _msg(_M_UNIDENTIFIED)),
+]
+
+# ── keywords 1–125 ───────────────────────────────────────────────────────────
+
+_ws = _P.is_whitespace
+
+# beam / blueprint / brick
+_prefix(1, ('e', 2), ('l', 6), ('r', 15))
+_prefix(2, ('a', 3))
+_prefix(3, ('m', 4))
+_keyword(4, _ws, 5, "beam")
+_prefix(6, ('u', 7))
+_prefix(7, ('e', 8))
+_prefix(8, ('p', 9))
+_prefix(9, ('r', 10))
+_prefix(10, ('i', 11))
+_prefix(11, ('n', 12))
+_prefix(12, ('t', 13))
+_keyword(13, _P.is_delim1, 14, "blueprint")
+_prefix(15, ('i', 16))
+_prefix(16, ('c', 17))
+_prefix(17, ('k', 18))
+_keyword(18, _ws, 19, "brick")
+
+# cement / crack
+_prefix(20, ('e', 21), ('r', 27))
+_prefix(21, ('m', 22))
+_prefix(22, ('e', 23))
+_prefix(23, ('n', 24))
+_prefix(24, ('t', 25))
+_keyword(25, _ws, 26, "cement")
+_prefix(27, ('a', 28))
+_prefix(28, ('c', 29))
+_prefix(29, ('k', 30))
+_keyword(30, _P.is_delim2, 31, "crack")
+
+# do / door
+_prefix(32, ('o', 33))
+_keyword(33, _P.is_delim3, 34, "do", edges=(('o', 35),))
+_prefix(35, ('r', 36))
+_keyword(36, _ws, 37, "door")
+
+# else
+_prefix(38, ('l', 39))
+_prefix(39, ('s', 40))
+_prefix(40, ('e', 41))
+_keyword(41, _P.is_delim3, 42, "else")
+
+# for / field / fragile
+_prefix(43, ('o', 44), ('i', 47), ('r', 52))
+_prefix(44, ('r', 45))
+_keyword(45, _P.is_delim1, 46, "for")
+_prefix(47, ('e', 48))
+_prefix(48, ('l', 49))
+_prefix(49, ('d', 50))
+_keyword(50, _ws, 51, "field")
+_prefix(52, ('a', 53))
+_prefix(53, ('g', 54))
+_prefix(54, ('i', 55))
+_prefix(55, ('l', 56))
+_prefix(56, ('e', 57))
+_keyword(57, _P.is_delim4, 58, "fragile")
+
+# glass / ground
+_prefix(59, ('l', 60), ('r', 65))
+_prefix(60, ('a', 61))
+_prefix(61, ('s', 62))
+_prefix(62, ('s', 63))
+_keyword(63, _ws, 64, "glass")
+_prefix(65, ('o', 66))
+_prefix(66, ('u', 67))
+_prefix(67, ('n', 68))
+_prefix(68, ('d', 69))
+_keyword(69, _P.is_delim5, 70, "ground")
+
+# home / house
+_prefix(71, ('o', 72))
+_prefix(72, ('m', 73), ('u', 76))
+_prefix(73, ('e', 74))
+_keyword(74, lambda ch: _ws(ch) or ch in ('(', '-', '!', "'", '"'), 75, "home")
+_prefix(76, ('s', 77))
+_prefix(77, ('e', 78))
+_keyword(78, _ws, 79, "house")
+
+# if
+_prefix(80, ('f', 81))
+_keyword(81, _P.is_delim1, 82, "if")
+
+# mend
+_prefix(83, ('e', 84))
+_prefix(84, ('n', 85))
+_prefix(85, ('d', 86))
+_keyword(86, _P.is_delim2, 87, "mend")
+
+# roof / room  ('ri' shares the tail of 'write', as in lexer.py)
+_prefix(88, ('o', 89), ('i', 121))
+_prefix(89, ('o', 90))
+_prefix(90, ('f', 91), ('m', 93))
+_keyword(91, _ws, 92, "roof")
+_keyword(93, _P.is_delim1, 94, "room")
+
+# solid
+_prefix(95, ('o', 96))
+_prefix(96, ('l', 97))
+_prefix(97, ('i', 98))
+_prefix(98, ('d', 99))
+_keyword(99, _P.is_delim4, 100, "solid", message=_M_DELIM_TYPO)
+
+# tile
+_prefix(101, ('i', 102))
+_prefix(102, ('l', 103))
+_prefix(103, ('e', 104))
+_keyword(104, _ws, 105, "tile")
+
+# view
+_prefix(106, ('i', 107))
+_prefix(107, ('e', 108))
+_prefix(108, ('w', 109))
+_keyword(109, _P.is_delim1, 110, "view")
+
+# wall / while / write
+_prefix(111, ('a', 112), ('h', 116), ('r', 121))
+_prefix(112, ('l', 113))
+_prefix(113, ('l', 114))
+_keyword(114, _ws, 115, "wall")
+_prefix(116, ('i', 117))
+_prefix(117, ('l', 118))
+_prefix(118, ('e', 119))
+_keyword(119, _P.is_delim1, 120, "while")
+_prefix(121, ('i', 122))
+_prefix(122, ('t', 123))
+_prefix(123, ('e', 124))
+_keyword(124, _P.is_delim1, 125, "write")
+
+# ── operators & punctuation 126–192 ──────────────────────────────────────────
+
+_symbol(126, _P.is_delim6,  127, "=",  edges=(('=', 128),))
+_symbol(128, _P.is_delim7,  129, "==")
+_symbol(130, _P.is_delim8,  131, "+",  edges=(('+', 132), ('=', 134)))
+_symbol(132, _P.is_delim9,  133, "++")
+_symbol(134, _P.is_delim10, 135, "+=")
+_symbol(136, _P.is_delim11, 137, "-",
+        edges=((_P.is_number, 239), ('-', 138), ('=', 140)))
+_symbol(138, _P.is_delim9,  139, "--")
+_symbol(140, _P.is_delim10, 141, "-=")
+_symbol(142, _P.is_delim10, 143, "*",  edges=(('=', 144),))
+_symbol(144, _P.is_delim10, 145, "*=")
+_symbol(146, _P.is_delim10, 147, "/",  edges=(('/', 293), ('*', 295), ('=', 148)))
+_symbol(148, _P.is_delim10, 149, "/=")
+_symbol(150, _P.is_delim10, 151, "%",  edges=(('=', 152),))
+_symbol(152, _P.is_delim10, 153, "%=")
+_symbol(154, _P.is_delim7,  155, ">",  edges=(('=', 156),))
+_symbol(156, _P.is_delim7,  157, ">=", message=_M_DELIM_TYPO)
+_symbol(158, _P.is_delim7,  159, "<",  edges=(('=', 160),))
+_symbol(160, _P.is_delim7,  161, "<=")
+_symbol(162, _P.is_delim7,  163, "!",  edges=(('=', 164),))
+_symbol(164, _P.is_delim7,  165, "!=")
+_symbol(166, _P.is_alpha_id, 167, "&", edges=(('&', 168),))
+_symbol(168, _P.is_delim7,  169, "&&")
+_RULES[170] = [('|', SHIFT, 171), (None, _ERROR, _msg(_M_DELIM))]
+_symbol(171, _P.is_delim7,  172, "||")
+_symbol(173, _P.is_delim12, 174, "{")
+_symbol(175, _P.is_delim13, 176, "}")
+_symbol(177, _P.is_delim14, 178, "(")
+_symbol(179, _P.is_delim15, 180, ")")
+_symbol(181, _P.is_delim16, 182, "[")
+_symbol(183, _P.is_delim17, 184, "]")
+_symbol(185, _P.is_alpha_id, 186, ".")
+_symbol(187, _P.is_delim18, 188, ",")
+_symbol(189, lambda ch: _ws(ch) or ch == '{' or _P.is_alpha_num(ch), 190, ":")
+_symbol(191, _P.is_delim19, 192, ";")
+
+# ── whitespace tokens 193–198 ────────────────────────────────────────────────
+# Any character ends a whitespace token; an invalid follower is reported by
+# state 0 on the next token (see Lexer.lex_from_state0).
+
+for _state, _type in ((193, "space"), (195, "tab"), (197, "newline")):
+    _RULES[_state] = [(None, _GOTO, _state + 1)]
+    _ACCEPT_TYPE[_state + 1] = _type
+
+# ── identifiers 199–238 (20 characters max) ──────────────────────────────────
+
+for _state in range(199, 237, 2):
+    _RULES[_state] = [
+        (_P.is_alpha_num, SHIFT, _state + 2),
+        (_P.is_delim20, _GOTO, _state + 1),
+        (None, _ERROR, _msg(_M_DELIM)),
+    ]
+    _ACCEPT_TYPE[_state + 1] = _ID
+_RULES[237] = [
+    (_P.is_delim20, _GOTO, 238),
+    (_P.is_alpha_num, _ERROR, _msg(_M_ID_LIMIT)),
+    (None, _ERROR, _msg(_M_DELIM)),
+]
+_ACCEPT_TYPE[238] = _ID
+
+# ── numbers 239–283 ──────────────────────────────────────────────────────────
+
+_RULES[239] = [
+    (_P.is_delim21, _GOTO, 240),
+    (_P.is_number, SHIFT, 241),
+    ('.', SHIFT, 269),
+    (None, _ERROR, _msg(_M_DELIM)),
+]
+_ACCEPT_TYPE[240] = _INT
+for _state in range(241, 267, 2):
+    _RULES[_state] = [
+        (_P.is_number, SHIFT, _state + 2),
+        # state 253 jumps to the tile_lit final 266 on '.', as in lexer.py
+        ('.', SHIFT, 266 if _state == 253 else 269),
+        (_P.is_delim21, _GOTO, _state + 1),
+        (None, _ERROR, _msg(_M_DELIM)),
+    ]
+    _ACCEPT_TYPE[_state + 1] = _INT
+_RULES[267] = [
+    (_P.is_number, _LIMIT_INT, 267),
+    ('.', SHIFT, 269),
+    (_P.is_delim21, _GOTO, 268),
+    (None, _ERROR, _msg(_M_DELIM_SPACE)),
+]
+_ACCEPT_TYPE[268] = _INT
+
+_RULES[269] = [(_not_number, _ERROR, _msg(_M_NEED_DIGIT)), (None, SHIFT, 270)]
+for _state in range(270, 282, 2):
+    _RULES[_state] = [
+        (_P.is_number, SHIFT, _state + 2),
+        (_P.is_delim22, _GOTO, _state + 1),
+        (None, _ERROR, _msg(_M_DELIM)),
+    ]
+    _ACCEPT_TYPE[_state + 1] = _FLOAT
+_RULES[282] = [
+    (_P.is_number, _LIMIT_FRAC, 282),
+    (_P.is_delim22, _GOTO, 283),
+    (None, _ERROR, _msg(_M_DELIM)),
+]
+_ACCEPT_TYPE[283] = _FLOAT
+
+# ── brick literal 284–288 ────────────────────────────────────────────────────
+
+_RULES[284] = [
+    (_is_nl_or_eof, _ERROR, _msg(_M_UNTERMINATED)),
+    ('\\', SHIFT, 285),
+    (_P.is_ascii1, SHIFT, 286),
+    (None, _ERROR, _msg(_M_BRICK_CHAR)),
+]
+_RULES[285] = [
+    (_is_nl_or_eof, _ERROR, _msg(_M_ESC_UNTERM)),
+    (_P.is_escape_seq_char, SHIFT, 286),
+    (None, _ERROR, _msg(_M_BRICK_ESC)),
+]
+_RULES[286] = [
+    (_is_nl_or_eof, _ERROR, _msg(_M_UNTERMINATED)),
+    ("'", SHIFT, 287),
+    (None, _ERROR, _msg(_M_BRICK_LEN)),
+]
+_symbol(287, _P.is_delim21, 288, "brick_lit")
+
+# ── wall literal 289–292 ─────────────────────────────────────────────────────
+
+_RULES[289] = [
+    (_is_nl_or_eof, _ERROR, _msg(_M_UNTERMINATED)),
+    ('"', SHIFT, 291),
+    ('\\', SHIFT, 290),
+    (None, SHIFT, 289),
+]
+_RULES[290] = [
+    (_is_nl_or_eof, _ERROR, _msg(_M_ESC_UNTERM)),
+    (_P.is_escape_seq_char, SHIFT, 289),
+    (None, _ERROR, _msg(_M_WALL_ESC)),
+]
+_symbol(291, _P.is_delim23, 292, "wall_lit")
+
+# ── comments 293–298 ─────────────────────────────────────────────────────────
+
+_RULES[293] = [(_is_nl_or_eof, _GOTO, 294), (None, SHIFT, 293)]
+_ACCEPT_TYPE[294] = _LINE_COMMENT
+_RULES[295] = [
+    (lambda ch: ch is None, _ERROR, _msg(_M_UNTERMINATED)),
+    ('*', SHIFT, 296),
+    (None, SHIFT, 295),
+]
+_RULES[296] = [
+    (lambda ch: ch is None, _ERROR, _msg(_M_UNTERMINATED)),
+    ('*', SHIFT, 296),
+    ('/', SHIFT, 297),
+    (None, SHIFT, 295),
+]
+_RULES[297] = [(None, _GOTO, 298)]
+_ACCEPT_TYPE[298] = "Multi-Line Comment"
+
+
+# ---------------------------------------------------------------------------
+# Compilation: rules -> character classes -> dense table.
+#
+# Every ASCII character is probed against every state's rules; characters
+# with identical columns collapse into one class.  Non-ASCII input only
+# ever matters through str.isalpha() (is_delim12) and "anything else", so
+# it is represented by one alpha and one non-alpha probe.  EOF (None) gets
+# its own class.
+# ---------------------------------------------------------------------------
+
+_NON_ASCII_ALPHA = "é"
+_NON_ASCII_OTHER = "€"
+
+
+def _matches(pred, ch) -> bool:
+    if pred is None:
+        return True
+    if isinstance(pred, str):
+        return ch == pred
+    return bool(pred(ch))
+
+
+def _compile():
+    n_states = max(max(_RULES), max(_ACCEPT_TYPE)) + 1
+    probes = [chr(i) for i in range(128)] + [_NON_ASCII_ALPHA, _NON_ASCII_OTHER, None]
+
+    def cell(state, ch):
+        for pred, kind, target in _RULES[state]:
+            if not _matches(pred, ch):
+                continue
+            if kind == SHIFT:
+                if target in _ACCEPT_TYPE:
+                    return _ACTION + (target << 3 | _SHIFT_ACCEPT)
+                return target
+            if kind == _GOTO and target in _ACCEPT_TYPE:
+                kind = _ACCEPT
+            return _ACTION + (target << 3 | kind)
+        raise AssertionError(f"state {state} has no rule for {ch!r}")
+
+    columns = {}
+    class_of_probe = {}
+    for ch in probes:
+        column = tuple(cell(s, ch) for s in sorted(_RULES))
+        class_of_probe[ch] = columns.setdefault(column, len(columns))
+
+    table = [None] * n_states
+    ordered = sorted(columns.items(), key=lambda kv: kv[1])
+    for row_index, state in enumerate(sorted(_RULES)):
+        table[state] = [column[row_index] for column, _ in ordered]
+
+    class_of = {ch: class_of_probe[ch] for ch in probes[:128]}
+    return (table, class_of, class_of_probe[_NON_ASCII_ALPHA],
+            class_of_probe[_NON_ASCII_OTHER], class_of_probe[None])
+
+
+_TABLE, _CLASS_OF, _CLASS_ALPHA, _CLASS_OTHER, _CLASS_EOF = _compile()
+
+# Accept state -> token code; the special kinds get negative codes.
+_ID_CODE, _INT_CODE, _FLOAT_CODE, _LINE_COMMENT_CODE = -1, -2, -3, -4
+_SPECIAL_CODES = {_ID: _ID_CODE, _INT: _INT_CODE, _FLOAT: _FLOAT_CODE, _LINE_COMMENT: _LINE_COMMENT_CODE}
+_ACCEPT_CODES = [
+    _SPECIAL_CODES.get(t, TOKEN_CODES.get(t)) for t in (_ACCEPT_TYPE.get(s) for s in range(len(_TABLE)))
+]
+_TILE_LIT = TOKEN_CODES["tile_lit"]
+_GLASS_LIT = TOKEN_CODES["glass_lit"]
+_LINE_COMMENT_TYPE = TOKEN_CODES["Single-Line Comment"]
+
+
+# ============================================================
+# Table-driven lexer
+# ============================================================
+
+class TableLexer(Lexer):
+    """Drop-in replacement for Lexer whose scanTokens runs the compiled table.
+
+    Produces the same Token list and errors list as Lexer.scanTokens.
+    Line/column are derived from offsets (newline counts) instead of being
+    tracked per character.
+    """
+
+    def scanTokens(self) -> List[Token]:
+        tokens = self.tokens
+        append = tokens.append
+        names = TOKEN_NAMES
+
+        def emit(lexeme, code, id_number, line, col):
+            append(Token(lexeme, f"id{id_number}" if id_number else names[code], line, col))
+
+        self._scan(emit)
+        return tokens
+
+    def scan_stream(self) -> TokenStream:
+        stream = TokenStream()
+        self._scan(stream.append_code)
+        return stream
+
+    def _scan(self, emit):
+        """Run the table, calling emit(lexeme, code, id_number, line, col) per token."""
+        src = self.source
+        n = len(src)
+        table = _TABLE
+        accept_of = _ACCEPT_CODES
+        class_get = _CLASS_OF.get
+
+        pos = self.pos
+        line = self.line
+        line_start = pos - (self.column - 1)
+        synced = pos
+
+        while pos < n:
+            start = pos
+
+            # Bring line/column up to the token start.
+            k = src.count('\n', synced, start)
+            if k:
+                line += k
+                line_start = src.rfind('\n', synced, start) + 1
+            synced = start
+            start_line = line
+            start_col = start - line_start + 1
+
+            state = 0
+            while True:
+                if pos < n:
+                    cls = class_get(src[pos])
+                    if cls is None:
+                        cls = _CLASS_ALPHA if src[pos].isalpha() else _CLASS_OTHER
+                else:
+                    cls = _CLASS_EOF
+
+                code = table[state][cls]
+                if code < _ACTION:
+                    pos += 1
+                    state = code
+                    continue
+
+                code -= _ACTION
+                kind = code & 7
+                target = code >> 3
+                if kind == _GOTO:
+                    state = target
+                    continue
+
+                if kind == _SHIFT_ACCEPT:
+                    pos += 1
+                    kind = _ACCEPT
+
+                if kind == _ACCEPT:
+                    lexeme = src[start:pos]
+                    tok_code = accept_of[target]
+                    if tok_code >= 0:
+                        emit(lexeme, tok_code, 0, start_line, start_col)
+                    elif tok_code == _ID_CODE:
+                        emit(lexeme, ID, self.get_id_number(lexeme), start_line, start_col)
+                    elif tok_code == _INT_CODE:
+                        emit(self.normalize_int(lexeme), _TILE_LIT, 0, start_line, start_col)
+                    elif tok_code == _FLOAT_CODE:
+                        emit(self.normalize_float(lexeme), _GLASS_LIT, 0, start_line, start_col)
+                    else:
+                        emit(lexeme, _LINE_COMMENT_TYPE, 0, start_line, start_col)
+                        if pos < n and src[pos] == '\n':
+                            pos += 1
+                    break
+
+                ch = src[pos] if pos < n else None
+                raw = src[start:pos] + (ch or "")
+                if kind == _LIMIT_INT:
+                    significant = raw.lstrip('0')
+                    if significant == "" or len(significant) <= 15:
+                        pos += 1
+                        continue
+                    message = _M_INT_LIMIT
+                elif kind == _LIMIT_FRAC:
+                    if len(raw.split('.', 1)[1].rstrip('0')) <= 7:
+                        pos += 1
+                        continue
+                    message = _M_FRAC_LIMIT
+                else:
+                    message = _MESSAGES[target]
+
+                # Error: sync line/column to the failing position, then
+                # recover exactly like Lexer.scanTokens.
+                k = src.count('\n', synced, pos)
+                if k:
+                    line += k
+                    line_start = src.rfind('\n', synced, pos) + 1
+                synced = pos
+                self.line = line
+                self.column = pos - line_start + 1
+                self.add_error(
+                    message.format(
+                        start_line=start_line, lexeme=src[start:pos], ch=ch,
+                        raw=raw, line=self.line, col=self.column,
+                    ),
+                    start_line=start_line,
+                    start_col=start_col,
+                )
+                if pos == start:
+                    pos += 1
+                break
+
+        k = src.count('\n', synced, pos)
+        if k:
+            line += k
+            line_start = src.rfind('\n', synced, pos) + 1
+        self.pos = pos
+        self.line = line
+        self.column = pos - line_start + 1
+        self.current = src[pos] if pos < n else None
+
+        emit("$", EOF, 0, self.line, self.column)
+
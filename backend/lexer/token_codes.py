@@ -0,0 +1,48 @@
+from parser.cfg import PRODUCTIONS
+
+# ---------------------------------------------------------------------------
+# Integer token-type codes.
+#
+# One code per grammar terminal, in order of first appearance in
+# cfg.PRODUCTIONS, followed by the types the lexer emits that the grammar
+# never sees (whitespace, comments) and EOF.  Every identifier shares the
+# single code ID; its idN number travels separately.
+# ---------------------------------------------------------------------------
+
+def _is_nonterminal(symbol: str) -> bool:
+    return len(symbol) > 2 and symbol[0] == '<' and symbol[-1] == '>'
+
+
+def _grammar_terminals() -> list:
+    terminals = []
+    for _, _, rhs in PRODUCTIONS:
+        for symbol in rhs:
+            if symbol != 'λ' and not _is_nonterminal(symbol) and symbol not in terminals:
+                terminals.append(symbol)
+    return terminals
+
+
+LEXER_ONLY_TYPES = ("space", "tab", "newline", "Single-Line Comment", "Multi-Line Comment", "EOF")
+
+TOKEN_NAMES: list = _grammar_terminals() + list(LEXER_ONLY_TYPES)
+TOKEN_CODES: dict = {name: code for code, name in enumerate(TOKEN_NAMES)}
+
+ID  = TOKEN_CODES['id']
+EOF = TOKEN_CODES['EOF']
+
+
+def split_type(token_type: str) -> tuple:
+    """'id7' -> (ID, 7);  'tile' -> (code of 'tile', 0)."""
+    code = TOKEN_CODES.get(token_type)
+    if code is not None:
+        return code, 0
+    if token_type.startswith("id") and token_type[2:].isdigit():
+        return ID, int(token_type[2:])
+    raise ValueError(f"Unknown token type {token_type!r}")
+
+
+def type_name(code: int, id_number: int = 0) -> str:
+    """Inverse of split_type."""
+    if id_number:
+        return f"id{id_number}"
+    return TOKEN_NAMES[code]
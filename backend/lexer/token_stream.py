@@ -0,0 +1,141 @@
+from array import array
+from itertools import compress
+from typing import Iterable, Iterator, List
+
+from .tokens import Token
+from .token_codes import TOKEN_CODES, TOKEN_NAMES, split_type, type_name
+
+
+# ============================================================
+# Columnar token stream
+# ============================================================
+
+class TokenStream:
+    """Token list stored as parallel int arrays.
+
+    Column i of `types`, `id_numbers`, `lexeme_ids`, `lines` and `columns`
+    describes token i.  `types` holds token_codes codes (every identifier
+    is ID; codes fit in a byte); `id_numbers` holds the N of idN, 0 for
+    non-identifiers.  Lexemes are interned in `lexemes`.  Indexing or
+    iterating yields Token objects built on demand, so the stream can stand
+    in for the list[Token] returned by Lexer.scanTokens.
+    """
+
+    __slots__ = ("types", "id_numbers", "lexeme_ids", "lines", "columns", "lexemes", "_lexeme_index")
+
+    def __init__(self):
+        self.types = array('B')
+        self.id_numbers = array('i')
+        self.lexeme_ids = array('i')
+        self.lines = array('i')
+        self.columns = array('i')
+        self.lexemes: List[str] = []
+        self._lexeme_index: dict = {}
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[Token]) -> "TokenStream":
+        stream = cls()
+        append = stream.append
+        for t in tokens:
+            append(t.lexeme, t.tokenType, t.line, t.column)
+        return stream
+
+    def append(self, lexeme: str, token_type: str, line: int, column: int):
+        code, id_number = split_type(token_type)
+        self.append_code(lexeme, code, id_number, line, column)
+
+    def append_code(self, lexeme: str, code: int, id_number: int, line: int, column: int):
+        lexeme_id = self._lexeme_index.get(lexeme)
+        if lexeme_id is None:
+            lexeme_id = self._lexeme_index[lexeme] = len(self.lexemes)
+            self.lexemes.append(lexeme)
+        self.types.append(code)
+        self.id_numbers.append(id_number)
+        self.lexeme_ids.append(lexeme_id)
+        self.lines.append(line)
+        self.columns.append(column)
+
+    # -- column access -------------------------------------------------------
+
+    def type_name(self, i: int) -> str:
+        return type_name(self.types[i], self.id_numbers[i])
+
+    def lexeme(self, i: int) -> str:
+        return self.lexemes[self.lexeme_ids[i]]
+
+    # -- filtering -----------------------------------------------------------
+
+    def without_types(self, names: Iterable[str]) -> "TokenStreamView":
+        """View of this stream without the tokens whose type is in `names`."""
+        keep = bytearray(b"\x01" * 256)
+        for name in names:
+            keep[TOKEN_CODES[name]] = 0
+        mask = self.types.tobytes().translate(keep)
+        return TokenStreamView(
+            self,
+            array('i', list(compress(range(len(self.types)), mask))),
+            array('B', bytes(compress(self.types.tobytes(), mask))),
+        )
+
+    # -- Token view ----------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, i: int) -> Token:
+        return Token(
+            self.lexemes[self.lexeme_ids[i]],
+            type_name(self.types[i], self.id_numbers[i]),
+            self.lines[i],
+            self.columns[i],
+        )
+
+    def __iter__(self) -> Iterator[Token]:
+        lexemes, names = self.lexemes, TOKEN_NAMES
+        for lexeme_id, code, id_number, line, column in zip(
+            self.lexeme_ids, self.types, self.id_numbers, self.lines, self.columns
+        ):
+            tok_type = f"id{id_number}" if id_number else names[code]
+            yield Token(lexemes[lexeme_id], tok_type, line, column)
+
+    def to_tokens(self) -> List[Token]:
+        return list(self)
+
+
+class TokenStreamView:
+    """Subset of a TokenStream's rows, as made by TokenStream.without_types.
+
+    `rows[i]` is the stream row of view token i and `types[i]` its code
+    (copied, since the parser reads it for every token).  Other columns are
+    read through `stream`.
+    """
+
+    __slots__ = ("stream", "rows", "types")
+
+    def __init__(self, stream: TokenStream, rows: array, types: array):
+        self.stream = stream
+        self.rows = rows
+        self.types = types
+
+    def type_name(self, i: int) -> str:
+        return self.stream.type_name(self.rows[i])
+
+    def lexeme(self, i: int) -> str:
+        return self.stream.lexeme(self.rows[i])
+
+    def line(self, i: int) -> int:
+        return self.stream.lines[self.rows[i]]
+
+    def column(self, i: int) -> int:
+        return self.stream.columns[self.rows[i]]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, i: int) -> Token:
+        return self.stream[self.rows[i]]
+
+    def __iter__(self) -> Iterator[Token]:
+        stream = self.stream
+        for row in self.rows:
+            yield stream[row]
@@ -0,0 +1,177 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+# ---------------------------------------------------------------------------
+# Metrics in the Prometheus text exposition format.
+#
+# A MetricsRegistry holds counters and histograms, each with an optional set
+# of label names, and renders them for a /metrics scrape.  Everything kept
+# is a sum (counter values, per-bucket counts, histogram sums), so what
+# another process recorded can be folded in: a worker process drains its
+# registry after every job and the server merges the returned deltas into
+# its own (see WorkerPool's collect / merge), so one scrape of the server
+# covers every worker.
+# ---------------------------------------------------------------------------
+
+# Upper bounds (seconds) of the default histogram buckets.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str,
+                 labelnames: Sequence[str]):
+        self._lock = registry._lock
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, Any] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Labels:
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _label_text(self, key: Labels, extra: str = "") -> str:
+        pairs = [f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter(_Metric):
+    """A monotonically increasing count (name should end in _total)."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _merge(self, values: Dict[Labels, float]):
+        for key, amount in values.items():
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _lines(self) -> Iterator[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{self._label_text(key)} {_number(value)}"
+
+
+class Histogram(_Metric):
+    """Observations counted into buckets, plus their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str,
+                 labelnames: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(registry, name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        i = 0
+        while value > self.buckets[i]:
+            i += 1
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                # per-bucket counts (not cumulative), then the sum
+                counts = self._values[key] = [0] * len(self.buckets) + [0.0]
+            counts[i] += 1
+            counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str):
+        """Observe the wall-clock seconds the with-block takes."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _merge(self, values: Dict[Labels, List[float]]):
+        for key, counts in values.items():
+            mine = self._values.get(key)
+            if mine is None:
+                self._values[key] = list(counts)
+            else:
+                for i, n in enumerate(counts):
+                    mine[i] += n
+
+    def _lines(self) -> Iterator[str]:
+        for key, counts in self._values.items():
+            total = 0
+            for bound, n in zip(self.buckets, counts):
+                total += n
+                le = 'le="' + _number(bound) + '"'
+                yield f"{self.name}_bucket{self._label_text(key, le)} {total}"
+            yield f"{self.name}_sum{self._label_text(key)} {_number(counts[-1])}"
+            yield f"{self.name}_count{self._label_text(key)} {total}"
+
+
+class MetricsRegistry:
+    """The metrics of one process.
+
+    Usage
+    -----
+        metrics = MetricsRegistry()
+        phase_seconds = metrics.histogram("x_phase_seconds", "...", ["phase"])
+        with phase_seconds.time(phase="lex"):
+            ...
+        text = metrics.render()
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(self, name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(self, name, help, labelnames, buckets))
+
+    def _add(self, metric: _Metric) -> Any:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def drain(self) -> Dict[str, Dict[Labels, Any]]:
+        """Everything recorded since the last drain, for merge() in another
+        process; the registry starts from zero again."""
+        with self._lock:
+            data = {name: m._values for name, m in self._metrics.items() if m._values}
+            for m in self._metrics.values():
+                m._values = {}
+        return data
+
+    def merge(self, data: Dict[str, Dict[Labels, Any]]):
+        """Add what another process's drain() returned."""
+        with self._lock:
+            for name, values in data.items():
+                self._metrics[name]._merge(values)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            for m in self._metrics.values():
+                lines.append(f"# HELP {m.name} {m.help}")
+                lines.append(f"# TYPE {m.name} {m.kind}")
+                lines.extend(m._lines())
+        return "\n".join(lines) + "\n"
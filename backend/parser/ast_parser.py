@@ -0,0 +1,1083 @@
+from __future__ import annotations
+
+from parser.cfg import PRODUCTIONS
+from parser.parserV2 import Parser
+from lexer.token_codes import EOF
+from semantic.ast_builder import ASTBuilder, LITERAL_TO_TYPE
+from semantic.ast import (
+    ProgramNode, FunctionNode, ParamNode,
+    VarDeclNode, StructDeclNode, StructMemberNode,
+    AssignNode, IfNode, WhileNode, DoWhileNode,
+    ForNode, SwitchNode, CaseNode, BreakNode, ContinueNode,
+    ReturnNode, IONode,
+    BinaryOpNode, UnaryOpNode, LiteralNode,
+    IdNode, ArrayAccessNode, StructAccessNode, FunctionCallNode,
+    WallConcatNode, ArrayInitNode,
+)
+
+# ---------------------------------------------------------------------------
+# Single-pass AST construction.
+#
+# ASTParser runs Parser's table-driven driver with one action per grammar
+# production, so validating the token stream also builds the semantic/ast.py
+# tree ASTBuilder would build from it.  Syntax errors come from the same
+# driver and are identical to Parser's.
+#
+# An action is called once its production's right-hand side has been
+# parsed.  It receives one value per right-hand-side symbol — a
+# (lexeme, line, col) tuple for a terminal, the action's result for a
+# non-terminal — and returns the value of the left-hand side.
+#
+# Lists.  The grammar builds lists by right recursion
+# (<mult_elem> → , <value> <mult_elem> | λ), so the last element is reduced
+# first.  List-valued actions append to the list of their tail and hand it
+# up back to front; whoever consumes the list calls _rev() once.
+#
+# Expressions.  <expression> → operand <exp_op>, <exp_op> → <operator>
+# <expression>: an expression's value is the flat list
+# [operand, op, operand, ...] (back to front), every op a (lexeme, line, col)
+# tuple and every operand already carrying its prefix / postfix operators.
+# _fold() applies ASTBuilder's precedence climbing to it.
+#
+# Identifier suffixes (<id_type>, <id_type3>, ...) are reduced before the
+# identifier's node can be built, so their values are plain descriptions
+# applied by the production that owns the identifier (_access, _id_expr).
+#
+# Where ASTBuilder loses its place on valid input (a wall literal followed
+# by anything other than '+' concatenation, '++' after an assignment target
+# with an index or member, mixed scalar / brace struct initializers, global
+# wall const arrays, trailing struct consts) the tree follows the grammar.
+# ---------------------------------------------------------------------------
+
+_OP_PRECEDENCE = ASTBuilder._OP_PRECEDENCE
+
+
+def _fold(items: list):
+    """Binary tree for a flat [operand, op, operand, ...] list.
+
+    Left-associative precedence climbing, exactly as ASTBuilder._prec_expr.
+    """
+    pos = 0
+
+    def prec_expr(max_prec: int):
+        nonlocal pos
+        left = items[pos]
+        pos += 1
+        while pos < len(items):
+            op, line, col = items[pos]
+            op_prec = _OP_PRECEDENCE[op]
+            if op_prec > max_prec:
+                break
+            pos += 1
+            right = prec_expr(op_prec - 1)
+            left = BinaryOpNode(left=left, operator=op, right=right,
+                                line=line, col=col)
+        return left
+
+    return prec_expr(8)
+
+
+def _concat(items: list, line: int, col: int):
+    """WallConcatNode over the operands of a '+' list (the lone operand if one)."""
+    parts = items[0::2]
+    if len(parts) == 1:
+        return parts[0]
+    return WallConcatNode(parts=parts, line=line, col=col)
+
+
+def _rev(items: list) -> list:
+    """Source order of a list built back to front (reversed in place)."""
+    items.reverse()
+    return items
+
+
+def _lit(tok, literal_type: str) -> LiteralNode:
+    return LiteralNode(value=tok[0], literal_type=literal_type, line=tok[1], col=tok[2])
+
+
+def _access(name: str, line: int, col: int, suffix):
+    """Node for an identifier with an <id_type3>-style suffix.
+
+    suffix is None, a list of index expressions, or (member, indices-or-None).
+    Every node of the chain is positioned at (line, col).
+    """
+    node = IdNode(name=name, line=line, col=col)
+    if suffix is None:
+        return node
+    if isinstance(suffix, tuple):
+        member, suffix = suffix
+        node = StructAccessNode(struct=node, member=member, line=line, col=col)
+        if suffix is None:
+            return node
+    return ArrayAccessNode(array=node, indices=suffix, line=line, col=col)
+
+
+def _id_expr(tok, id_type):
+    """Node for `id <id_type>` in an expression."""
+    name, line, col = tok
+    if id_type is None:
+        return IdNode(name=name, line=line, col=col)
+    kind, a, b = id_type
+    if kind == 'call':
+        return FunctionCallNode(func_name=name, args=a, line=line, col=col)
+    if kind == 'post':
+        node, op = IdNode(name=name, line=line, col=col), a
+    else:
+        node, op = _access(name, line, col, a), b
+    if op is None:
+        return node
+    return UnaryOpNode(operator=op, operand=node, is_prefix=False, line=line, col=col)
+
+
+def _prefix_operand(value, line: int, col: int):
+    """Operand of a prefix ++ / -- at (line, col).
+
+    A parenthesised operand arrives as a node; an <id_val> as its raw
+    (token, suffix) pair, and takes the operator's position as in ASTBuilder.
+    """
+    if isinstance(value, tuple):
+        tok, suffix = value
+        return _access(tok[0], line, col, suffix)
+    return value
+
+
+def _wall_value(raw, binary: bool = False):
+    """Node for a parsed <wall_init>: (items back to front, line, col).
+
+    Operands that are themselves raw tuples are parenthesised groups.  The
+    '+' list becomes a WallConcatNode, or BinaryOpNodes when `binary` (how
+    ASTBuilder reads the trailing names of a cement wall).
+    """
+    items, line, col = raw
+    items = _rev(items)
+    for k in range(0, len(items), 2):
+        if isinstance(items[k], tuple):
+            items[k] = _wall_value(items[k], binary)
+    return _fold(items) if binary else _concat(items, line, col)
+
+
+def _rhs_value(rhs):
+    """Node for a parsed <assign_rhs>: (items, plain flags, wall_first).
+
+    As in ASTBuilder, a right-hand side that starts with a wall literal and
+    continues only with '+' and plain operands is a WallConcatNode; anything
+    else is folded as a binary expression.
+    """
+    items, plain, wall_first = rhs
+    items = _rev(items)
+    if wall_first and all(plain) and all(op[0] == '+' for op in items[1::2]):
+        return _concat(items, items[0].line, items[0].col)
+    return _fold(items)
+
+
+def _expr(items):
+    return _fold(_rev(items))
+
+
+def _init_2d(eq, row_lc, row, rows_r):
+    rows = [ArrayInitNode(elements=row, line=row_lc[1], col=row_lc[2])]
+    rows += _rev(rows_r)
+    return ArrayInitNode(elements=rows, line=eq[1], col=eq[2])
+
+
+# ---------------------------------------------------------------------------
+# Production actions
+# ---------------------------------------------------------------------------
+
+_ACTIONS: list = [None] * len(PRODUCTIONS)
+
+
+def _on(*numbers):
+    """Register the decorated function as the action of productions `numbers`."""
+    def register(fn):
+        for number in numbers:
+            _ACTIONS[number - 1] = fn
+        return fn
+    return register
+
+
+def _none(*_):
+    return None
+
+
+def _empty(*_):
+    return []
+
+
+def _first(value, *_):
+    return value
+
+
+def _append(_, value, rest):
+    """`sep <x> <tail>`: add x to the tail's list."""
+    rest.append(value)
+    return rest
+
+
+def _push(value, rest):
+    """`<x> <tail>`: add x to the tail's list."""
+    rest.append(value)
+    return rest
+
+
+# -- program ---------------------------------------------------------------
+
+@_on(1)  # <program> → <global> <program_body>
+def _program(globals_r, functions_r):
+    return _rev(globals_r), _rev(functions_r)
+
+
+@_on(2)  # <program_body> → wall id ( <param_list> ) { <func_body> } <program_body>
+def _wall_function(wall, name, lp, params, rp, lb, body_r, rb, rest):
+    rest.append(FunctionNode(return_type="wall", name=name[0], params=params,
+                             body=_rev(body_r), is_blueprint=False,
+                             line=wall[1], col=wall[2]))
+    return rest
+
+
+@_on(3)  # <program_body> → <return_type> <program_body2>
+def _typed_function(return_type, function):
+    name, params, body, is_blueprint, rest = function
+    rest.append(FunctionNode(return_type=return_type[0], name=name, params=params,
+                             body=body, is_blueprint=is_blueprint,
+                             line=return_type[1], col=return_type[2]))
+    return rest
+
+
+@_on(4)  # <program_body2> → id ( <param_list> ) { <func_body> } <program_body>
+def _function_rest(name, lp, params, rp, lb, body_r, rb, rest):
+    return name[0], params, _rev(body_r), False, rest
+
+
+@_on(5)  # <program_body2> → blueprint ( ) { <func_body> }
+def _blueprint(blueprint, lp, rp, lb, body_r, rb):
+    return "blueprint", [], _rev(body_r), True, []
+
+
+@_on(6)  # <global> → roof <global_dec> ; <global>
+def _global(roof, decl, semi, rest):
+    if isinstance(decl, list):
+        rest.extend(reversed(decl))
+    else:
+        rest.append(decl)
+    return rest
+
+
+_on(7)(_empty)
+_on(8, 10)(_first)
+
+
+@_on(9)  # <global_dec> → <structure>
+def _global_structure(structure):
+    house, type_name, members, vars_r = structure
+    nodes = []
+    if members is not None:
+        nodes.append(StructDeclNode(name=type_name, members=members,
+                                    line=house[1], col=house[2]))
+    for k, (tok, init) in enumerate(_rev(vars_r)):
+        # Only the form without a body puts its first variable at 'house'.
+        if k == 0 and members is None:
+            line, col = house[1], house[2]
+        else:
+            line, col = tok[1], tok[2]
+        nodes.append(VarDeclNode(type=f"house {type_name}", name=tok[0], init_value=init,
+                                 is_const=False, is_array=False, array_dims=None,
+                                 line=line, col=col))
+    return nodes
+
+
+# -- global variables ------------------------------------------------------
+
+@_on(11)  # <global_var> → <data_type> id <global_end>
+def _global_var(dtype, name, end):
+    init, is_array, dims = end
+    return VarDeclNode(type=dtype[0], name=name[0], init_value=init,
+                       is_const=False, is_array=is_array, array_dims=dims,
+                       line=dtype[1], col=dtype[2])
+
+
+@_on(12)  # <global_var> → wall id <global_wall_end>
+def _global_wall(wall, name, init):
+    return VarDeclNode(type="wall", name=name[0], init_value=init,
+                       is_const=False, is_array=False, array_dims=None,
+                       line=wall[1], col=wall[2])
+
+
+_on(13, 14, 15, 16)(_first)
+_on(17)(lambda init, mult: (init, False, None))      # <global_end> → <global_init> <global_mult>
+
+
+@_on(18)  # <global_end> → <array_dec>
+def _global_array_end(dec):
+    dims, init = dec
+    return init, True, dims
+
+
+_on(19)(lambda eq, value: value)                     # <global_init> → = <value>
+# Trailing names of a global declaration are validated and dropped.
+_on(20, 21, 22)(_none)
+
+
+# -- numeric and wall arrays -----------------------------------------------
+#
+# <array_dec> / <wall_array> yield (dims, init).
+
+_on(28, 49)(lambda lb, dec: dec)                     # <array_dec> → [ <arr_size>
+_on(29, 50)(lambda rb, dec: dec)                     # <arr_size> → ] <one_d_end>
+
+
+@_on(30, 51)  # <arr_size> → tile_lit ] <one_d_end2>
+def _sized(size, rb, end):
+    dims, init = end
+    return [int(size[0])] + dims, init
+
+
+@_on(31, 52)  # <one_d_end> → [ tile_lit ] = { { <elements> } <mult_elem2> }
+def _unsized_2d(lb, size, rb, eq, lc, row_lc, row, row_rc, rows_r, rc):
+    return [0, int(size[0])], _init_2d(eq, row_lc, row, rows_r)
+
+
+@_on(32, 53)  # <one_d_end> → = { <elements> }
+def _unsized_1d(eq, lc, elements, rc):
+    return [0], ArrayInitNode(elements=elements, line=eq[1], col=eq[2])
+
+
+@_on(33, 54)  # <one_d_end2> → [ tile_lit ] <two_d_end>
+def _second_dim(lb, size, rb, init):
+    return [int(size[0])], init
+
+
+@_on(34, 55, 105, 111)  # <one_d_end2> → = { <elements> }
+def _sized_1d(eq, lc, elements, rc):
+    return [], ArrayInitNode(elements=elements, line=eq[1], col=eq[2])
+
+
+_on(35, 56)(lambda: ([], None))
+
+
+@_on(36, 57)  # <two_d_end> → = { { <elements> } <mult_elem2> }
+def _two_d_init(eq, lc, row_lc, row, row_rc, rows_r, rc):
+    return _init_2d(eq, row_lc, row, rows_r)
+
+
+_on(37, 58)(_none)
+
+
+@_on(38)  # <elements> → <value> <mult_elem>
+def _elements(value, rest):
+    rest.append(value)
+    return _rev(rest)
+
+
+_on(39)(_append)                                     # <mult_elem> → , <value> <mult_elem>
+_on(40, 61)(_empty)
+_on(59)(lambda lit, rest: _elements(_lit(lit, "wall"), rest))
+_on(60)(lambda comma, lit, rest: _append(comma, _lit(lit, "wall"), rest))
+
+
+@_on(41, 62)  # <mult_elem2> → , { <elements> } <mult_elem2>
+def _mult_row(comma, lc, row, rc, rest):
+    rest.append(ArrayInitNode(elements=row, line=lc[1], col=lc[2]))
+    return rest
+
+
+_on(42, 63)(_empty)
+
+_on(43)(lambda init, mult: init)                     # <global_wall_end> → <global_wall_init> ...
+_on(44)(_none)                                       # global wall arrays are dropped
+_on(45)(lambda eq, lit: _lit(lit, "wall"))           # <global_wall_init> → = wall_lit
+_on(46, 47, 48)(_none)
+
+
+# -- structures ------------------------------------------------------------
+#
+# <structure> yields (house token, type name, members or None, variables);
+# the global and local declaration productions turn it into nodes.
+
+@_on(64)  # <structure> → house id <struct_type>
+def _structure(house, type_name, struct_type):
+    members, vars_r = struct_type
+    return house, type_name[0], members, vars_r
+
+
+_on(65)(_first)
+_on(66)(lambda vars_r: (None, vars_r))
+_on(67)(lambda lb, members, rb, vars_r: (members, vars_r))
+
+
+def _struct_member(decl, dims) -> StructMemberNode:
+    dtype, name, line, col = decl
+    return StructMemberNode(type=dtype, name=name, is_array=dims is not None,
+                            array_dims=dims, line=line, col=col)
+
+
+@_on(68)  # <struct_members> → <data_type_dec> <array> ; <mult_members>
+def _struct_members(decl, dims, semi, rest):
+    rest.append(_struct_member(decl, dims))
+    return _rev(rest)
+
+
+@_on(75)  # <mult_members> → <data_type_dec> <array> ; <mult_members>
+def _mult_members(decl, dims, semi, rest):
+    rest.append(_struct_member(decl, dims))
+    return rest
+
+
+_on(76)(_empty)
+
+
+@_on(69, 70)  # <data_type_dec> → <data_type> id | wall id
+def _data_type_dec(dtype, name):
+    return dtype[0], name[0], dtype[1], dtype[2]
+
+
+_on(71)(lambda lb, size, rb, rest: [int(size[0])] + rest)
+_on(72)(_none)
+_on(73)(lambda lb, size, rb: [int(size[0])])
+_on(74)(_empty)
+
+
+@_on(77, 96)  # <struct_id_end> → id <struct_init> <mult_struct_id>
+def _struct_vars(name, init, rest):
+    rest.append((name, init))
+    return rest
+
+
+_on(78)(_empty)
+
+
+@_on(79)  # <struct_init> → = { <struct_elem> }
+def _struct_init(eq, lc, elements_r, rc):
+    return ArrayInitNode(elements=_rev(elements_r), line=eq[1], col=eq[2])
+
+
+_on(80)(_none)
+_on(81)(_push)                                       # <struct_elem> → <struct_value> <mult_struct_elem>
+
+
+@_on(82)  # <struct_elem> → { <struct_arr_elem> } <mult_struct_elem>
+def _struct_brace_elem(lc, elements, rc, rest):
+    rest.append(ArrayInitNode(elements=elements, line=lc[1], col=lc[2]))
+    return rest
+
+
+_on(83)(_first)
+_on(84)(lambda lit: _lit(lit, "wall"))
+_on(85)(lambda comma, rest: rest)
+_on(86)(_empty)
+_on(87)(_first)
+
+
+@_on(88)  # <struct_arr_elem> → { <struct_elements> } <struct_mult_elem2>
+def _struct_rows(lc, row, rc, rows_r):
+    return [ArrayInitNode(elements=row, line=lc[1], col=lc[2])] + _rev(rows_r)
+
+
+_on(89)(_elements)                                   # <struct_elements>
+_on(90)(_append)
+_on(91)(_empty)
+_on(92)(_mult_row)
+_on(93)(_empty)
+
+
+@_on(94)  # <mult_struct_id> → , id <struct_init> <mult_struct_id>
+def _mult_struct_id(comma, name, init, rest):
+    rest.append((name, init))
+    return rest
+
+
+_on(95)(_empty)
+
+
+# -- global constants ------------------------------------------------------
+#
+# <global_const_type> yields (type, name, init, is_array, dims); only the
+# first name of a global const list becomes a node, as in ASTBuilder.
+
+@_on(97)  # <global_const> → cement <global_const_type>
+def _global_const(cement, decl):
+    dtype, name, init, is_array, dims = decl
+    return VarDeclNode(type=dtype, name=name, init_value=init,
+                       is_const=True, is_array=is_array, array_dims=dims,
+                       line=cement[1], col=cement[2])
+
+
+@_on(98, 99)  # <global_const_type> → <data_type> id <global_const_end>
+def _global_const_type(dtype, name, end):
+    return (dtype[0], name[0]) + end
+
+
+@_on(100)  # <global_const_type> → house id id = { <struct_elem> } <global_const_struct>
+def _global_const_struct(house, type_name, name, eq, lc, elements_r, rc, rest):
+    init = ArrayInitNode(elements=_rev(elements_r), line=eq[1], col=eq[2])
+    return f"house {type_name[0]}", name[0], init, False, None
+
+
+_on(101)(lambda eq, value, rest: (value, False, None))
+_on(107)(lambda eq, lit, rest: (_lit(lit, "wall"), False, None))
+
+
+@_on(102, 108)  # <global_const_end> → [ tile_lit ] <global_const_end2>
+def _const_array(lb, size, rb, end):
+    dims, init = end
+    return init, True, [int(size[0])] + dims
+
+
+@_on(106, 112)  # <global_const_end2> → [ tile_lit ] = { { <elements> } <mult_elem2> }
+def _const_2d(lb, size, rb, eq, lc, row_lc, row, row_rc, rows_r, rc):
+    return [int(size[0])], _init_2d(eq, row_lc, row, rows_r)
+
+
+_on(103, 104, 109, 110, 113, 114)(_none)
+
+
+# -- functions -------------------------------------------------------------
+
+_on(115, 116)(_first)
+
+
+def _param(decl) -> ParamNode:
+    dtype, name, line, col = decl
+    return ParamNode(type=dtype, name=name, line=line, col=col)
+
+
+@_on(117)  # <param_list> → <data_type_dec> <mult_param>
+def _param_list(decl, rest):
+    rest.append(_param(decl))
+    return _rev(rest)
+
+
+@_on(119)  # <mult_param> → , <data_type_dec> <mult_param>
+def _mult_param(comma, decl, rest):
+    rest.append(_param(decl))
+    return rest
+
+
+_on(118, 120)(_empty)
+
+
+@_on(121)  # <func_body> → <local> <func_body2>
+def _func_body_local(decls, rest):
+    rest.extend(reversed(decls))
+    return rest
+
+
+_on(122)(_push)                                      # <func_body> → <statement> <func_body2>
+_on(123)(_first)
+_on(124)(_empty)
+_on(125)(_first)                                     # <local> → <declaration> ;
+_on(126, 128)(_first)
+
+
+@_on(127)  # <declaration> → <structure>
+def _local_structure(structure):
+    # A local struct definition is dropped, and the first variable is
+    # positioned at 'house'.
+    house, type_name, members, vars_r = structure
+    nodes = []
+    for k, (tok, init) in enumerate(_rev(vars_r)):
+        line, col = (house[1], house[2]) if k == 0 else (tok[1], tok[2])
+        nodes.append(VarDeclNode(type=f"house {type_name}", name=tok[0], init_value=init,
+                                 is_const=False, is_array=False, array_dims=None,
+                                 line=line, col=col))
+    return nodes
+
+
+# -- local variables and constants -----------------------------------------
+#
+# <var_end>, <wall_end>, <const_end>, ... yield the first name's
+# (init, is_array, dims) and the trailing (token, init) pairs, back to front.
+
+def _decls(dtype, name, line, col, end, is_const):
+    (init, is_array, dims), extras_r = end
+    nodes = [VarDeclNode(type=dtype, name=name, init_value=init,
+                         is_const=is_const, is_array=is_array, array_dims=dims,
+                         line=line, col=col)]
+    for tok, extra_init in _rev(extras_r):
+        nodes.append(VarDeclNode(type=dtype, name=tok[0], init_value=extra_init,
+                                 is_const=is_const, is_array=False, array_dims=None,
+                                 line=tok[1], col=tok[2]))
+    return nodes
+
+
+_on(129)(lambda dtype, name, end: _decls(dtype[0], name[0], dtype[1], dtype[2], end, False))
+_on(130)(lambda wall, name, end: _decls("wall", name[0], wall[1], wall[2], end, False))
+_on(131)(lambda init, rest: ((init, False, None), rest))
+
+
+@_on(132, 187)  # <var_end> → <array_dec>
+def _var_array_end(dec):
+    dims, init = dec
+    return (init, True, dims), []
+
+
+_on(133)(lambda eq, items: _expr(items))             # <initializer> → = <expression>
+_on(134)(_none)
+
+
+@_on(135)  # <mult_var> → , id <initializer> <mult_var>
+def _mult_var(comma, name, init, rest):
+    rest.append((name, init))
+    return rest
+
+
+_on(136)(_empty)
+
+
+@_on(186)  # <wall_end> → <wall_initializer> <mult_wall>
+def _wall_end(raw, rest):
+    extras_r = [(tok, _wall_value(extra) if extra is not None else None)
+                for tok, extra in rest]
+    return (_wall_value(raw) if raw is not None else None, False, None), extras_r
+
+
+_on(188)(lambda eq, raw: raw)                        # <wall_initializer> → = <wall_init>
+_on(189)(_none)
+
+# <wall_init> yields (operands and '+' tokens back to front, line, col).
+
+
+@_on(190)  # <wall_init> → ( <wall_init> ) <wall_op>
+def _wall_group(lp, inner, rp, rest):
+    rest.append(inner)
+    return rest, lp[1], lp[2]
+
+
+@_on(191)  # <wall_init> → wall_lit <wall_op>
+def _wall_lit(lit, rest):
+    rest.append(_lit(lit, "wall"))
+    return rest, lit[1], lit[2]
+
+
+@_on(192)  # <wall_init> → id <id_type> <wall_op>
+def _wall_id(name, id_type, rest):
+    rest.append(_id_expr(name, id_type))
+    return rest, name[1], name[2]
+
+
+@_on(193)  # <wall_op> → + <wall_init>
+def _wall_op(plus, raw):
+    items = raw[0]
+    items.append(plus)
+    return items
+
+
+_on(194)(_empty)
+
+
+@_on(195)  # <mult_wall> → , id <wall_initializer> <mult_wall>
+def _mult_wall(comma, name, raw, rest):
+    rest.append((name, raw))
+    return rest
+
+
+_on(196)(_empty)
+
+
+@_on(197)  # <constant> → cement <const_type>
+def _constant(cement, decl):
+    dtype, name, end = decl
+    return _decls(dtype, name, cement[1], cement[2], end, True)
+
+
+_on(198)(lambda dtype, name, end: (dtype[0], name[0], end))
+_on(199)(lambda wall, name, end: ("wall", name[0], end))
+
+
+@_on(200)  # <const_type> → house id id = { <struct_elem> } <mult_const_struct>
+def _const_struct_type(house, type_name, name, eq, lc, elements_r, rc, rest):
+    init = ArrayInitNode(elements=_rev(elements_r), line=eq[1], col=eq[2])
+    return f"house {type_name[0]}", name[0], ((init, False, None), rest)
+
+
+_on(201)(lambda eq, items, rest: ((_expr(items), False, None), rest))
+_on(202, 206)(lambda lb, size, rb, end: (_const_array(lb, size, rb, end), []))
+
+
+@_on(203)  # <mult_const> → , id = <expression> <mult_const>
+def _mult_const(comma, name, eq, items, rest):
+    rest.append((name, _expr(items)))
+    return rest
+
+
+_on(204)(_empty)
+
+
+@_on(205)  # <const_wall_end> → = <wall_init> <mult_wall>
+def _const_wall_end(eq, raw, rest):
+    # ASTBuilder reads the trailing names of a cement wall as expressions.
+    extras_r = [(tok, _wall_value(extra, binary=True) if extra is not None else None)
+                for tok, extra in rest]
+    return (_wall_value(raw), False, None), extras_r
+
+
+@_on(207)  # <mult_const_struct> → , id = { <struct_elem> } <mult_const_struct>
+def _mult_const_struct(comma, name, eq, lc, elements_r, rc, rest):
+    rest.append((name, ArrayInitNode(elements=_rev(elements_r), line=eq[1], col=eq[2])))
+    return rest
+
+
+_on(208)(_empty)
+
+
+# -- expressions -----------------------------------------------------------
+#
+# <expression>, <condition> and <for_exp> (with their <*_op> and
+# <prefix_*> helpers) have the same shape and share actions.
+
+@_on(137, 253, 284)  # <expression> → <value> <exp_op>
+def _exp_value(value, rest):
+    rest.append(value)
+    return rest
+
+
+@_on(138, 254, 285)  # <expression> → id <id_type> <exp_op>
+def _exp_id(name, id_type, rest):
+    rest.append(_id_expr(name, id_type))
+    return rest
+
+
+@_on(139, 255, 286)  # <expression> → ( <expression> ) <postfix_op> <exp_op>
+def _exp_paren(lp, inner, rp, op, rest):
+    node = _expr(inner)
+    if op is not None:
+        node = UnaryOpNode(operator=op, operand=node, is_prefix=False, line=lp[1], col=lp[2])
+    rest.append(node)
+    return rest
+
+
+@_on(140, 141, 256, 257, 287, 288)  # <expression> → - <expression> | ! <expression>
+def _exp_negate(op, items):
+    # The operator binds to the first operand only.
+    items[-1] = UnaryOpNode(operator=op[0], operand=items[-1], is_prefix=True,
+                            line=op[1], col=op[2])
+    return items
+
+
+@_on(142, 258, 289)  # <expression> → <unary_op> <prefix_exp> <exp_op>
+def _exp_prefix(op, operand, rest):
+    rest.append(UnaryOpNode(operator=op[0], operand=_prefix_operand(operand, op[1], op[2]),
+                            is_prefix=True, line=op[1], col=op[2]))
+    return rest
+
+
+@_on(143, 259, 290)  # <exp_op> → <operator> <expression>
+def _exp_op(op, items):
+    items.append(op)
+    return items
+
+
+_on(144, 260, 291)(_empty)
+_on(167, 261, 292)(lambda lp, items, rp: _expr(items))  # <prefix_exp> → ( <expression> )
+_on(168, 262, 293)(_first)                               # <prefix_exp> → <id_val>
+
+# <id_type> yields None or (kind, a, b):
+#   ('call', args, None)  ('post', op, None)  ('access', suffix, postfix op or None)
+_on(145)(_first)
+_on(146)(lambda op: ('post', op[0], None))
+_on(147)(_none)
+_on(148)(lambda suffix, op: ('access', suffix, op))
+_on(149)(lambda args: ('call', args, None))
+_on(150, 151)(_first)
+
+# <id_type3> / <arr_struct> yield None, index expressions, or
+# (member, index expressions or None).
+_on(152, 156)(lambda lb, items, rb, rest: [_expr(items)] + rest)
+_on(153)(lambda lb, items, rb: [_expr(items)])
+_on(154)(_empty)
+_on(155)(lambda dot, member, indices: (member[0], indices))
+_on(157)(_none)
+_on(158)(lambda lp, args, rp: args)                  # <func_call> → ( <func_argu> )
+
+
+@_on(159)  # <func_argu> → <assign_rhs> <func_mult_call>
+def _func_argu(rhs, rest):
+    rest.append(_rhs_value(rhs))
+    return _rev(rest)
+
+
+@_on(161)  # <func_mult_call> → , <assign_rhs> <func_mult_call>
+def _func_mult_call(comma, rhs, rest):
+    rest.append(_rhs_value(rhs))
+    return rest
+
+
+_on(160, 162)(_empty)
+_on(163)(lambda op: op[0])                           # <postfix_op> → <unary_op>
+_on(164)(_none)
+_on(165, 166)(_first)                                # <unary_op>: the token
+_on(169)(lambda name, suffix: (name, suffix))        # <id_val> → id <id_type3>
+_on(170, 171)(_first)
+_on(172)(_none)
+_on(*range(173, 186))(_first)                        # <operator>: the token
+
+
+# -- statements ------------------------------------------------------------
+
+_on(*range(209, 219))(_first)
+
+
+@_on(219)  # <io_statement> → write ( wall_lit , <write_argu> ) ;
+def _write(write, lp, fmt, comma, args_r, rp, semi):
+    return IONode(io_type="write", format_string=fmt[0], args=_rev(args_r),
+                  line=write[1], col=write[2])
+
+
+@_on(220)  # <io_statement> → view ( wall_lit <view_argu> ) ;
+def _view(view, lp, fmt, args_r, rp, semi):
+    return IONode(io_type="view", format_string=fmt[0], args=_rev(args_r),
+                  line=view[1], col=view[2])
+
+
+@_on(221)  # <write_argu> → & <id_val> <mult_write_argu>
+def _write_address(amp, id_val, rest):
+    (name, _, _), suffix = id_val
+    rest.append(_access(name, amp[1], amp[2], suffix))
+    return rest
+
+
+@_on(222)  # <write_argu> → <id_val> <mult_write_argu>
+def _write_argu(id_val, rest):
+    (name, line, col), suffix = id_val
+    rest.append(_access(name, line, col, suffix))
+    return rest
+
+
+_on(223)(lambda comma, rest: rest)
+_on(224)(_empty)
+
+
+@_on(225)  # <view_argu> → , <assign_rhs> <mult_view_argu>
+def _view_argu(comma, rhs, rest):
+    rest.append(_rhs_value(rhs))
+    return rest
+
+
+_on(226)(_empty)
+_on(227)(_first)
+_on(228)(_empty)
+
+
+@_on(229)  # <assign_statement> → <unary_op> id <id_type3> ;
+def _prefix_statement(op, name, suffix, semi):
+    target = _access(name[0], op[1], op[2], suffix)
+    return UnaryOpNode(operator=op[0], operand=target, is_prefix=True, line=op[1], col=op[2])
+
+
+@_on(230)  # <assign_statement> → id <id_type4> ;
+def _id_statement(name, rest, semi):
+    name, line, col = name
+    if rest[0] == 'call':
+        return FunctionCallNode(func_name=name, args=rest[1], line=line, col=col)
+    _, suffix, (op, value) = rest
+    target = _access(name, line, col, suffix)
+    if value is None:
+        return UnaryOpNode(operator=op, operand=target, is_prefix=False, line=line, col=col)
+    return AssignNode(target=target, value=value, operator=op, line=line, col=col)
+
+
+# <id_type4> yields ('call', args) or ('assign', suffix, <assign_end>);
+# <assign_end> yields (operator, value), value None for a postfix ++ / --.
+_on(231)(lambda lp, args, rp: ('call', args))
+_on(232)(lambda suffix, end: ('assign', suffix, end))
+_on(233)(lambda op: (op[0], None))
+_on(234)(lambda op, items: (op[0], _expr(items)))
+_on(235)(lambda eq, rhs: ("=", _rhs_value(rhs)))
+_on(236, 237, 238, 239, 240)(_first)
+
+# <assign_rhs> yields (items, plain flags, wall_first), items and flags back
+# to front.  An operand is plain when ASTBuilder's wall concatenation loop
+# would accept it: a wall literal, an identifier access or call, or a
+# parenthesised expression, with no ++ / --.
+
+
+@_on(241)  # <assign_rhs> → <value> <assign_exp>
+def _rhs_value_operand(value, rest):
+    items, plain = rest
+    items.append(value)
+    plain.append(False)
+    return items, plain, False
+
+
+@_on(242)  # <assign_rhs> → id <id_type> <assign_exp>
+def _rhs_id(name, id_type, rest):
+    items, plain = rest
+    node = _id_expr(name, id_type)
+    items.append(node)
+    plain.append(not isinstance(node, UnaryOpNode))
+    return items, plain, False
+
+
+@_on(243)  # <assign_rhs> → ( <assign_rhs> ) <postfix_op> <assign_exp>
+def _rhs_paren(lp, inner, rp, op, rest):
+    items, plain = rest
+    node = _expr(inner[0])
+    if op is not None:
+        node = UnaryOpNode(operator=op, operand=node, is_prefix=False, line=lp[1], col=lp[2])
+    items.append(node)
+    plain.append(op is None)
+    return items, plain, False
+
+
+@_on(244, 245)  # <assign_rhs> → - <assign_rhs> | ! <assign_rhs>
+def _rhs_negate(op, rhs):
+    items, plain, _ = rhs
+    items[-1] = UnaryOpNode(operator=op[0], operand=items[-1], is_prefix=True,
+                            line=op[1], col=op[2])
+    plain[-1] = False
+    return items, plain, False
+
+
+@_on(246)  # <assign_rhs> → <unary_op> <assign_prefix_exp> <assign_exp>
+def _rhs_prefix(op, operand, rest):
+    items, plain = rest
+    items.append(UnaryOpNode(operator=op[0], operand=_prefix_operand(operand, op[1], op[2]),
+                             is_prefix=True, line=op[1], col=op[2]))
+    plain.append(False)
+    return items, plain, False
+
+
+@_on(247)  # <assign_rhs> → wall_lit <assign_exp>
+def _rhs_wall(lit, rest):
+    items, plain = rest
+    items.append(_lit(lit, "wall"))
+    plain.append(True)
+    return items, plain, True
+
+
+@_on(248)  # <assign_exp> → <operator> <assign_rhs>
+def _assign_exp(op, rhs):
+    items, plain, _ = rhs
+    items.append(op)
+    return items, plain
+
+
+_on(249)(lambda: ([], []))
+_on(250)(lambda lp, rhs, rp: _expr(rhs[0]))          # <assign_prefix_exp> → ( <assign_rhs> )
+_on(251)(_first)
+
+
+@_on(252)  # <if_statement> → if ( <condition> ) { <func_body> } <else_statement>
+def _if(if_, lp, cond, rp, lb, body_r, rb, else_body):
+    return IfNode(condition=_expr(cond), then_body=_rev(body_r), else_body=else_body,
+                  line=if_[1], col=if_[2])
+
+
+_on(263)(lambda else_, body: body)
+_on(264)(_none)
+_on(265)(lambda stmt: [stmt])
+_on(266, 277)(lambda lb, body_r, rb: _rev(body_r))
+
+
+@_on(267)  # <switch_statement> → room ( <condition> ) { <switch_body> }
+def _switch(room, lp, cond, rp, lb, cases_r, rb):
+    return SwitchNode(expr=_expr(cond), cases=_rev(cases_r), line=room[1], col=room[2])
+
+
+@_on(268)  # <switch_body> → door <case_val> : <case_body> <mult_switch_body>
+def _case(door, value, colon, body, rest):
+    rest.append(CaseNode(value=value, body=body, is_default=False, line=door[1], col=door[2]))
+    return rest
+
+
+@_on(269)  # <switch_body> → ground : <case_body>
+def _default_case(ground, colon, body):
+    return [CaseNode(value=None, body=body, is_default=True, line=ground[1], col=ground[2])]
+
+
+_on(270)(_first)
+_on(271)(_empty)
+
+
+@_on(276)  # <case_body> → <statement> <mult_smt>
+def _case_body(stmt, rest):
+    rest.append(stmt)
+    return _rev(rest)
+
+
+_on(278)(_empty)
+_on(279)(_push)                                      # <mult_smt> → <statement> <mult_smt>
+_on(280)(_empty)
+
+
+@_on(281)  # <for_statement> → for ( <for_dec> ; <for_exp> ; <condition> ) { <func_body> }
+def _for(for_, lp, init, semi1, cond, semi2, incr, rp, lb, body_r, rb):
+    return ForNode(init=init, condition=_expr(cond), increment=_expr(incr),
+                   body=_rev(body_r), line=for_[1], col=for_[2])
+
+
+@_on(282)  # <for_dec> → <data_type> id <initializer>
+def _for_decl(dtype, name, init):
+    return VarDeclNode(type=dtype[0], name=name[0], init_value=init,
+                       is_const=False, is_array=False, array_dims=None,
+                       line=dtype[1], col=dtype[2])
+
+
+@_on(283)  # <for_dec> → id <id_type3> <initializer>
+def _for_assign(name, suffix, value):
+    name, line, col = name
+    target = _access(name, line, col, suffix)
+    if value is None:
+        return target
+    return AssignNode(target=target, value=value, operator="=", line=line, col=col)
+
+
+@_on(294)  # <while_statement> → while ( <condition> ) { <func_body> }
+def _while(while_, lp, cond, rp, lb, body_r, rb):
+    return WhileNode(condition=_expr(cond), body=_rev(body_r), line=while_[1], col=while_[2])
+
+
+@_on(295)  # <dowhile_statement> → do { <func_body> } while ( <condition> ) ;
+def _do_while(do, lb, body_r, rb, while_, lp, cond, rp, semi):
+    return DoWhileNode(body=_rev(body_r), condition=_expr(cond), line=do[1], col=do[2])
+
+
+_on(296)(lambda crack, semi: BreakNode(line=crack[1], col=crack[2]))
+_on(297)(lambda mend, semi: ContinueNode(line=mend[1], col=mend[2]))
+_on(298)(lambda home, rhs, semi: ReturnNode(value=_rhs_value(rhs), line=home[1], col=home[2]))
+
+
+# <value> and <case_val> → literal token.
+def _literal(literal_type):
+    return lambda tok: _lit(tok, literal_type)
+
+
+for _p, (_, _lhs, _rhs) in enumerate(PRODUCTIONS):
+    if _lhs in ('<value>', '<case_val>'):
+        _ACTIONS[_p] = _literal(LITERAL_TO_TYPE[_rhs[0]])
+
+_missing = [PRODUCTIONS[p][0] for p, action in enumerate(_ACTIONS) if action is None]
+if _missing:
+    raise RuntimeError(f"ast_parser: no action for productions {_missing}")
+
+
+class ASTParser(Parser):
+    """Parser that builds the AST while it validates.
+
+    Usage
+    -----
+        parser = ASTParser(tokens)
+        errors = parser.parse()
+        program_node = parser.ast     # None when there were syntax errors
+
+    Error reporting is inherited from Parser unchanged.
+    """
+
+    def __init__(self, tokens):
+        super().__init__(tokens)
+        self.ast = None
+
+    def parse(self, _predict_set=None):
+        line, col = self.current_line, self.current_col
+        program = self._run(_ACTIONS)
+
+        if not self.stop and self.current_code != EOF:
+            self._add_error(f"Extra token after program end: {self.current_lexeme!r}")
+
+        if self.errors:
+            self.ast = None
+        else:
+            globals_list, functions = program
+            self.ast = ProgramNode(globals=globals_list, functions=functions,
+                                   line=line, col=col)
+        return self.errors
@@ -0,0 +1,91 @@
+from array import array
+
+from parser.cfg import PRODUCTIONS
+from parser.predict_set import PREDICT_SET
+from lexer.token_codes import TOKEN_CODES, TOKEN_NAMES
+
+# ---------------------------------------------------------------------------
+# LL(1) parse table, generated at import time from cfg.PRODUCTIONS and
+# PREDICT_SET.
+#
+# Stack symbols are ints:
+#   0 .. N_TERMINALS-1          terminal with that token code
+#   N_TERMINALS .. N_SYMBOLS-1  non-terminal NONTERMINALS[sym - N_TERMINALS]
+#   N_SYMBOLS + p               end of production p (pushed only when the
+#                               driver evaluates actions)
+#   POP_CONTEXT, -2 - k         pop / push CONTEXTS[k] on the parser's
+#                               context_stack
+#
+# PARSE_TABLE is dense: row = non-terminal, column = token code, entry =
+# production index (into PRODUCTIONS) or -1.  Where two productions of a
+# non-terminal predict the same token, the first one wins — the order in
+# which the recursive-descent parser tested them.
+# ---------------------------------------------------------------------------
+
+LAMBDA = 'λ'
+
+N_TERMINALS = len(TOKEN_NAMES)
+
+
+def _is_nonterminal(symbol: str) -> bool:
+    return len(symbol) > 2 and symbol[0] == '<' and symbol[-1] == '>'
+
+
+def _predict_key(lhs: str, k: int) -> str:
+    """PREDICT_SET key of the k-th production of `lhs`: '<exp_op>', '<exp_op_1>', ..."""
+    return lhs if k == 0 else f"{lhs[:-1]}_{k}>"
+
+
+# The one grammar ambiguity the table cannot see: FOLLOW(<for_op>) = {) ;},
+# and which of the two is valid depends on the for-loop clause.  Parsing
+# these symbols of <for_statement> runs with the context pushed.
+CONTEXTS = ('for_condition', 'for_increment')
+POP_CONTEXT = -1
+_CONTEXT_RULES = {
+    ('<for_statement>', '<for_exp>'):   'for_condition',
+    ('<for_statement>', '<condition>'): 'for_increment',
+}
+
+
+def _build():
+    nonterminals = []
+    for _, lhs, _ in PRODUCTIONS:
+        if lhs not in nonterminals:
+            nonterminals.append(lhs)
+    nt_code = {nt: N_TERMINALS + i for i, nt in enumerate(nonterminals)}
+
+    table = array('h', [-1]) * (len(nonterminals) * N_TERMINALS)
+    rhs_reversed = []
+    arity = []
+    seen = {}
+    for p, (_, lhs, rhs) in enumerate(PRODUCTIONS):
+        k = seen.get(lhs, 0)
+        seen[lhs] = k + 1
+        row = (nt_code[lhs] - N_TERMINALS) * N_TERMINALS
+        for token in PREDICT_SET[_predict_key(lhs, k)]:
+            cell = row + TOKEN_CODES[token]
+            if table[cell] < 0:
+                table[cell] = p
+
+        symbols = []
+        for symbol in rhs:
+            if symbol == LAMBDA:
+                continue
+            if _is_nonterminal(symbol):
+                context = _CONTEXT_RULES.get((lhs, symbol))
+                if context is not None:
+                    symbols += [-2 - CONTEXTS.index(context), nt_code[symbol], POP_CONTEXT]
+                else:
+                    symbols.append(nt_code[symbol])
+            else:
+                symbols.append(TOKEN_CODES[symbol])
+        rhs_reversed.append(tuple(reversed(symbols)))
+        arity.append(sum(1 for s in symbols if s >= 0))
+
+    return nonterminals, table, rhs_reversed, arity
+
+
+NONTERMINALS, PARSE_TABLE, RHS_REVERSED, ARITY = _build()
+
+N_SYMBOLS = N_TERMINALS + len(NONTERMINALS)
+START = N_TERMINALS + NONTERMINALS.index('<program>')
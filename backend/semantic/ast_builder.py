@@ -16,15 +16,15 @@
 # DEPENDENCIES
 # ------------
 #   - Imports all node types from semantic/ast.py.
-#   - Receives a token list from the caller (ParserV2 output).
+#   - Receives a token list or TokenStream from the caller (ParserV2 input).
 #   - Has NO knowledge of the SymbolTable or SemanticAnalyzer.
 #
 # DATA FLOW
 # ---------
 #   token list (whitespace/comment tokens already present)
 #       │
-#       ▼ (ASTBuilder filters IGNORE_TYPES on construction)
-#   filtered token list
+#       ▼ (ASTBuilder masks IGNORE_TYPES out of the TokenStream)
+#   TokenStreamView of the significant tokens
 #       │
 #       ▼ build_program()
 #   ProgramNode
@@ -77,6 +77,8 @@
 # ===========================================================================
 
 from typing import List, Optional, Any
+from lexer.token_stream import TokenStream
+from lexer.token_codes import TOKEN_NAMES
 from semantic.ast import (
     ProgramNode, FunctionNode, ParamNode,
     GlobalDeclNode, VarDeclNode, StructDeclNode, StructMemberNode,
@@ -114,18 +116,6 @@ LITERAL_TO_TYPE = {
 DATA_TYPES = {"tile", "glass", "brick", "beam", "wall"}
 
 
-def _norm(token_type: str) -> str:
-    """Normalise numbered identifier token types to 'id'.
-
-    The Lexer emits id1, id2, id3, ... for identifiers in different positions.
-    This mirrors the normalisation done in parserV2 so that all identifier
-    tokens can be matched with a single string 'id'.
-    """
-    if isinstance(token_type, str) and token_type.startswith("id"):
-        return "id"
-    return token_type
-
-
 # ---------------------------------------------------------------------------
 # ASTBuilder class
 # ---------------------------------------------------------------------------
@@ -143,11 +133,11 @@ class ASTBuilder:
     """
 
     def __init__(self, tokens):
-        # Filter insignificant tokens once upfront.
-        self.tokens = [
-            t for t in (tokens or [])
-            if getattr(t, "tokenType", None) not in IGNORE_TYPES
-        ]
+        # Filter insignificant tokens once upfront.  A TokenStream is masked
+        # column-wise; a plain Token list is converted first.
+        if not isinstance(tokens, TokenStream):
+            tokens = TokenStream.from_tokens(tokens or [])
+        self.tokens = tokens.without_types(IGNORE_TYPES)
         self.pos = 0  # index into self.tokens
 
     # -----------------------------------------------------------------------
@@ -171,25 +161,27 @@ class ASTBuilder:
 
     def _type(self) -> str:
         """Return the normalised type of the current token ('EOF' at end)."""
-        t = self._cur()
-        if t is None:
+        if self.pos >= len(self.tokens):
             return "EOF"
-        return _norm(t.tokenType)
+        return TOKEN_NAMES[self.tokens.types[self.pos]]
 
     def _lexeme(self) -> str:
         """Return the raw lexeme of the current token ('' at EOF)."""
-        t = self._cur()
-        return t.lexeme if t else ""
+        if self.pos >= len(self.tokens):
+            return ""
+        return self.tokens.lexeme(self.pos)
 
     def _line(self) -> int:
         """Return the source line of the current token (1 at EOF)."""
-        t = self._cur()
-        return t.line if t else 1
+        if self.pos >= len(self.tokens):
+            return 1
+        return self.tokens.line(self.pos)
 
     def _col(self) -> int:
         """Return the source column of the current token (1 at EOF)."""
-        t = self._cur()
-        return t.column if t else 1
+        if self.pos >= len(self.tokens):
+            return 1
+        return self.tokens.column(self.pos)
 
     def _advance(self):
         """Consume and return the current token (advances position)."""
@@ -218,7 +210,7 @@ class ASTBuilder:
         idx = self.pos + offset
         if idx >= len(self.tokens):
             return "EOF"
-        return _norm(self.tokens[idx].tokenType)
+        return TOKEN_NAMES[self.tokens.types[idx]]
 
     def _is(self, *types) -> bool:
         """Return True if the current token's type matches any of `types`."""
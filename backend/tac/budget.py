@@ -0,0 +1,109 @@
+import time
+from dataclasses import dataclass, fields
+from typing import Optional, Union
+
+# ---------------------------------------------------------------------------
+# Execution budget  —  resource limits for one program run
+#
+# An interpreter is given an ExecutionBudget and enforces it as it runs:
+#
+#   max_instructions  the existing loop guard; hitting it reports "Infinite
+#                     loop detected" (once per active frame) as before
+#   max_seconds       wall-clock time, polled every CHECK_INTERVAL
+#                     instructions — only when a time limit is set
+#   max_output_lines  view() lines
+#   max_output_bytes  UTF-8 bytes of view() output
+#   max_memory_cells  cells in use at once: elements of allocated arrays
+#                     and characters of concatenated (or repeated) strings,
+#                     counted when built and released when the call that
+#                     built them returns (the global initialisation's stay)
+#   max_call_depth    active function calls, blueprint() included; calls
+#                     do not use the Python stack, so this is the only bound
+#
+# None means unlimited (the interpreter's own bound, for the instruction
+# and call depth limits).  Apart from the instruction limit, a limit that is
+# hit stops the run at once: the interpreter raises LimitExceeded, which
+# run() turns into a runtime error plus a structured report of the limit.
+# ---------------------------------------------------------------------------
+
+# Instructions between two looks at the clock.
+CHECK_INTERVAL = 1024
+
+Number = Union[int, float]
+
+_MESSAGES = {
+    "max_instructions": "Infinite loop detected",
+    "max_seconds":      "Runtime error: time limit of {max:g} s exceeded",
+    "max_output_lines": "Runtime error: output limit of {max} lines exceeded",
+    "max_output_bytes": "Runtime error: output limit of {max} bytes exceeded",
+    "max_memory_cells": "Runtime error: memory limit of {max} cells exceeded",
+    "max_call_depth":   "Runtime error: call depth limit of {max} exceeded",
+}
+
+
+@dataclass
+class ExecutionBudget:
+    """Resource limits for one run (None = unlimited).
+
+    max_instructions defaults to the interpreter's MAX_ITERATIONS and
+    max_call_depth to its MAX_CALL_DEPTH.
+    """
+    max_instructions: Optional[int] = None
+    max_seconds:      Optional[float] = None
+    max_output_lines: Optional[int] = None
+    max_output_bytes: Optional[int] = None
+    max_memory_cells: Optional[int] = None
+    max_call_depth:   Optional[int] = None
+
+    def tightened(self, other: "ExecutionBudget") -> "ExecutionBudget":
+        """A budget with, for every limit, the stricter of self's and other's."""
+        limits = {}
+        for f in fields(self):
+            a, b = getattr(self, f.name), getattr(other, f.name)
+            limits[f.name] = b if a is None else a if b is None else min(a, b)
+        return ExecutionBudget(**limits)
+
+
+def limit_report(limit: str, maximum: Number, used: Number) -> dict:
+    """The structured report of a limit that was hit:
+    {"limit": <budget field>, "max": <its value>, "used": <reached>}."""
+    return {"limit": limit, "max": maximum, "used": used}
+
+
+class LimitExceeded(Exception):
+    """A budget limit was hit; stops the run."""
+
+    def __init__(self, limit: str, maximum: Number, used: Number):
+        super().__init__(_MESSAGES[limit].format(max=maximum))
+        self.report = limit_report(limit, maximum, used)
+
+
+class Clock:
+    """Wall-clock time a run with a time limit has spent executing.
+
+    A run that pauses (TACInterpreter.step) stops its clock in between, so
+    time spent waiting for input or parked does not count.
+    """
+
+    def __init__(self, max_seconds: float, elapsed: float = 0.0):
+        self.max_seconds = max_seconds
+        self.spent = elapsed                      # up to start
+        self.start: Optional[float] = time.perf_counter()   # None while paused
+
+    def elapsed(self) -> float:
+        if self.start is None:
+            return self.spent
+        return self.spent + time.perf_counter() - self.start
+
+    def check(self):
+        elapsed = self.elapsed()
+        if elapsed > self.max_seconds:
+            raise LimitExceeded("max_seconds", self.max_seconds, round(elapsed, 3))
+
+    def pause(self):
+        self.spent = self.elapsed()
+        self.start = None
+
+    def resume(self):
+        if self.start is None:
+            self.start = time.perf_counter()
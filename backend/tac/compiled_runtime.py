@@ -0,0 +1,928 @@
+import math
+import operator
+from typing import Any, Callable, Dict, List, Optional
+
+from .budget import ExecutionBudget, LimitExceeded
+from .slot_frames import (GLOBAL, LOCAL, UNSET, ScopeResolution, SlotFrame,
+                          SlotRecord, _is_plain, _is_temp)
+from .tac_runtime import RuntimeFault, Suspended, TACInterpreter, _NOT_LITERAL
+
+# ---------------------------------------------------------------------------
+# CompiledTACInterpreter  —  closure-compiled execution engine
+#
+# Before running, every instruction is turned into a closure  step(frame) → pc
+# that has its operands already classified: literals are parsed once into
+# constants, names become fixed slot indexes (slot_frames.py lays out each
+# function's locals and temporaries, and the globals, at load time and
+# decides there whether a name is local or global), jump targets become
+# instruction indexes, and the binary operator is bound to the function
+# that implements it.  The run loop is then just
+#
+#     pc = code[pc](frame)
+#
+# where frame is the slot list of the current activation.  Calls and
+# returns push / pop the SlotRecord themselves and hand back
+# switch + target  (switch = len(code) + 1), which drops out of the inner
+# loop so the frame can be swapped; no Python recursion is needed per arCh
+# call.  A paused run (see TACInterpreter.stream) continues in one such
+# loop whatever the depth.
+#
+# Results are identical to TACInterpreter (the reference engine): the same
+# resolution order, error messages, iteration accounting and the
+# "Infinite loop detected" message once per active frame.  Budget checks
+# that cost something per instruction (string sizes, output) are only
+# compiled in when the ExecutionBudget sets that limit.  Uncommon paths
+# (subscripted or member destinations, flat-key array / struct reads,
+# write(), built-in calls) reuse the TACInterpreter helpers on the frame's
+# mapping view.
+#
+# A typed binop (see ir.py) whose operator would otherwise run through a
+# Python function — / and %, + and * under a memory budget, anything
+# _apply_binop handles — gets a closure that applies the typed function
+# when both operands are of its class; the C operators are kept as they are.
+# ---------------------------------------------------------------------------
+
+# Operators whose Python implementation matches _apply_binop for every
+# operand pair that does not raise; TypeError / ValueError go through
+# _apply_binop so the error message (and str concatenation) is unchanged.
+_DIRECT_BINOPS: Dict[str, Callable[[Any, Any], Any]] = {
+    "+":  operator.add,
+    "-":  operator.sub,
+    "*":  operator.mul,
+    "<":  operator.lt,
+    "<=": operator.le,
+    ">":  operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# Fused instructions (see ir.lower).
+_FUSED = ("cmp_jump", "inc_var", "binop_store")
+
+# Results of + and * the memory budget checks the size of.
+_SIZED = (str, list)
+
+
+def _is_number(value: Any) -> bool:
+    return value.__class__ in (int, float, bool)
+
+
+Step = Callable[[List[Any]], int]
+
+
+class CompiledTACInterpreter(TACInterpreter):
+    """TACInterpreter that compiles the instruction list to closures.
+
+    Usage
+    -----
+        interp = CompiledTACInterpreter(instructions, stdin)
+        result = interp.run()
+    """
+
+    def __init__(self, instructions: List[dict], stdin: List[str] = [],
+                 budget: Optional[ExecutionBudget] = None, profile: bool = False):
+        super().__init__(instructions, stdin, budget, profile)
+        self._switch = len(self._ir) + 1
+        self._direct_binops = _DIRECT_BINOPS
+        if self._max_cells is not None:
+            # + and * also build strings (and lists): check their size.
+            self._direct_binops = {**_DIRECT_BINOPS,
+                                   "+": self._sized(operator.add),
+                                   "*": self._sized(operator.mul)}
+        self._scopes = ScopeResolution(instructions, self._func_map, self._label_map)
+        self.global_memory = SlotFrame(self._scopes.global_layout)
+        # One closure per instruction of the linked code (see ir.lower).
+        self._code: List[Step] = []
+        for pc, idx in enumerate(self._program.source):
+            self._scope = self._scopes.scopes[idx]
+            self._code.append(self._compile_one(instructions[idx], pc))
+
+    # ── run loop ──────────────────────────────────────────────────────────────
+
+    def _push_call(self, func_name: str, args: List[Any],
+                   dest: Optional[str], return_addr: int) -> bool:
+        if func_name not in self._func_map:
+            self.runtime_errors.append(f"Runtime error: undefined function '{func_name}'")
+            return False
+
+        func_pc = self._func_map[func_name]
+        param_names = self.instructions[func_pc].get("params", [])
+
+        stack = self.call_stack
+        self._check_depth(len(stack) + 1)
+        record = self._new_record(func_name, return_addr, dest)
+        for i, pname in enumerate(param_names):
+            record.slots[record.layout.index[pname]] = args[i] if i < len(args) else 0
+
+        stack.append(record)
+        if self.profiler is not None:
+            self.profiler.switch(stack)
+        self.pc = self._program.entry[func_name]
+        return True
+
+    def _new_record(self, func_name: str, return_addr: int,
+                    return_dest: Optional[str]) -> SlotRecord:
+        stack = self.call_stack
+        layout = self._scopes.frame_layout(self._func_map[func_name])
+        return SlotRecord(func_name, return_addr, return_dest, layout,
+                          [UNSET] * len(layout.names),
+                          stack[-1].layout.index.get(return_dest)
+                          if stack and return_dest else None, self._cells)
+
+    def _run_calls(self, depth: int):
+        stack = self.call_stack
+        code = self._code
+        n = len(code)
+        switch = self._switch
+        count = self._iteration_count
+        limit = self._next_check(count)
+        max_depth = self._max_depth
+        hits = self.profiler.hits if self.profiler is not None else None
+        mem = stack[-1].slots
+        pc = self.pc
+        try:
+            while True:
+                if hits is None:
+                    while pc < n:
+                        count += 1
+                        if count > limit:
+                            if self._check_budget(count):
+                                self._loop_detected(count, depth)
+                                self.pc = pc
+                                return
+                            limit = self._next_check(count)
+                        pc = code[pc](mem)
+                else:
+                    # The same loop, counting every instruction's hits.
+                    while pc < n:
+                        count += 1
+                        if count > limit:
+                            if self._check_budget(count):
+                                self._loop_detected(count, depth)
+                                self.pc = pc
+                                return
+                            limit = self._next_check(count)
+                        hits[pc] += 1
+                        pc = code[pc](mem)
+                if pc < switch:
+                    break               # ran off the end of the program
+                pc -= switch
+                if hits is not None:
+                    self.profiler.switch(stack)     # a call or a return
+                if len(stack) < depth:
+                    break               # this call has returned
+                if len(stack) > max_depth:
+                    stack.pop()     # the call is not made
+                    self._check_depth(len(stack) + 1)
+                mem = stack[-1].slots
+        except (LimitExceeded, RuntimeFault):
+            self._iteration_count = count
+            self.pc = pc
+            raise
+        except Suspended as exc:
+            if not exc.saved:
+                exc.saved = True
+                self._iteration_count = count - 1
+                self.pc = pc
+                if exc.prompt is not None and hits is not None:
+                    hits[pc] -= 1       # the write() runs again
+            raise
+        self._iteration_count = count
+        self.pc = pc
+
+    # ── compilation ───────────────────────────────────────────────────────────
+
+    def _compile_one(self, instr: dict, pc: int) -> Step:
+        op = instr.get("op", "")
+        nxt = pc + 1
+        fused = self._ir[pc]
+        if fused.op in _FUSED:
+            # ir.lower only fuses well-formed instructions.
+            members = [self.instructions[i] for i in self._program.members[pc]]
+            if fused.op == "cmp_jump":
+                return self._compile_cmp_jump(instr, fused.when, fused.target, nxt,
+                                              fused.typed)
+            if fused.op == "inc_var":
+                if fused.target is not None:
+                    nxt = fused.target
+                return self._compile_inc_var(members[-2 if fused.target is not None else -1],
+                                             fused.copy is not None, nxt)
+            return self._compile_binop_store(instr, members[1], nxt, fused.typed)
+        try:
+            if op == "assign":
+                return self._compile_assign(instr, nxt)
+            if op == "binop":
+                return self._compile_binop(instr, nxt, fused.typed)
+            if op == "unary":
+                return self._compile_unary(instr, nxt)
+            if op == "jump":
+                return self._compile_jump(instr["target"], None, True, nxt)
+            if op == "jump_if":
+                return self._compile_jump(instr["target"], instr["cond"], True, nxt)
+            if op == "jump_if_false":
+                return self._compile_jump(instr["target"], instr["cond"], False, nxt)
+            if op == "call":
+                return self._compile_call(instr, nxt)
+            if op == "view":
+                return self._compile_view(instr, nxt)
+            if op == "array_alloc":
+                return self._compile_array_alloc(instr, nxt)
+            if op == "array_load":
+                return self._compile_array_load(instr, nxt)
+            if op == "array_store" and not instr.get("dest_type"):
+                return self._compile_array_store(instr, nxt)
+            if op == "return":
+                return self._compile_return(instr.get("value"))
+            if op == "func_end":
+                return self._compile_return(None)
+        except KeyError:
+            pass    # malformed instruction: fails (or not) exactly as the reference does
+        return self._compile_fallback(nxt)
+
+    def _compile_fallback(self, nxt: int) -> Step:
+        """Execute instruction nxt - 1 through TACInterpreter._execute_one
+        on the frame's mapping view (write, flat-key reads, built-in calls).
+        None of these move the pc."""
+        execute_one = self._execute_one
+        instr = self._ir[nxt - 1]
+        stack = self.call_stack
+
+        def step(mem):
+            execute_one(instr, stack[-1].local_memory)
+            return nxt
+        return step
+
+    # -- operands ------------------------------------------------------------
+
+    def _constant(self, operand: Any) -> Any:
+        """The value of `operand` if it can never name a memory slot, else
+        _NOT_LITERAL.  Names start with a letter (or '_'); True / False are
+        names too here, unless nothing can ever define them."""
+        if not isinstance(operand, str):
+            return operand
+        first = operand[:1]
+        if (first.isalpha() or first == "_") and not self._scope.never_defined(operand):
+            return _NOT_LITERAL
+        return self._literal(operand)
+
+    def _local_slot(self, operand: Any) -> Optional[int]:
+        """Frame slot of `operand` when it is a LOCAL name, else None."""
+        if (isinstance(operand, str) and _is_plain(operand)
+                and self._constant(operand) is _NOT_LITERAL
+                and self._scope.kind(operand) == LOCAL):
+            return self._scope.layout.slot(operand)
+        return None
+
+    def _dest_slot(self, dest: str) -> Optional[int]:
+        """Frame slot of `dest` when a store to it always stays local."""
+        if _is_plain(dest) and (_is_temp(dest) or self._scope.kind(dest) == LOCAL):
+            return self._scope.layout.slot(dest)
+        return None
+
+    def _loader(self, operand: Any) -> Callable[[List[Any]], Any]:
+        """frame → value of `operand`, following _resolve."""
+        const = self._constant(operand)
+        if const is not _NOT_LITERAL:
+            return lambda mem: const
+        stack = self.call_stack
+        resolve = self._resolve
+        if not _is_plain(operand):
+            # Flat keys ("s.field") are looked up by name.
+            return lambda mem: resolve(operand, stack[-1].local_memory)
+
+        kind = self._scope.kind(operand)
+        gs = self.global_memory.slots
+        if kind == GLOBAL:
+            j = self._scopes.global_slot(operand)
+            return lambda mem: gs[j]
+        i = self._scope.layout.slot(operand)
+        if kind == LOCAL:
+            def load(mem):
+                v = mem[i]
+                if v is UNSET:
+                    v = resolve(operand, stack[-1].local_memory)
+                return v
+            return load
+        j = self._scopes.global_slot(operand)
+
+        def load(mem):
+            v = mem[i]
+            if v is UNSET:
+                v = gs[j]
+                if v is UNSET:
+                    v = resolve(operand, stack[-1].local_memory)
+            return v
+        return load
+
+    # -- data movement ---------------------------------------------------------
+
+    def _storer(self, dest: str) -> Callable[[List[Any], Any], None]:
+        """(frame, value) → None, writing `dest` where _target_mem would."""
+        if not _is_plain(dest):
+            stack = self.call_stack
+            resolve_dest_key = self._resolve_dest_key
+            target_mem = self._target_mem
+
+            def store(mem, val):
+                frame = stack[-1].local_memory
+                key = resolve_dest_key(dest, frame) if "[" in dest else dest
+                target_mem(key, frame)[key] = val
+            return store
+
+        d = self._dest_slot(dest)
+        if d is not None:
+            def store(mem, val):
+                mem[d] = val
+            return store
+        gs = self.global_memory.slots
+        j = self._scopes.global_slot(dest)
+        if self._scope.kind(dest) == GLOBAL:
+            def store(mem, val):
+                gs[j] = val
+            return store
+        i = self._scope.layout.slot(dest)
+
+        def store(mem, val):
+            if mem[i] is not UNSET or gs[j] is UNSET:
+                mem[i] = val
+            else:
+                gs[j] = val
+        return store
+
+    def _compile_assign(self, instr: dict, nxt: int):
+        dest = instr["dest"]
+        src = instr["src"]
+        dest_type = instr.get("dest_type")
+        load = self._loader(src)
+
+        if not _is_plain(dest):
+            stack = self.call_stack
+            coerce = self._coerce_to_type
+            resolve_dest_key = self._resolve_dest_key
+            target_mem = self._target_mem
+
+            def step(mem):
+                val = load(mem)
+                frame = stack[-1].local_memory
+                key = resolve_dest_key(dest, frame) if "[" in dest else dest
+                if dest_type:
+                    val = coerce(val, dest_type)
+                target_mem(key, frame)[key] = val
+                return nxt
+            return step
+
+        store = self._storer(dest)
+        if dest_type:
+            coerce = self._coerce_to_type
+
+            def step(mem):
+                store(mem, coerce(load(mem), dest_type))
+                return nxt
+            return step
+
+        const = self._constant(src)
+        s = self._local_slot(src)
+        d = self._dest_slot(dest)
+        if d is not None and const is not _NOT_LITERAL:
+            def step(mem):
+                mem[d] = const
+                return nxt
+        elif d is not None and s is not None:
+            def step(mem):
+                v = mem[s]
+                mem[d] = v if v is not UNSET else load(mem)
+                return nxt
+        else:
+            def step(mem):
+                store(mem, load(mem))
+                return nxt
+        return step
+
+    def _compile_binop(self, instr: dict, nxt: int, typed=None):
+        """binop `instr`; typed is its Instr's (see ir.Instr), or None."""
+        op = instr["operator"]
+        left = instr["left"]
+        right = instr["right"]
+        dest = instr["dest"]
+        apply = self._apply_binop
+        lconst = self._constant(left)
+        rconst = self._constant(right)
+        fn = self._binop_operator(op, lconst, rconst, typed)
+        load_left = self._loader(left)
+        load_right = self._loader(right)
+        li = self._local_slot(left)
+        ri = self._local_slot(right)
+        d = self._dest_slot(dest)
+
+        # Fast shapes: local op local, local op literal and literal op local
+        # into a local slot.  An unset operand slot is re-read through the
+        # loaders, which report it.
+        if d is not None and li is not None and ri is not None:
+            # The hottest shape (loop conditions, i + 1 ...).
+            def step(mem):
+                a = mem[li]
+                b = mem[ri]
+                if a is UNSET or b is UNSET:
+                    a = load_left(mem)
+                    b = load_right(mem)
+                try:
+                    mem[d] = fn(a, b)
+                except (TypeError, ValueError):
+                    mem[d] = apply(op, a, b)
+                return nxt
+            return step
+        if d is not None and li is not None and rconst is not _NOT_LITERAL:
+            def step(mem):
+                a = mem[li]
+                if a is UNSET:
+                    a = load_left(mem)
+                try:
+                    mem[d] = fn(a, rconst)
+                except (TypeError, ValueError):
+                    mem[d] = apply(op, a, rconst)
+                return nxt
+            return step
+        if d is not None and lconst is not _NOT_LITERAL and ri is not None:
+            def step(mem):
+                b = mem[ri]
+                if b is UNSET:
+                    b = load_right(mem)
+                try:
+                    mem[d] = fn(lconst, b)
+                except (TypeError, ValueError):
+                    mem[d] = apply(op, lconst, b)
+                return nxt
+            return step
+
+        store = self._storer(dest)
+
+        def step(mem):
+            a = load_left(mem)
+            b = load_right(mem)
+            try:
+                val = fn(a, b)
+            except (TypeError, ValueError):
+                val = apply(op, a, b)
+            store(mem, val)
+            return nxt
+        return step
+
+    def _binop_operator(self, op: str, lconst: Any, rconst: Any,
+                        typed=None) -> Callable[[Any, Any], Any]:
+        """The function a binop with these constant operands (or
+        _NOT_LITERAL) and typed (see ir.Instr) applies."""
+        if op == "+" and (_is_number(lconst) or _is_number(rconst)):
+            # Cannot build a string or list (mixed operands go through
+            # _apply_binop), so no memory budget check: i + 1 stays direct.
+            return operator.add
+        fn = self._direct_binops.get(op)
+        if fn is not None and fn is _DIRECT_BINOPS[op]:
+            return fn       # a C operator already: typing cannot beat it
+        fn = fn or self._binop_fn(op)
+        return fn if typed is None else self._typed_fn(op, typed, fn)
+
+    def _typed_fn(self, op: str, typed, fn: Callable[[Any, Any], Any]) -> Callable[[Any, Any], Any]:
+        """The typed function of a typed binop (see ir._TYPED_BINOPS) when
+        both operands are of its class, else `fn`.  Like
+        TACInterpreter._apply_typed, a zero divisor goes to _apply_binop
+        and a built string to the memory budget's check."""
+        cls, direct = typed
+        if cls is str and self._max_cells is not None:
+            check_size = self._check_size
+
+            def typed_op(a, b):
+                if a.__class__ is cls and b.__class__ is cls:
+                    value = direct(a, b)
+                    check_size(value)
+                    return value
+                return fn(a, b)
+            return typed_op
+        if op in ("/", "%"):
+            def typed_op(a, b):
+                if a.__class__ is cls and b.__class__ is cls and b:
+                    return direct(a, b)
+                return fn(a, b)
+            return typed_op
+
+        def typed_op(a, b):
+            if a.__class__ is cls and b.__class__ is cls:
+                return direct(a, b)
+            return fn(a, b)
+        return typed_op
+
+    def _binop_value(self, instr: dict, typed=None) -> Callable[[List[Any]], Any]:
+        """frame → the value binop `instr` computes, without storing it."""
+        op = instr["operator"]
+        left = instr["left"]
+        right = instr["right"]
+        apply = self._apply_binop
+        rconst = self._constant(right)
+        fn = self._binop_operator(op, self._constant(left), rconst, typed)
+        load_left = self._loader(left)
+        load_right = self._loader(right)
+        li = self._local_slot(left)
+        ri = self._local_slot(right)
+
+        if li is not None and ri is not None:
+            def value(mem):
+                a = mem[li]
+                b = mem[ri]
+                if a is UNSET or b is UNSET:
+                    a = load_left(mem)
+                    b = load_right(mem)
+                try:
+                    return fn(a, b)
+                except (TypeError, ValueError):
+                    return apply(op, a, b)
+            return value
+        if li is not None and rconst is not _NOT_LITERAL:
+            def value(mem):
+                a = mem[li]
+                if a is UNSET:
+                    a = load_left(mem)
+                try:
+                    return fn(a, rconst)
+                except (TypeError, ValueError):
+                    return apply(op, a, rconst)
+            return value
+
+        def value(mem):
+            a = load_left(mem)
+            b = load_right(mem)
+            try:
+                return fn(a, b)
+            except (TypeError, ValueError):
+                return apply(op, a, b)
+        return value
+
+    def _binop_fn(self, op: str) -> Callable[[Any, Any], Any]:
+        """Operators with their own int fast path; everything else (and every
+        non-int operand pair) is handled by _apply_binop."""
+        apply = self._apply_binop
+        if op == "/":
+            def div(a, b):
+                if type(a) is int and type(b) is int and b:
+                    return math.trunc(a / b)
+                return apply("/", a, b)
+            return div
+        if op == "%":
+            def mod(a, b):
+                if type(a) is int and type(b) is int and b:
+                    return int(math.fmod(a, b))
+                return apply("%", a, b)
+            return mod
+        return lambda a, b: apply(op, a, b)
+
+    def _sized(self, fn: Callable[[Any, Any], Any]) -> Callable[[Any, Any], Any]:
+        """`fn` followed by the memory budget's check of the value it built."""
+        check_size = self._check_size
+
+        def sized(a, b):
+            value = fn(a, b)
+            if value.__class__ in _SIZED:
+                check_size(value)
+            return value
+        return sized
+
+    def _compile_unary(self, instr: dict, nxt: int):
+        op = instr["operator"]
+        load = self._loader(instr["operand"])
+        store = self._storer(instr["dest"])
+        apply_unary = self._apply_unary
+
+        def step(mem):
+            store(mem, apply_unary(op, load(mem)))
+            return nxt
+        return step
+
+    # -- arrays ----------------------------------------------------------------
+    #
+    # In-bounds int subscripts of a list are handled inline; anything else
+    # (wall indexing, bad subscripts, non-arrays) goes through the
+    # TACInterpreter helpers, which halt the run on a bad subscript.  array_alloc and
+    # array_load always write the frame they run in.
+
+    def _compile_array_alloc(self, instr: dict, nxt: int):
+        load_default = self._loader(instr.get("default", "0"))
+        dims = instr["dims"]
+        d = self._scope.layout.slot(instr["dest"])
+        new_array = self._new_array
+
+        def step(mem):
+            mem[d] = new_array(dims, load_default(mem))
+            return nxt
+        return step
+
+    def _compile_array_load(self, instr: dict, nxt: int):
+        name = instr["array"]
+        d = self._scope.layout.slot(instr["dest"])
+        loads = [self._loader(i) for i in instr["indices"]]
+        load_base = self._loader(name)
+        array_load = self._array_load
+
+        if len(loads) == 1:
+            load_i, = loads
+
+            def step(mem):
+                i = load_i(mem)
+                base = load_base(mem)
+                if type(base) is list and type(i) is int and 0 <= i < len(base):
+                    mem[d] = base[i]
+                else:
+                    mem[d] = array_load(name, base, [i])
+                return nxt
+            return step
+
+        if len(loads) == 2:
+            load_i, load_j = loads
+
+            def step(mem):
+                i = load_i(mem)
+                j = load_j(mem)
+                base = load_base(mem)
+                if type(base) is list and type(i) is int and 0 <= i < len(base):
+                    row = base[i]
+                    if type(row) is list and type(j) is int and 0 <= j < len(row):
+                        mem[d] = row[j]
+                        return nxt
+                mem[d] = array_load(name, base, [i, j])
+                return nxt
+            return step
+
+        def step(mem):
+            indices = [load(mem) for load in loads]
+            mem[d] = array_load(name, load_base(mem), indices)
+            return nxt
+        return step
+
+    def _compile_array_store(self, instr: dict, nxt: int,
+                             load_src: Optional[Callable[[List[Any]], Any]] = None):
+        name = instr["array"]
+        if load_src is None:
+            load_src = self._loader(instr["src"])
+        loads = [self._loader(i) for i in instr["indices"]]
+        load_base = self._loader(name)
+        array_store = self._array_store
+
+        if len(loads) == 1:
+            load_i, = loads
+
+            def step(mem):
+                val = load_src(mem)
+                i = load_i(mem)
+                base = load_base(mem)
+                if type(base) is list and type(i) is int and 0 <= i < len(base):
+                    base[i] = val
+                else:
+                    array_store(name, base, [i], val)
+                return nxt
+            return step
+
+        if len(loads) == 2:
+            load_i, load_j = loads
+
+            def step(mem):
+                val = load_src(mem)
+                i = load_i(mem)
+                j = load_j(mem)
+                base = load_base(mem)
+                if type(base) is list and type(i) is int and 0 <= i < len(base):
+                    row = base[i]
+                    if type(row) is list and type(j) is int and 0 <= j < len(row):
+                        row[j] = val
+                        return nxt
+                array_store(name, base, [i, j], val)
+                return nxt
+            return step
+
+        def step(mem):
+            val = load_src(mem)
+            indices = [load(mem) for load in loads]
+            array_store(name, load_base(mem), indices, val)
+            return nxt
+        return step
+
+    # -- control flow ----------------------------------------------------------
+
+    def _compile_jump(self, label: str, cond: Optional[str], when: bool, nxt: int):
+        if label not in self._label_map:
+            errors = self.runtime_errors
+            load = self._loader(cond) if cond is not None else None
+
+            def step(mem):
+                if load is None or bool(load(mem)) == when:
+                    errors.append(f"Runtime error: undefined label '{label}'")
+                return nxt
+            return step
+
+        # The instruction after the label, like _jump_to.
+        target = self._program.pcs[self._label_map[label]]
+        if cond is None:
+            return lambda mem: target
+
+        # _is_truthy(v) == bool(v) for every runtime value.
+        const = self._constant(cond)
+        if const is not _NOT_LITERAL:
+            taken = bool(const) == when
+            return (lambda mem: target) if taken else (lambda mem: nxt)
+
+        load = self._loader(cond)
+        c = self._local_slot(cond)
+        if c is not None:
+            if when:
+                def step(mem):
+                    v = mem[c]
+                    if v is UNSET:
+                        v = load(mem)
+                    return target if v else nxt
+            else:
+                def step(mem):
+                    v = mem[c]
+                    if v is UNSET:
+                        v = load(mem)
+                    return nxt if v else target
+            return step
+        if when:
+            return lambda mem: target if load(mem) else nxt
+        return lambda mem: nxt if load(mem) else target
+
+    # -- fused sequences (see ir.lower) ----------------------------------------
+
+    def _compile_cmp_jump(self, instr: dict, when: bool, target: int, nxt: int,
+                          typed=None):
+        """binop `instr` (a comparison) and a jump to target when its result
+        is truthy (when=True) or falsy; the temp is never stored."""
+        yes, no = (target, nxt) if when else (nxt, target)
+        op = instr["operator"]
+        left = instr["left"]
+        right = instr["right"]
+        fn = self._direct_binops[op]    # comparisons: C operators already
+        apply = self._apply_binop
+        rconst = self._constant(right)
+        li = self._local_slot(left)
+        ri = self._local_slot(right)
+
+        if li is not None and (ri is not None or rconst is not _NOT_LITERAL):
+            load_left = self._loader(left)
+            load_right = self._loader(right)
+            if ri is not None:
+                def step(mem):
+                    a = mem[li]
+                    b = mem[ri]
+                    if a is UNSET or b is UNSET:
+                        a = load_left(mem)
+                        b = load_right(mem)
+                    try:
+                        v = fn(a, b)
+                    except (TypeError, ValueError):
+                        v = apply(op, a, b)
+                    return yes if v else no
+                return step
+
+            def step(mem):
+                a = mem[li]
+                if a is UNSET:
+                    a = load_left(mem)
+                try:
+                    v = fn(a, rconst)
+                except (TypeError, ValueError):
+                    v = apply(op, a, rconst)
+                return yes if v else no
+            return step
+
+        value = self._binop_value(instr, typed)
+        return lambda mem: yes if value(mem) else no
+
+    def _compile_inc_var(self, instr: dict, copied: bool, nxt: int):
+        """binop `instr` (x = x ± n), after the dead copy  tK = x  when
+        `copied`, which only has to read x."""
+        step = self._compile_binop(instr, nxt)
+        if not copied:
+            return step
+        x = instr["left"]
+        op = instr["operator"]
+        load = self._loader(x)
+        s = self._local_slot(x)
+        d = self._dest_slot(instr["dest"])
+        step_value = self._constant(instr["right"])
+        if s is None or d is None or step_value is _NOT_LITERAL:
+            def fused(mem):
+                load(mem)
+                return step(mem)
+            return fused
+
+        fn = self._binop_operator(op, _NOT_LITERAL, step_value)
+        apply = self._apply_binop
+
+        def fused(mem):
+            a = mem[s]
+            if a is UNSET:
+                load(mem)               # the copy's read
+                a = load(mem)
+            try:
+                mem[d] = fn(a, step_value)
+            except (TypeError, ValueError):
+                mem[d] = apply(op, a, step_value)
+            return nxt
+        return fused
+
+    def _compile_binop_store(self, instr: dict, store: dict, nxt: int, typed=None):
+        """binop `instr` stored straight into the element array_store
+        `store` writes."""
+        return self._compile_array_store(store, nxt, self._binop_value(instr, typed))
+
+    # -- calls -----------------------------------------------------------------
+
+    def _compile_call(self, instr: dict, nxt: int):
+        func_name = instr["func"]
+        if func_name in ("view", "write", "rand"):
+            return self._compile_fallback(nxt)
+
+        loads = [self._loader(a) for a in instr.get("args", [])]
+        dest = instr.get("dest")
+        # The return value lands in this frame.
+        dest_slot = self._scope.layout.slot(dest) if dest is not None else None
+
+        if func_name not in self._func_map:
+            errors = self.runtime_errors
+
+            def step(mem):
+                for load in loads:
+                    load(mem)
+                errors.append(f"Runtime error: undefined function '{func_name}'")
+                return nxt
+            return step
+
+        func_pc = self._func_map[func_name]
+        layout = self._scopes.frame_layout(func_pc)
+        names = layout.names        # final length once everything is compiled
+        pslots = [layout.slot(p) for p in self.instructions[func_pc].get("params", [])]
+        # Arguments are evaluated in order, straight into the parameters'
+        # slots; surplus arguments are still evaluated, missing ones are 0.
+        binds = list(zip(pslots, loads))
+        surplus = loads[len(pslots):]
+        missing = pslots[len(loads):]
+        entry = self._switch + self._program.entry[func_name]
+        stack = self.call_stack
+        interp = self
+
+        if len(binds) == 1 and not surplus and not missing:
+            (p, load), = binds
+
+            def step(mem):
+                slots = [UNSET] * len(names)
+                slots[p] = load(mem)
+                stack.append(SlotRecord(func_name, nxt, dest, layout, slots, dest_slot,
+                                        interp._cells))
+                return entry
+            return step
+
+        def step(mem):
+            slots = [UNSET] * len(names)
+            for p, load in binds:
+                slots[p] = load(mem)
+            for load in surplus:
+                load(mem)
+            for p in missing:
+                slots[p] = 0
+            stack.append(SlotRecord(func_name, nxt, dest, layout, slots, dest_slot,
+                                    interp._cells))
+            return entry
+        return step
+
+    def _compile_return(self, value: Optional[str]):
+        stack = self.call_stack
+        g = self.global_memory
+        switch = self._switch
+        load = self._loader(value) if value is not None else None
+        interp = self
+
+        def step(mem):
+            ret_val = load(mem) if load is not None else None
+            record = stack.pop()
+            interp._cells = record.cells
+            record.return_value = ret_val
+            if record.return_slot is not None:
+                stack[-1].slots[record.return_slot] = ret_val
+            elif record.return_dest is not None:
+                (stack[-1].local_memory if stack else g)[record.return_dest] = ret_val
+            return switch + record.return_addr
+        return step
+
+    # -- I/O -------------------------------------------------------------------
+
+    def _compile_view(self, instr: dict, nxt: int):
+        fmt = instr.get("fmt", "")
+        loads = [self._loader(a) for a in instr.get("args", [])]
+        budget = self.budget
+        if budget.max_output_lines is None and budget.max_output_bytes is None:
+            emit = self.output.append
+        else:
+            emit = self._emit
+        format_view = self._format_view
+
+        def step(mem):
+            emit(format_view(fmt, [load(mem) for load in loads]))
+            return nxt
+        return step
@@ -0,0 +1,28 @@
+from typing import List, Optional
+
+from .budget import ExecutionBudget
+from .tac_runtime import TACInterpreter
+from .compiled_runtime import CompiledTACInterpreter
+
+# ============================================================
+# Engine selection
+# ============================================================
+
+RUNTIME_ENGINES = {
+    "dict":     TACInterpreter,           # per-instruction dict dispatch (reference)
+    "compiled": CompiledTACInterpreter,   # instructions pre-compiled to closures
+}
+
+
+def make_interpreter(instructions: List[dict], stdin: List[str] = [],
+                     engine: str = "compiled",
+                     budget: Optional[ExecutionBudget] = None,
+                     profile: bool = False) -> TACInterpreter:
+    """Return an interpreter for `instructions` using the named engine,
+    bounded by `budget` (see budget.py) when one is given, and profiling
+    the run (see profiler.py) when `profile` is set."""
+    try:
+        engine_cls = RUNTIME_ENGINES[engine]
+    except KeyError:
+        raise ValueError(f"Unknown runtime engine {engine!r}") from None
+    return engine_cls(instructions, stdin, budget, profile)
@@ -0,0 +1,587 @@
+import math
+import operator
+import re
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# ---------------------------------------------------------------------------
+# Typed TAC  —  the instruction form TACInterpreter executes
+#
+# TACGenerator emits instructions as dicts of strings ("t12", "arr[i]",
+# "\"hi\"", "3.0"): that is the wire format of /compile, of the frontend's
+# interpreter, of the compile artifact store and of the worker processes,
+# and what the optimizer and code generator work on.  Executing those dicts
+# directly means classifying every operand string again each time the
+# instruction runs.  lower() does it once, when an interpreter is built:
+# every instruction becomes an Instr whose operands are tagged
+#
+#   Const    a literal that no memory key can shadow — its value, parsed
+#   Temp     a compiler temporary (t1, t2, ...): always in the running frame
+#   Global   a plain name only the global initialisation defines: it can
+#            only ever be in global memory
+#   Var      any other name: the running frame first, then global memory
+#   Indexed  "arr[i][j]" — a Var whose index operands are already split
+#            out, so a store resolves them without a regex
+#   Member   "s.field" — a Var with its base and member split out
+#
+# Resolution is exactly TACInterpreter._resolve's (local, global, literal,
+# "undefined variable" error); the tags only skip the steps that cannot
+# succeed.  A field the dict does not have is missing on the Instr too, and
+# reading it raises the same KeyError, so a malformed instruction fails
+# where and how it always has.
+#
+# lower() also links the program: label and func_begin, which do nothing
+# when run, are left out of the executable code, and every jump target
+# becomes the index in that code of the instruction after the label.  A
+# Program keeps the map between code indexes and listing indexes, which
+# profiles and snapshots are expressed in.
+#
+# Last, the hottest sequences TACGenerator emits inside functions are fused
+# into one instruction each, so a loop takes about half the dispatches:
+#
+#   cmp_jump     binop tK = a < b ; jump_if_false tK L   (any comparison,
+#                either conditional jump) — tK is not stored
+#   inc_var      [assign tK = x ;] binop x = x + 1 [; jump L]   (x += or -=
+#                a number; the copy is the dead value of a postfix x++)
+#   binop_store  binop tK = a op b ; array_store arr[i] = tK
+#
+# A sequence is only fused when tK is read nowhere else in the listing and
+# no jump lands inside it; the global initialisation is never fused.
+# (binop + assign into a variable needs no fusing: the optimizer's
+# redundant-temp pass already writes the binop to the variable.)
+#
+# A binop TACGenerator gave a "typed_op" (both operand types known to the
+# semantic analyzer: add_tile, lt_glass, concat_wall, ...) becomes an Instr
+# of that op.  Static types are not a promise at run time — arguments,
+# return values and write() input are not converted — so a typed op checks
+# that both operands have its Python class and otherwise runs as a binop.
+# ---------------------------------------------------------------------------
+
+# A subscripted name:  arr[i]  /  arr[i][j]
+_SUBSCRIPT_RE = re.compile(r'^(\w+)((?:\[[^\]]+\])+)$')
+_INDEX_RE = re.compile(r'\[([^\]]+)\]')
+
+_JUMPS = ("jump", "jump_if", "jump_if_false")
+
+# Ops that do nothing when run; linking leaves them out of the code.
+_NO_OPS = ("label", "func_begin")
+
+# Operators cmp_jump fuses; the others are left to binop.
+_COMPARISONS = ("<", "<=", ">", ">=", "==", "!=")
+
+def _div_tile(a: int, b: int) -> int:
+    if b == 0:
+        raise ZeroDivisionError
+    return math.trunc(a / b)        # C-style, like _apply_binop
+
+
+def _mod_tile(a: int, b: int) -> int:
+    if b == 0:
+        # Before fmod, which raises OverflowError for a huge a.
+        raise ZeroDivisionError
+    return int(math.fmod(a, b))
+
+
+# Typed binops: name → (operator, class of both operands, function).  The
+# function computes what TACInterpreter._apply_binop would for operands of
+# that class; it raises ZeroDivisionError for a zero divisor, which
+# _apply_binop reports.
+_TYPED_BINOPS = {
+    "add_tile":    ("+",  int,   operator.add),
+    "sub_tile":    ("-",  int,   operator.sub),
+    "mul_tile":    ("*",  int,   operator.mul),
+    "div_tile":    ("/",  int,   _div_tile),
+    "mod_tile":    ("%",  int,   _mod_tile),
+    "lt_tile":     ("<",  int,   operator.lt),
+    "le_tile":     ("<=", int,   operator.le),
+    "gt_tile":     (">",  int,   operator.gt),
+    "ge_tile":     (">=", int,   operator.ge),
+    "eq_tile":     ("==", int,   operator.eq),
+    "ne_tile":     ("!=", int,   operator.ne),
+    "add_glass":   ("+",  float, operator.add),
+    "sub_glass":   ("-",  float, operator.sub),
+    "mul_glass":   ("*",  float, operator.mul),
+    "div_glass":   ("/",  float, operator.truediv),
+    "lt_glass":    ("<",  float, operator.lt),
+    "le_glass":    ("<=", float, operator.le),
+    "gt_glass":    (">",  float, operator.gt),
+    "ge_glass":    (">=", float, operator.ge),
+    "eq_glass":    ("==", float, operator.eq),
+    "ne_glass":    ("!=", float, operator.ne),
+    "concat_wall": ("+",  str,   operator.add),
+}
+
+# Fields that never hold an operand an instruction reads.
+_NOT_READ = ("op", "operator", "target", "name", "func", "fmt", "names",
+             "params", "dest_type", "line")
+_WORD_RE = re.compile(r'\w+')
+
+# Returned by TACInterpreter._literal for operands that are not literals.
+_NOT_LITERAL = object()
+
+
+class Const:
+    __slots__ = ("text", "value")
+
+    def __init__(self, text: Any, value: Any):
+        self.text = text
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"Const({self.text!r})"
+
+
+class Var:
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+
+class Temp(Var):
+    __slots__ = ()
+
+
+class Global(Var):
+    __slots__ = ()
+
+
+class Indexed(Var):
+    """name = the whole "arr[i]" text; base = "arr"; indices = the index
+    operands."""
+
+    __slots__ = ("base", "indices")
+
+    def __init__(self, name: str, base: str, indices: List[Any]):
+        super().__init__(name)
+        self.base = base
+        self.indices = indices
+
+
+class Member(Var):
+    """name = the whole "s.field" text; base = "s"; member = "field"."""
+
+    __slots__ = ("base", "member")
+
+    def __init__(self, name: str, base: str, member: str):
+        super().__init__(name)
+        self.base = base
+        self.member = member
+
+
+Operand = Any   # Const | Var (and its subclasses)
+
+
+class Instr:
+    """One lowered TAC instruction.
+
+    Fields keep their dict names.  Operand fields hold typed operands;
+    raw fields (labels, function names, formats, write() targets, the dests
+    of array ops and calls) keep their strings.  The fused ops (see the
+    module comment) use the fields of the instructions they replace, plus:
+
+        cmp_jump  — when: jump when the comparison is truthy (jump_if) or
+                    falsy (jump_if_false)
+        inc_var   — copy: the operand the dead copy read, or None;
+                    target: the absorbed jump's, or None
+
+    A typed binop (add_tile, ...), cmp_jump and binop_store have typed:
+    (class, function) from _TYPED_BINOPS, or None for an untyped binop.
+    """
+
+    __slots__ = ("op", "dest", "src", "left", "right", "operator", "operand",
+                 "cond", "target", "name", "func", "args", "fmt", "names",
+                 "params", "value", "array", "base", "indices", "dims",
+                 "default", "dest_type", "when", "copy", "typed")
+
+    def __getattr__(self, field: str):
+        # Only reached for a field the instruction dict did not have.
+        if field.startswith("__"):
+            raise AttributeError(field)
+        raise KeyError(field)
+
+    def __repr__(self) -> str:
+        fields = []
+        for f in self.__slots__:
+            try:
+                fields.append(f"{f}={getattr(self, f)!r}")
+            except KeyError:
+                pass
+        return f"Instr({', '.join(fields)})"
+
+
+def _is_temp(name: str) -> bool:
+    return name.startswith("t") and name[1:].isdigit()
+
+
+def _is_plain(name: str) -> bool:
+    return "[" not in name and "." not in name
+
+
+def _written(instr: dict) -> List[str]:
+    """Memory keys `instr` can create (before index resolution)."""
+    names = []
+    dest = instr.get("dest")
+    if isinstance(dest, str):
+        names.append(dest)
+    op = instr.get("op")
+    if op == "write":
+        names.extend(a for a in instr.get("args", []) if isinstance(a, str))
+    elif op == "func_begin":
+        names.extend(p for p in instr.get("params", []) if isinstance(p, str))
+    return names
+
+
+def _reads(instructions: List[dict]) -> Dict[str, int]:
+    """How many times each word appears in an operand of `instructions` —
+    an upper bound on how many instructions read a temp."""
+    counts: Dict[str, int] = {}
+    for instr in instructions:
+        for field, value in instr.items():
+            if field in _NOT_READ:
+                continue
+            if field == "dest" and isinstance(value, str) and _is_plain(value):
+                continue        # a write
+            for item in (value if isinstance(value, list) else [value]):
+                if isinstance(item, str):
+                    for word in _WORD_RE.findall(item):
+                        counts[word] = counts.get(word, 0) + 1
+    return counts
+
+
+class _Lowering:
+    def __init__(self, instructions: List[dict], literal: Callable[[str], Any]):
+        self._literal = literal
+
+        # Every key a memory can hold: a literal spelled like one of them
+        # has to be looked up first.
+        self._keys: Set[str] = set()
+        for instr in instructions:
+            self._keys.update(_written(instr))
+
+        # Globals: plain names the global initialisation writes and no
+        # function can (no function defines them, and none jumps back into
+        # the initialisation, which would run it on a local frame).
+        n = len(instructions)
+        first = next((i for i, instr in enumerate(instructions)
+                      if instr.get("op") == "func_begin"), n)
+        self.labels: Dict[Any, int] = {}
+        for idx, instr in enumerate(instructions):
+            if instr.get("op") == "label":
+                self.labels[instr.get("name")] = idx
+        self._first = first
+        self._globals: Set[str] = set()
+        if not any(instr.get("op") in _JUMPS and self.labels.get(instr.get("target"), n) < first
+                   for instr in instructions[first:]):
+            func_keys = set()
+            for instr in instructions[first:]:
+                func_keys.update(_written(instr))
+            for instr in instructions[:first]:
+                self._globals.update(name for name in _written(instr)
+                                     if _is_plain(name) and name not in func_keys)
+
+        self._instructions = instructions
+        self._reads = _reads(instructions)
+        # Labels some jump lands on: a fused sequence cannot span one.
+        self._targeted = {instr.get("target") for instr in instructions
+                          if instr.get("op") in _JUMPS}
+
+    # ── operands ─────────────────────────────────────────────────────────
+
+    def plain(self, text: Any) -> Operand:
+        """An operand read through TACInterpreter._resolve."""
+        if not isinstance(text, str):
+            return Const(text, text)
+        if text not in self._keys:
+            value = self._literal(text)
+            if value is not _NOT_LITERAL:
+                return Const(text, value)
+        shaped = self._shaped(text)
+        if shaped is not None:
+            return shaped
+        if _is_temp(text):
+            return Temp(text)
+        if text in self._globals:
+            return Global(text)
+        return Var(text)
+
+    def complex(self, text: Any) -> Operand:
+        """The src of array_read / struct_read: a member or element access
+        by shape, else a plain operand (see TACInterpreter._read_complex)."""
+        if isinstance(text, str):
+            shaped = self._shaped(text)
+            if shaped is not None:
+                return shaped
+        return self.plain(text)
+
+    def dest(self, text: Any) -> Any:
+        """The dest of assign / binop / unary."""
+        if not isinstance(text, str):
+            return text
+        if _is_temp(text):
+            return Temp(text)
+        shaped = self._shaped(text)
+        if shaped is not None:
+            return shaped
+        return Var(text)
+
+    def _shaped(self, text: str) -> Optional[Operand]:
+        if "." in text and "[" not in text:
+            base, member = text.split(".", 1)
+            return Member(text, base, member)
+        match = _SUBSCRIPT_RE.match(text)
+        if match:
+            indices = [self.plain(i.strip()) for i in _INDEX_RE.findall(match.group(2))]
+            return Indexed(text, match.group(1), indices)
+        return None
+
+    # ── instructions ─────────────────────────────────────────────────────
+
+    def instr(self, d: dict) -> Instr:
+        ins = Instr()
+        op = ins.op = d.get("op", "")
+        for field in ("dest", "operator", "target", "name", "func", "array",
+                      "dims", "dest_type"):
+            if field in d:
+                setattr(ins, field, d[field])
+        ins.dest_type = d.get("dest_type")
+
+        if op in ("assign", "binop", "unary"):
+            if "dest" in d:
+                ins.dest = self.dest(d["dest"])
+            for field in ("src", "left", "right", "operand"):
+                if field in d:
+                    setattr(ins, field, self.plain(d[field]))
+        elif op in ("jump_if", "jump_if_false"):
+            if "cond" in d:
+                ins.cond = self.plain(d["cond"])
+        elif op in ("call", "view"):
+            ins.args = [self.plain(a) for a in d.get("args", [])]
+            ins.dest = d.get("dest")
+            ins.fmt = d.get("fmt", "")
+        elif op == "write":
+            ins.args = d.get("args", [])
+            ins.fmt = d.get("fmt", "")
+            ins.names = d.get("names")
+        elif op == "return":
+            ins.value = self.plain(d.get("value"))
+        elif op == "array_alloc":
+            ins.default = self.plain(d.get("default", "0"))
+        elif op in ("array_load", "array_store"):
+            if "array" in d:
+                ins.base = self.plain(d["array"])
+            if "indices" in d:
+                ins.indices = [self.plain(i) for i in d["indices"]]
+            if "src" in d:
+                ins.src = self.plain(d["src"])
+        elif op in ("array_read", "struct_read"):
+            if "src" in d:
+                ins.src = self.complex(d["src"])
+        elif op == "func_begin":
+            ins.params = d.get("params", [])
+        if op == "binop":
+            ins.typed = self._typed(d)
+            if ins.typed is not None:
+                ins.op = d["typed_op"]
+        return ins
+
+    def _typed(self, d: dict) -> Optional[Tuple[type, Callable[[Any, Any], Any]]]:
+        """(class, function) of binop `d`'s typed_op, or None."""
+        name = d.get("typed_op")
+        typed = _TYPED_BINOPS.get(name) if isinstance(name, str) else None
+        if typed is None or typed[0] != d.get("operator"):
+            return None
+        return typed[1], typed[2]
+
+    # ── fusion ───────────────────────────────────────────────────────────
+
+    def fuse(self, idx: int) -> Optional[Tuple[str, List[int]]]:
+        """(fused op, listing indexes of its members) for the sequence that
+        starts at listing instruction `idx`, or None."""
+        if idx <= self._first:
+            return None
+        instructions = self._instructions
+        d = instructions[idx]
+        op = d.get("op")
+        nxt = self._after(idx)
+        following = instructions[nxt] if nxt is not None else {}
+        if op == "binop" and self._dead_temp(d.get("dest"), 1) and \
+                "left" in d and "right" in d and "operator" in d:
+            temp = d["dest"]
+            if (following.get("op") in ("jump_if", "jump_if_false")
+                    and d["operator"] in _COMPARISONS
+                    and following.get("cond") == temp
+                    and following.get("target") in self.labels):
+                return "cmp_jump", [idx, nxt]
+            if (following.get("op") == "array_store"
+                    and following.get("src") == temp
+                    and "array" in following
+                    and isinstance(following.get("indices"), list)
+                    and not following.get("dest_type")):
+                return "binop_store", [idx, nxt]
+
+        members = None
+        if self._increments(d):
+            members = [idx]
+        elif (op == "assign" and self._dead_temp(d.get("dest"), 0)
+                and "src" in d and not d.get("dest_type")
+                and self._increments(following)
+                and following["dest"] == d["src"]):
+            members = [idx, nxt]
+        if members is None:
+            return None
+        jump = self._after(members[-1])
+        if (jump is not None and instructions[jump].get("op") == "jump"
+                and instructions[jump].get("target") in self.labels):
+            members.append(jump)
+        return "inc_var", members
+
+    def fused(self, op: str, members: List[dict]) -> Instr:
+        """The Instr of fused op `op`; a jump target is left as the label
+        name for lower() to link."""
+        ins = Instr()
+        ins.op = op
+        ins.dest_type = None
+        first, last = members[0], members[-1]
+        if op == "inc_var":
+            binop = members[0] if members[0].get("op") == "binop" else members[1]
+            ins.dest = self.dest(binop["dest"])
+            ins.left = self.plain(binop["left"])
+            ins.right = self.plain(binop["right"])
+            ins.operator = binop["operator"]
+            ins.copy = self.plain(first["src"]) if first is not binop else None
+            ins.target = last["target"] if last.get("op") == "jump" else None
+            return ins
+        ins.left = self.plain(first["left"])
+        ins.right = self.plain(first["right"])
+        ins.operator = first["operator"]
+        ins.typed = self._typed(first)
+        if op == "cmp_jump":
+            ins.when = last["op"] == "jump_if"
+            ins.target = last["target"]
+        else:
+            ins.array = last["array"]
+            ins.base = self.plain(last["array"])
+            ins.indices = [self.plain(i) for i in last["indices"]]
+        return ins
+
+    def _after(self, idx: int) -> Optional[int]:
+        """The listing index of the next instruction run after `idx` when
+        nothing can jump in between, else None."""
+        instructions = self._instructions
+        for nxt in range(idx + 1, len(instructions)):
+            op = instructions[nxt].get("op")
+            if op == "label" and instructions[nxt].get("name") not in self._targeted:
+                continue
+            if op in _NO_OPS:
+                return None
+            return nxt
+        return None
+
+    def _dead_temp(self, dest: Any, reads: int) -> bool:
+        """`dest` is a temp read by at most `reads` operands."""
+        return (isinstance(dest, str) and _is_temp(dest)
+                and self._reads.get(dest, 0) <= reads)
+
+    def _increments(self, d: dict) -> bool:
+        """`d` is  binop x = x + n  or  binop x = x - n  for a number n."""
+        if d.get("op") != "binop" or d.get("operator") not in ("+", "-"):
+            return False
+        dest = d.get("dest")
+        if not (isinstance(dest, str) and _is_plain(dest) and d.get("left") == dest):
+            return False
+        step = self.plain(d.get("right"))
+        return isinstance(step, Const) and step.value.__class__ in (int, float)
+
+
+class Program:
+    """The executable form of a TAC listing.
+
+    Attributes
+    ----------
+    code        — the lowered instructions minus label and func_begin (no-ops
+                  when run), fused sequences as one instruction; jump
+                  targets are indexes into code, or the label's name when it
+                  is not defined
+    members     — members[pc] lists the indexes in the listing of the
+                  instructions code[pc] runs (one, unless fused)
+    source      — source[pc] = members[pc][0]
+    pcs         — pcs[i] is the index in code of listing instruction i, or
+                  of the first instruction after it for a label /
+                  func_begin; pcs[len(listing)] = len(code).  Inside a fused
+                  sequence it is the fused instruction (whose first members
+                  only write a dead temp, so running it again is harmless),
+                  and for an absorbed jump the jump's target.
+    entry       — function name → index in code of its body
+    globals_end — index in code where the global initialisation ends
+    """
+
+    def __init__(self, code: List[Instr], members: List[List[int]], pcs: List[int],
+                 entry: Dict[str, int], globals_end: int):
+        self.code = code
+        self.members = members
+        self.source = [m[0] for m in members]
+        self.pcs = pcs
+        self.entry = entry
+        self.globals_end = globals_end
+
+    def index(self, pc: int) -> int:
+        """The listing index of code index `pc` (which may be len(code))."""
+        return self.source[pc] if pc < len(self.source) else len(self.pcs) - 1
+
+
+def lower(instructions: List[dict], literal: Callable[[str], Any],
+          fuse: bool = True) -> Program:
+    """Lower, fuse and link `instructions`.
+
+    literal(text) is the interpreter's literal parser
+    (TACInterpreter._literal): a value, or _NOT_LITERAL.  fuse=False lowers
+    every instruction on its own (the tests compare the two).
+    """
+    lowering = _Lowering(instructions, literal)
+    n = len(instructions)
+    groups: List[Tuple[Optional[str], List[int]]] = []
+    idx = 0
+    while idx < n:
+        if instructions[idx].get("op", "") in _NO_OPS:
+            idx += 1
+            continue
+        fused = lowering.fuse(idx) if fuse else None
+        groups.append(fused or (None, [idx]))
+        idx = groups[-1][1][-1] + 1
+
+    pcs: List[int] = []
+    for pc, (_, members) in enumerate(groups):
+        # Labels and func_begin before the group, then the group itself.
+        pcs.extend([pc] * (members[-1] + 1 - len(pcs)))
+    pcs.extend([len(groups)] * (n + 1 - len(pcs)))
+
+    def link(label: Any) -> Any:
+        # Jump to the instruction after the label.
+        idx = lowering.labels.get(label)
+        return str(label) if idx is None else pcs[idx]
+
+    code: List[Instr] = []
+    for op, members in groups:
+        if op is None:
+            d = instructions[members[0]]
+            ins = lowering.instr(d)
+            if d.get("op", "") in _JUMPS and "target" in d:
+                ins.target = link(d["target"])
+        else:
+            ins = lowering.fused(op, [instructions[i] for i in members])
+            if op == "cmp_jump":
+                ins.target = link(ins.target)
+            elif op == "inc_var" and ins.target is not None:
+                ins.target = pcs[members[-1]] = link(ins.target)
+        code.append(ins)
+
+    entry: Dict[str, int] = {}
+    first = n
+    for idx, d in enumerate(instructions):
+        if d.get("op") == "func_begin":
+            entry[d.get("name")] = pcs[idx]
+            first = min(first, idx)
+    return Program(code, [members for _, members in groups], pcs, entry, pcs[first])
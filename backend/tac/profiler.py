@@ -0,0 +1,131 @@
+import time
+from typing import Any, Dict, List, Optional
+
+from .tac_generator import tac_instruction_to_str
+
+# ---------------------------------------------------------------------------
+# Profiler  —  where a run spends its instructions and time
+#
+# An interpreter built with profile=True keeps a Profiler and fills it in as
+# it runs:
+#
+#   hits      executions of every instruction, by index in the interpreter's
+#             linked code (the run loop adds one per instruction it
+#             dispatches; global initialisation included).  A fused
+#             instruction's hits count for each TAC instruction it runs.
+#   seconds   wall-clock time per user function: at every call and return
+#             the time since the previous one is charged to the function
+#             that was running until then, so it is the function's own
+#             time, not that of the functions it calls
+#
+# Calls are not counted as they happen: report() derives them from the hits
+# of the call instructions.  The cost is one list increment per instruction
+# plus a clock read per call and return; report() maps the counts back to
+# the TAC listing through the code's member map, and to source lines
+# through the "line" TACGenerator puts on every instruction.
+# ---------------------------------------------------------------------------
+
+# Instructions listed as "hot" in a report.
+HOT_INSTRUCTIONS = 10
+
+
+class Profiler:
+    """Execution counts and per-function time of one run.
+
+    Usage
+    -----
+        profiler = Profiler(len(code))
+        ...                                  # the interpreter fills it in
+        profile = profiler.report(instructions, members)
+    """
+
+    def __init__(self, size: int):
+        self.hits: List[int] = [0] * size
+        self.seconds: Dict[str, float] = {}
+        self._since: Optional[float] = None     # last sample; None while paused
+        self._running: Optional[str] = None     # the function charged next
+
+    def switch(self, stack: List[Any]):
+        """A call or return has just changed the top of `stack`: charge the
+        time since the last sample to the function that was running."""
+        self._sample()
+        self._running = stack[-1].func_name if stack else None
+
+    def pause(self):
+        self._sample()
+        self._since = None
+
+    def resume(self, stack: List[Any]):
+        if self._since is None:
+            self._since = time.perf_counter()
+            self._running = stack[-1].func_name if stack else None
+
+    def _sample(self):
+        if self._since is None:
+            return
+        now = time.perf_counter()
+        if self._running is not None:
+            name = self._running
+            self.seconds[name] = self.seconds.get(name, 0.0) + now - self._since
+        self._since = now
+
+    def report(self, instructions: List[dict], members: List[List[int]]) -> dict:
+        """The profile of the run so far.  members[i] are the indexes in
+        instructions of the TAC instructions code instruction i runs.
+
+        Returns
+        -------
+        {
+            "instructions": int  — instructions executed
+            "lines":     [{"line", "count"}]  — instructions executed per
+                                  source line, in line order
+            "hot":       [{"index", "line", "tac", "count"}]  — the most
+                                  executed instructions (index into the
+                                  optimized TAC listing), most executed first
+            "functions": [{"name", "line", "calls", "instructions",
+                           "seconds"}]  — per user function, most
+                                  instructions first
+        }
+        """
+        hits = [0] * len(instructions)
+        for pc, count in enumerate(self.hits):
+            for idx in members[pc]:
+                hits[idx] = count
+        calls: Dict[str, int] = {}
+        for idx, instr in enumerate(instructions):
+            if hits[idx] and instr.get("op") == "call":
+                calls[instr["func"]] = calls.get(instr["func"], 0) + hits[idx]
+
+        lines: Dict[int, int] = {}
+        functions = []
+        current = None
+        for idx, instr in enumerate(instructions):
+            op = instr.get("op")
+            if op == "func_begin":
+                name = instr["name"]
+                current = {"name": name, "line": instr.get("line", 0),
+                           "calls": calls.get(name, 0), "instructions": 0,
+                           "seconds": round(self.seconds.get(name, 0.0), 6)}
+                functions.append(current)
+            count = hits[idx]
+            if count:
+                line = instr.get("line", 0)
+                lines[line] = lines.get(line, 0) + count
+                if current is not None:
+                    current["instructions"] += count
+            if op == "func_end" and current is not None:
+                if current["name"] == "blueprint" and current["instructions"]:
+                    current["calls"] += 1       # the entry point
+                current = None
+
+        hot = sorted((idx for idx, count in enumerate(hits) if count),
+                     key=lambda idx: -hits[idx])[:HOT_INSTRUCTIONS]
+        return {
+            "instructions": sum(hits),
+            "lines": [{"line": line, "count": lines[line]} for line in sorted(lines)],
+            "hot": [{"index": idx,
+                     "line": instructions[idx].get("line", 0),
+                     "tac": tac_instruction_to_str(instructions[idx]),
+                     "count": hits[idx]} for idx in hot],
+            "functions": sorted(functions, key=lambda f: -f["instructions"]),
+        }
@@ -0,0 +1,70 @@
+from typing import Any, Dict, List, MutableMapping
+
+# ---------------------------------------------------------------------------
+# Run state  —  a paused run as plain data
+#
+# TACInterpreter.snapshot() describes a paused run (see step()) with
+# JSON-compatible data only, so a session can be parked — in a file, a
+# cache, another process — and continued by restore() on a new interpreter
+# built from the same instructions, with either engine.
+#
+# Runtime values are scalars (int, float, bool, str, None) and lists, and
+# one list can be reachable from several frames at once (an array passed to
+# a function).  Every list is therefore written once, to the state's
+# "arrays" table, and referenced as {"array": k} wherever it appears, so
+# restoring keeps that sharing.  Dicts are written as {"dict": [[k, v], ...]}.
+# ---------------------------------------------------------------------------
+
+STATE_VERSION = 1
+
+_SCALARS = (int, float, str, type(None))
+
+
+class StateWriter:
+    """Encodes the values of one snapshot; arrays is its table of lists."""
+
+    def __init__(self):
+        self.arrays: List[Any] = []
+        self._refs: Dict[int, int] = {}      # id(list) → index in arrays
+
+    def value(self, value: Any) -> Any:
+        if isinstance(value, _SCALARS):
+            return value
+        if isinstance(value, list):
+            k = self._refs.get(id(value))
+            if k is None:
+                k = self._refs[id(value)] = len(self.arrays)
+                self.arrays.append(None)
+                self.arrays[k] = [self.value(v) for v in value]
+            return {"array": k}
+        if isinstance(value, dict):
+            return {"dict": [[k, self.value(v)] for k, v in value.items()]}
+        raise TypeError(f"cannot save a run holding a {type(value).__name__} value")
+
+    def memory(self, mem: MutableMapping[str, Any]) -> Dict[str, Any]:
+        return {k: self.value(v) for k, v in mem.items()}
+
+
+class StateReader:
+    """Decodes the values of one snapshot, rebuilding each array once."""
+
+    def __init__(self, arrays: List[Any]):
+        self._encoded = arrays
+        self._arrays: List[Any] = [None] * len(arrays)
+
+    def value(self, value: Any) -> Any:
+        if not isinstance(value, dict):
+            return value
+        if "array" in value:
+            k = value["array"]
+            array = self._arrays[k]
+            if array is None:
+                array = self._arrays[k] = []
+                array.extend(self.value(v) for v in self._encoded[k])
+            return array
+        return {k: self.value(v) for k, v in value["dict"]}
+
+    def memory(self, encoded: Dict[str, Any], mem: MutableMapping[str, Any]):
+        """Store the decoded `encoded` memory into `mem`, in order."""
+        for k, v in encoded.items():
+            mem[k] = self.value(v)
@@ -0,0 +1,309 @@
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from .tac_runtime import ActivationRecord, flat_prefix
+
+# ---------------------------------------------------------------------------
+# Slot-indexed frames  —  load-time name resolution for CompiledTACInterpreter
+#
+# Every name a function's code can touch gets a fixed index in that
+# function's FrameLayout, and every global a fixed index in the global
+# layout.  A frame is then a preallocated list (UNSET = name not defined in
+# that frame), so the compiled closures read  frame[i]  instead of probing
+# a local dict and then the global dict by name.
+#
+# Whether a name is local or global is decided once per function:
+#
+#   LOCAL    never in global memory (or a parameter, which shadows it)
+#   GLOBAL   always in global memory while functions run, and nothing in
+#            the function ever defines it locally
+#   DYNAMIC  anything else — local if the frame has it, else global; this
+#            is exactly the reference rule, kept for the rare shapes (a
+#            local array shadowing a global, functions called while the
+#            globals are still being initialised)
+#
+# SlotFrame is a MutableMapping view of a slot list, so the TACInterpreter
+# helpers the closures fall back to (write(), struct reads, ...) keep
+# working on it; keys only known at run time (flat "s.field" keys) live in
+# a small overflow dict.  Like GlobalMemory it indexes its flat keys by
+# prefix, which the interpreter's global-vs-local checks rely on.  A
+# SlotRecord holds its frame's slot list directly and only builds that view
+# when one of those helpers needs it.
+# ---------------------------------------------------------------------------
+
+UNSET = object()    # contents of an empty slot
+
+LOCAL, GLOBAL, DYNAMIC = "local", "global", "dynamic"
+
+_JUMPS = ("jump", "jump_if", "jump_if_false")
+
+# Ops that always write their dest into the frame they run in.
+_LOCAL_DEFS = ("array_alloc", "array_load", "array_read", "struct_read", "call")
+
+# Ops whose (plain) dest is always defined once the global
+# initialisation has run it.
+_GLOBAL_DEFS = ("assign", "binop", "unary", "array_alloc", "array_load",
+                "array_read", "struct_read")
+
+
+def _is_plain(name: str) -> bool:
+    return "[" not in name and "." not in name
+
+
+def _is_temp(name: str) -> bool:
+    return name.startswith("t") and name[1:].isdigit()
+
+
+def _written(instr: dict) -> List[str]:
+    """Memory keys `instr` may write in the frame it runs in."""
+    names = []
+    dest = instr.get("dest")
+    if isinstance(dest, str):
+        names.append(dest)
+    if instr.get("op") == "write":
+        names.extend(a for a in instr.get("args", []) if isinstance(a, str))
+    return names
+
+
+class FrameLayout:
+    """name → slot index for one scope."""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def slot(self, name: str) -> int:
+        """The slot of `name`, allocating one on first use."""
+        i = self.index.get(name)
+        if i is None:
+            i = self.index[name] = len(self.names)
+            self.names.append(name)
+        return i
+
+
+class SlotFrame(MutableMapping):
+    """The memory of one scope: a slot list laid out by a FrameLayout, plus
+    an overflow dict for keys the layout does not know.
+
+    Iteration follows insertion order for keys set through the mapping
+    (every key of global memory is created that way), then any other
+    filled slots.  prefixes indexes the flat keys set through the mapping
+    (see GlobalMemory); closures write only plain names straight into slots."""
+
+    __slots__ = ("layout", "slots", "extra", "prefixes", "_order")
+
+    def __init__(self, layout: FrameLayout, slots: Optional[List[Any]] = None):
+        self.layout = layout
+        self.slots: List[Any] = [UNSET] * len(layout.names) if slots is None else slots
+        self.extra: Dict[str, Any] = {}
+        self.prefixes: Dict[str, Set[str]] = {}
+        self._order: Dict[str, None] = {}
+
+    def __getitem__(self, key):
+        i = self.layout.index.get(key)
+        if i is None:
+            return self.extra[key]
+        value = self.slots[i]
+        if value is UNSET:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in self._order:
+            self._order[key] = None
+            if "[" in key or "." in key:
+                self.prefixes.setdefault(flat_prefix(key), set()).add(key)
+        i = self.layout.index.get(key)
+        if i is None:
+            self.extra[key] = value
+        else:
+            self.slots[i] = value
+
+    def __delitem__(self, key):
+        i = self.layout.index.get(key)
+        if i is None:
+            del self.extra[key]
+        elif self.slots[i] is UNSET:
+            raise KeyError(key)
+        else:
+            self.slots[i] = UNSET
+        self._order.pop(key, None)
+        if "[" in key or "." in key:
+            self.prefixes[flat_prefix(key)].discard(key)
+
+    def __contains__(self, key) -> bool:
+        i = self.layout.index.get(key)
+        if i is None:
+            return key in self.extra
+        return self.slots[i] is not UNSET
+
+    def __iter__(self) -> Iterator[str]:
+        order = self._order
+        yield from [key for key in order if key in self]
+        for name, value in zip(self.layout.names, self.slots):
+            if value is not UNSET and name not in order:
+                yield name
+
+    def __len__(self) -> int:
+        return sum(v is not UNSET for v in self.slots) + len(self.extra)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class SlotRecord(ActivationRecord):
+    """ActivationRecord whose locals are a slot list.
+
+    local_memory is a SlotFrame over `slots`, built on first use.
+    return_slot is return_dest's slot in the caller's frame, or None when
+    the value has to be stored by name (global scope, unknown key).
+    """
+
+    return_value = None
+    _frame: Optional[SlotFrame] = None
+
+    def __init__(self, func_name: str, return_addr: int, return_dest: Optional[str],
+                 layout: FrameLayout, slots: List[Any], return_slot: Optional[int],
+                 cells: int = 0):
+        self.func_name = func_name
+        self.return_addr = return_addr
+        self.return_dest = return_dest
+        self.layout = layout
+        self.slots = slots
+        self.return_slot = return_slot
+        self.cells = cells
+
+    @property
+    def local_memory(self) -> SlotFrame:
+        if self._frame is None:
+            self._frame = SlotFrame(self.layout, self.slots)
+        return self._frame
+
+
+class Scope:
+    """Load-time resolution of the names used by one function's code."""
+
+    def __init__(self, resolution: "ScopeResolution", layout: FrameLayout,
+                 params: Set[str], local_defs: Set[str], writes: Set[str]):
+        self._resolution = resolution
+        self.layout = layout
+        self._params = params
+        self._local_defs = local_defs
+        self._writes = writes
+
+    def kind(self, name: str) -> str:
+        """LOCAL, GLOBAL or DYNAMIC for a plain name read or written here."""
+        res = self._resolution
+        if name in self._params or name not in res.maybe_global:
+            return LOCAL
+        if name in res.always_global and name not in self._local_defs:
+            return GLOBAL
+        return DYNAMIC
+
+    def never_defined(self, name: str) -> bool:
+        """True when no frame running this code, nor global memory, can
+        ever hold `name` (e.g. True / False when no variable shadows them)."""
+        return name not in self._writes and name not in self._resolution.maybe_global
+
+
+class ScopeResolution:
+    """Splits the program into function scopes and lays out their frames.
+
+    Attributes
+    ----------
+    global_layout — slots of global memory (keys written by the global
+                    initialisation, in order).
+    maybe_global  — plain names global memory can hold.
+    always_global — plain names global memory holds whenever a function runs.
+    scopes        — the Scope of each instruction, by index.
+    shared        — True when control can pass between functions without a
+                    call (a jump into another function, a body without
+                    func_end); then every function shares one layout.
+    """
+
+    def __init__(self, instructions: List[dict], func_map: Dict[str, int],
+                 label_map: Dict[str, int]):
+        n = len(instructions)
+        first = next((i for i, instr in enumerate(instructions)
+                      if instr.get("op") == "func_begin"), n)
+
+        # ── global memory ────────────────────────────────────────────────
+        self.global_layout = FrameLayout()
+        self.maybe_global: Set[str] = set()
+        self.always_global: Set[str] = set()
+        user_call = False
+        for instr in instructions[:first]:
+            op = instr.get("op")
+            for name in _written(instr):
+                self.global_layout.slot(name)
+                if _is_plain(name):
+                    self.maybe_global.add(name)
+                    if op in _GLOBAL_DEFS or op == "write":
+                        self.always_global.add(name)
+            if op == "call" and instr.get("func") in func_map:
+                user_call = True
+        if user_call:
+            # A function run from a global initialiser sees the globals
+            # half-built: nothing is certain yet.
+            self.always_global = set()
+
+        # ── function regions ─────────────────────────────────────────────
+        # region[i] = index of the func_begin owning instruction i (-1 for
+        # the global initialisation).
+        region: List[int] = []
+        owner = -1
+        for i, instr in enumerate(instructions):
+            if instr.get("op") == "func_begin":
+                owner = i
+            region.append(owner)
+        starts = [i for i in range(first, n) if instructions[i].get("op") == "func_begin"]
+
+        self.shared = any(
+            instr.get("op") in _JUMPS and instr.get("target") in label_map
+            and region[label_map[instr["target"]]] != region[i]
+            for i, instr in enumerate(instructions)
+        ) or any(
+            instructions[end - 1].get("op") not in ("func_end", "return", "jump")
+            for end in starts[1:]
+        )
+
+        # ── scopes ───────────────────────────────────────────────────────
+        if self.shared:
+            params = set()
+            for s in starts:
+                params.update(instructions[s].get("params", []))
+            scope = self._scope(instructions, set(), params)
+            self.scopes: List[Scope] = [scope] * n
+        else:
+            bounds = [0] + starts + [n]
+            self.scopes = []
+            for lo, hi in zip(bounds, bounds[1:]):
+                if lo == hi:
+                    continue        # no global initialisation
+                body = instructions[lo:hi]
+                params = set(body[0].get("params", [])) if lo in starts else set()
+                self.scopes.extend([self._scope(body, params, set())] * (hi - lo))
+
+    def _scope(self, body: List[dict], params: Set[str], extra_defs: Set[str]) -> Scope:
+        layout = FrameLayout()
+        local_defs = set(extra_defs)
+        writes = params | extra_defs
+        for name in params | extra_defs:
+            layout.slot(name)
+        for instr in body:
+            op = instr.get("op")
+            for name in _written(instr):
+                writes.add(name)
+                if op in _LOCAL_DEFS or _is_temp(name):
+                    local_defs.add(name)
+        return Scope(self, layout, params, local_defs, writes)
+
+    def frame_layout(self, func_pc: int) -> FrameLayout:
+        """The layout of frames for the function starting at `func_pc`."""
+        return self.scopes[func_pc].layout
+
+    def global_slot(self, name: str) -> Optional[int]:
+        return self.global_layout.index.get(name)
@@ -50,6 +50,9 @@
 #   JFALSE <label>                 — jump if condition is false
 #   PRINT  <reg>                   — output (view)
 #   READ   <name>                  — input (write)
+#   ALLOC  <name>, <type>[n]…      — allocate an array
+#   LOADX  <reg>, <name>[<reg>]…   — load an array element
+#   STOREX <name>[<reg>]…, <reg>   — store an array element
 #   RET    <reg|"">                — return
 #   LABEL  <name>:                 — branch target
 #   BEGIN  <name>                  — function entry
@@ -71,6 +74,12 @@
 #   view    "#d", x             LOAD  Rn, x
 #                               PRINT Rn
 #   write   "#d", &x            READ  x
+#   array_load  t1 = a[i]       LOAD  Rn, i
+#                               LOADX Rm, a[Rn]
+#                               STORE t1, Rm
+#   array_store a[i] = x        LOAD  Rn, x
+#                               LOAD  Rm, i
+#                               STOREX a[Rm], Rn
 #   return  0                   LOAD  Rn, 0
 #                               RET   Rn
 #
@@ -234,6 +243,23 @@ class TACCodeGen:
             reg = self._load(instr["src"])
             self.code.append(f"    STORE  {instr['dest']}, {reg}")
 
+        elif op == "array_alloc":
+            dims = "".join(f"[{d}]" for d in instr["dims"])
+            self.code.append(f"    ALLOC  {instr['dest']}, {instr.get('elem_type', '')}{dims}")
+
+        elif op == "array_load":
+            regs = [self._load(i) for i in instr["indices"]]
+            reg = self._alloc_reg()
+            subscript = "".join(f"[{r}]" for r in regs)
+            self.code.append(f"    LOADX  {reg}, {instr['array']}{subscript}")
+            self.code.append(f"    STORE  {instr['dest']}, {reg}")
+
+        elif op == "array_store":
+            reg = self._load(instr["src"])
+            regs = [self._load(i) for i in instr["indices"]]
+            subscript = "".join(f"[{r}]" for r in regs)
+            self.code.append(f"    STOREX {instr['array']}{subscript}, {reg}")
+
         # call, func_begin params etc. — simplified representation
         elif op == "call":
             args = instr.get("args", [])
@@ -10,6 +10,18 @@ from semantic.ast import (
 )
 
 
+# Type-specialized binops: when the semantic analyzer knows both operand
+# types, _gen_binary names the specialization in the binop's "typed_op"
+# (op stays "binop", so the optimizer, the code generator and the frontend
+# read it as before), e.g.  tile + tile → "add_tile",  glass < glass →
+# "lt_glass",  wall + wall → "concat_wall".  The runtime lowers it to an
+# instruction that skips the operand type dispatch (see tac/ir.py).
+_TYPED_NAMES = {
+    "+": "add", "-": "sub", "*": "mul", "/": "div", "%": "mod",
+    "<": "lt", "<=": "le", ">": "gt", ">=": "ge", "==": "eq", "!=": "ne",
+}
+
+
 # ---------------------------------------------------------------------------
 # TACGenerator
 # ---------------------------------------------------------------------------
@@ -39,6 +51,10 @@ class TACGenerator:
         self._scope_stack: List[dict] = []
         self._scope_counter: int = 0   # monotonic counter for unique suffixes
 
+        # Source line of the statement being generated; every instruction
+        # carries it as "line" (the profiler maps its counts back with it).
+        self._line: int = 0
+
     # ── public entry point ────────────────────────────────────────────────────
 
     def generate(self, program: ProgramNode) -> List[dict]:
@@ -53,6 +69,7 @@ class TACGenerator:
         self._instructions = []
         self._temp_count = 0
         self._label_count = 0
+        self._line = 0
 
         # Collect struct definitions for member-order lookup during struct init.
         # Maps struct_name → [member_name_1, member_name_2, ...]
@@ -74,7 +91,9 @@ class TACGenerator:
     # ── instruction emission helpers ──────────────────────────────────────────
 
     def _emit(self, instr: dict):
-        """Append one instruction dict to the instruction list."""
+        """Append one instruction dict to the instruction list, tagged with
+        the current source line."""
+        instr["line"] = self._line
         self._instructions.append(instr)
 
     def _new_temp(self) -> str:
@@ -99,6 +118,7 @@ class TACGenerator:
         if isinstance(decl, StructDeclNode):
             # Struct type definitions have no runtime representation.
             return
+        self._line = decl.line
 
         if isinstance(decl, VarDeclNode):
             if isinstance(decl.init_value, ArrayInitNode):
@@ -117,10 +137,10 @@ class TACGenerator:
                     return
 
                 # Global array with brace init
-                self._gen_array_init(decl.name, decl.init_value)
+                self._gen_array_init(decl.name, decl.type, decl.array_dims, decl.init_value)
                 return
 
-            # Array without brace init — emit per-element default values
+            # Array without brace init — allocate with default values
             if decl.is_array and decl.array_dims:
                 self._gen_array_default(decl.name, decl.type, decl.array_dims)
                 return
@@ -198,6 +218,7 @@ class TACGenerator:
         for pname in param_names:
             self._scope_stack[-1][pname] = pname
 
+        self._line = func.line
         self._emit({
             "op": "func_begin",
             "name": func.name,
@@ -207,6 +228,7 @@ class TACGenerator:
         for item in func.body:
             self._gen_stmt(item)
 
+        self._line = func.line
         self._emit({
             "op": "func_end",
             "name": func.name,
@@ -218,6 +240,14 @@ class TACGenerator:
 
     def _gen_stmt(self, node):
         """Dispatch one AST statement or declaration node to its generator."""
+        # A compound statement's own instructions after its body (the jump
+        # back of a loop, its end label) keep the statement's line.
+        outer_line = self._line
+        self._line = node.line
+        self._gen_stmt_node(node)
+        self._line = outer_line
+
+    def _gen_stmt_node(self, node):
         if isinstance(node, VarDeclNode):
             self._gen_var_decl(node)
         elif isinstance(node, AssignNode):
@@ -250,8 +280,8 @@ class TACGenerator:
     def _gen_var_decl(self, node: VarDeclNode):
         """Emit TAC for a local variable declaration with scope-aware naming.
 
-        For arrays with brace initializers (ArrayInitNode), emits per-element
-        assignment instructions: arr[0] = val0, arr[1] = val1, ...
+        For arrays with brace initializers (ArrayInitNode), emits an
+        array_alloc followed by one array_store per element.
 
         For struct variables with brace initializers (house Point p = {3, 7}),
         emits per-member assignments: p.x = 3, p.y = 7
@@ -275,10 +305,10 @@ class TACGenerator:
                 return
 
             # Array brace initializer: {v1, v2, ...} or {{r1}, {r2}}
-            self._gen_array_init(mangled, node.init_value)
+            self._gen_array_init(mangled, node.type, node.array_dims, node.init_value)
             return
 
-        # Array without brace init — emit per-element default values
+        # Array without brace init — allocate with default values
         if node.is_array and node.array_dims:
             self._gen_array_default(mangled, node.type, node.array_dims)
             return
@@ -309,54 +339,79 @@ class TACGenerator:
                 instr["dest_type"] = decl_type
         self._emit(instr)
 
-    def _gen_array_init(self, arr_name: str, init_node: 'ArrayInitNode'):
-        """Emit per-element assignments for an array brace initializer.
+    def _gen_array_init(self, arr_name: str, elem_type: str, dims: list,
+                        init_node: 'ArrayInitNode'):
+        """Emit an array_alloc plus one array_store per initializer element.
 
         1-D: tile arr[3] = {10, 20, 30};
-             → arr[0] = 10, arr[1] = 20, arr[2] = 30
+             → arr = array tile[3], arr[0] = 10, arr[1] = 20, arr[2] = 30
 
         2-D: tile mat[2][3] = {{1,2,3},{4,5,6}};
-             → mat[0][0] = 1, mat[0][1] = 2, ..., mat[1][2] = 6
+             → mat = array tile[2][3], mat[0][0] = 1, ..., mat[1][2] = 6
+
+        Elements without an initializer keep the default value.  The size
+        comes from the declaration, or from the initializer when the
+        declared size is missing.
         """
-        for i, elem in enumerate(init_node.elements):
+        rows = init_node.elements
+        if any(isinstance(r, ArrayInitNode) for r in rows):
+            shape = [len(rows), max((len(r.elements) for r in rows
+                                     if isinstance(r, ArrayInitNode)), default=0)]
+        else:
+            shape = [len(rows)]
+        valid_dims = self._array_dims(dims)
+        if len(valid_dims) == len(shape):
+            shape = [max(d, n) for d, n in zip(valid_dims, shape)]
+        self._emit_array_alloc(arr_name, elem_type, shape)
+
+        for i, elem in enumerate(rows):
             if isinstance(elem, ArrayInitNode):
                 # 2-D: elem is a nested ArrayInitNode for one row
                 for j, inner_elem in enumerate(elem.elements):
                     val = self._gen_expr(inner_elem)
                     self._emit({
-                        "op": "assign",
-                        "dest": f"{arr_name}[{i}][{j}]",
+                        "op": "array_store",
+                        "array": arr_name,
+                        "indices": [str(i), str(j)],
                         "src": val,
                     })
             else:
                 # 1-D: elem is a plain expression
                 val = self._gen_expr(elem)
                 self._emit({
-                    "op": "assign",
-                    "dest": f"{arr_name}[{i}]",
+                    "op": "array_store",
+                    "array": arr_name,
+                    "indices": [str(i)],
                     "src": val,
                 })
 
-    # ── assignment ────────────────────────────────────────────────────────────
-
     def _gen_array_default(self, arr_name: str, elem_type: str, dims: list):
-        """Emit per-element default value assignments for an uninitialized array.
+        """Emit an array_alloc for an uninitialized array.
 
         Spec F.11: arrays with fixed size get default values:
           tile=0, glass=0.0, wall="", brick=0 (\\0), beam=False
 
-        1-D: tile arr[3]  →  arr[0]=0, arr[1]=0, arr[2]=0
-        2-D: tile mat[2][3]  →  mat[0][0]=0 ... mat[1][2]=0
+        The runtime builds the whole array from the single instruction:
+          tile mat[2][3]  →  mat = array tile[2][3]
         """
+        valid_dims = self._array_dims(dims)
+        if len(valid_dims) in (1, 2):
+            self._emit_array_alloc(arr_name, elem_type, valid_dims)
+
+    def _array_dims(self, dims: list) -> List[int]:
+        return [d for d in (dims or []) if isinstance(d, int) and d > 0]
+
+    def _emit_array_alloc(self, arr_name: str, elem_type: str, dims: List[int]):
         default_val = '""' if elem_type == "wall" else "0.0" if elem_type == "glass" else "0"
-        valid_dims = [d for d in dims if isinstance(d, int) and d > 0]
-        if len(valid_dims) == 1:
-            for i in range(valid_dims[0]):
-                self._emit({"op": "assign", "dest": f"{arr_name}[{i}]", "src": default_val})
-        elif len(valid_dims) == 2:
-            for i in range(valid_dims[0]):
-                for j in range(valid_dims[1]):
-                    self._emit({"op": "assign", "dest": f"{arr_name}[{i}][{j}]", "src": default_val})
+        self._emit({
+            "op": "array_alloc",
+            "dest": arr_name,
+            "elem_type": elem_type,
+            "dims": list(dims),
+            "default": default_val,
+        })
+
+    # ── assignment ────────────────────────────────────────────────────────────
 
     def _gen_assign(self, node: AssignNode):
         """Emit TAC for an assignment statement.
@@ -371,8 +426,14 @@ class TACGenerator:
                 x = t2
 
         LHS may be a plain IdNode, an ArrayAccessNode, or a StructAccessNode.
+        Array elements are written with array_store (compound forms first
+        read the element with array_load).
         """
-        dest = self._lhs_name(node.target)
+        element = self._array_element(node.target)
+        if element is not None:
+            dest = None
+        else:
+            dest = self._lhs_name(node.target)
         rhs_operand = self._gen_expr(node.value)
 
         # Determine if implicit conversion annotation is needed
@@ -385,33 +446,56 @@ class TACGenerator:
                      and src_type in _NUMERIC)
 
         if node.operator == "=":
-            instr = {
-                "op": "assign",
-                "dest": dest,
-                "src": rhs_operand,
-            }
-            if need_cast:
-                instr["dest_type"] = dest_type
-            self._emit(instr)
+            src = rhs_operand
         else:
             # Compound: lower  x op= rhs  into  x = x op rhs
             raw_op = node.operator[:-1]   # "+=" → "+"
-            tmp = self._new_temp()
+            left = self._array_load(*element) if element is not None else dest
+            src = self._new_temp()
             self._emit({
                 "op": "binop",
-                "dest": tmp,
-                "left": dest,
+                "dest": src,
+                "left": left,
                 "operator": raw_op,
                 "right": rhs_operand,
             })
+
+        if element is not None:
+            arr_name, indices = element
+            instr = {
+                "op": "array_store",
+                "array": arr_name,
+                "indices": indices,
+                "src": src,
+            }
+        else:
             instr = {
                 "op": "assign",
                 "dest": dest,
-                "src": tmp,
+                "src": src,
             }
-            if need_cast:
-                instr["dest_type"] = dest_type
-            self._emit(instr)
+        if need_cast:
+            instr["dest_type"] = dest_type
+        self._emit(instr)
+
+    def _array_element(self, target):
+        """(array name, index operands) for an element of a named array, else
+        None.  Evaluates the index expressions."""
+        if not (isinstance(target, ArrayAccessNode) and isinstance(target.array, IdNode)):
+            return None
+        arr_name = self._resolve_name(target.array.name)
+        return arr_name, [self._gen_expr(i) for i in target.indices]
+
+    def _array_load(self, arr_name: str, indices: List[str]) -> str:
+        """Emit an array_load into a new temporary and return it."""
+        tmp = self._new_temp()
+        self._emit({
+            "op": "array_load",
+            "dest": tmp,
+            "array": arr_name,
+            "indices": indices,
+        })
+        return tmp
 
     def _lhs_name(self, target) -> str:
         """Compute the string name for an LHS target.
@@ -629,18 +713,45 @@ class TACGenerator:
         write(fmt, &var1, ...)      →  { op: "write", fmt: "...", args: [...] }
 
         For view(), arguments are evaluated as expressions (their values matter).
-        For write(), arguments are DESTINATIONS — we need their flat key names
-        (e.g. "A[i]") so the runtime can store the input value into them.
+        For write(), arguments are DESTINATIONS — we need their names so the
+        runtime can store the input value into them.  An array element is
+        read into a temporary and then stored with array_store; "names"
+        keeps the source spelling (e.g. "A[i]") for display.
         """
-        if node.io_type == "write":
-            arg_operands = [self._lhs_name(a) for a in node.args]
-        else:
-            arg_operands = [self._gen_expr(a) for a in node.args]
-        self._emit({
-            "op": node.io_type,          # "view" or "write"
+        if node.io_type != "write":
+            self._emit({
+                "op": "view",
+                "fmt": node.format_string,
+                "args": [self._gen_expr(a) for a in node.args],
+            })
+            return
+
+        arg_operands = []
+        names = []
+        stores = []
+        for a in node.args:
+            element = self._array_element(a)
+            if element is None:
+                name = self._lhs_name(a)
+                arg_operands.append(name)
+                names.append(name)
+                continue
+            arr_name, indices = element
+            tmp = self._new_temp()
+            arg_operands.append(tmp)
+            names.append(arr_name + "".join(f"[{i}]" for i in indices))
+            stores.append({"op": "array_store", "array": arr_name,
+                           "indices": indices, "src": tmp})
+        instr = {
+            "op": "write",
             "fmt": node.format_string,
             "args": arg_operands,
-        })
+        }
+        if stores:
+            instr["names"] = names
+        self._emit(instr)
+        for store in stores:
+            self._emit(store)
 
     # ── expression generation ─────────────────────────────────────────────────
     #
@@ -798,9 +909,26 @@ class TACGenerator:
             expr_type = getattr(node, "expr_type", None)
             if expr_type:
                 instr["result_type"] = expr_type
+        typed_op = self._typed_op(op, node)
+        if typed_op:
+            instr["typed_op"] = typed_op
         self._emit(instr)
         return tmp
 
+    def _typed_op(self, op: str, node: BinaryOpNode) -> Optional[str]:
+        """The type-specialized name of binop `op` (see _TYPED_NAMES), or
+        None when the operand types are not both statically known and the
+        same tile / glass (or wall, for +)."""
+        left_type = getattr(node.left, "expr_type", None)
+        right_type = getattr(node.right, "expr_type", None)
+        if left_type != right_type or op not in _TYPED_NAMES:
+            return None
+        if left_type == "wall":
+            return "concat_wall" if op == "+" else None
+        if left_type == "tile" or (left_type == "glass" and op != "%"):
+            return f"{_TYPED_NAMES[op]}_{left_type}"
+        return None
+
     def _gen_unary(self, node: UnaryOpNode) -> str:
         """Emit TAC for a unary operation and return the result operand.
 
@@ -828,10 +956,28 @@ class TACGenerator:
             return tmp
 
         if op in ("++", "--"):
-            var_name = self._lhs_name(node.operand)
             delta = "1"
             arith_op = "+" if op == "++" else "-"
 
+            element = self._array_element(node.operand)
+            if element is not None:
+                # arr[i]++  →  t_old = arr[i],  t_new = t_old + 1,  arr[i] = t_new
+                arr_name, indices = element
+                t_old = self._array_load(arr_name, indices)
+                tmp = self._new_temp()
+                self._emit({
+                    "op": "binop",
+                    "dest": tmp,
+                    "left": t_old,
+                    "operator": arith_op,
+                    "right": delta,
+                })
+                self._emit({"op": "array_store", "array": arr_name,
+                            "indices": indices, "src": tmp})
+                return tmp if node.is_prefix else t_old
+
+            var_name = self._lhs_name(node.operand)
+
             if node.is_prefix:
                 # ++x  →  x = x + 1,  return x
                 tmp = self._new_temp()
@@ -883,9 +1029,15 @@ class TACGenerator:
     def _gen_array_access(self, node: ArrayAccessNode) -> str:
         """Emit TAC for an array element access and return the result temporary.
 
-        arr[i]      →  t1 = arr[i]
+        arr[i]      →  t1 = arr[i]       (array_load)
         arr[i][j]   →  t1 = arr[i][j]
+
+        Elements of struct-member arrays keep the flat-key array_read form.
         """
+        element = self._array_element(node)
+        if element is not None:
+            return self._array_load(*element)
+
         base = self._lhs_name(node.array)
         idx_strs = [self._gen_expr(i) for i in node.indices]
         subscript = "".join(f"[{s}]" for s in idx_strs)
@@ -982,7 +1134,7 @@ def tac_instruction_to_str(instr: dict) -> str:
 
     if op == "write":
         fmt = instr.get("fmt", "")
-        args = ", ".join(instr.get("args", []))
+        args = ", ".join(instr.get("names") or instr.get("args", []))
         if args:
             return f'write {fmt}, {args}'
         return f'write {fmt}'
@@ -997,6 +1149,18 @@ def tac_instruction_to_str(instr: dict) -> str:
     if op == "struct_read":
         return f"{instr['dest']} = {instr['src']}"
 
+    if op == "array_alloc":
+        dims = "".join(f"[{d}]" for d in instr["dims"])
+        return f"{instr['dest']} = array {instr.get('elem_type', '')}{dims}"
+
+    if op == "array_load":
+        subscript = "".join(f"[{i}]" for i in instr["indices"])
+        return f"{instr['dest']} = {instr['array']}{subscript}"
+
+    if op == "array_store":
+        subscript = "".join(f"[{i}]" for i in instr["indices"])
+        return f"{instr['array']}{subscript} = {instr['src']}"
+
     if op == "func_begin":
         params = ", ".join(instr.get("params", []))
         return f"---- begin {instr['name']}({params}) ----"
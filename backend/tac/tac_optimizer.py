@@ -34,6 +34,10 @@
 #      Example:
 #        t1 = a + b
 #        sum = t1        →   sum = a + b   (t1 eliminated)
+#      Array element stores are not folded: array_store takes an operand,
+#      not an expression, so  t1 = a + b ; arr[i] = t1  stays two
+#      instructions (the interpreter fuses the pair into one when it loads
+#      the program — see binop_store in tac/ir.py).
 #
 #   3. Dead Code Elimination
 #      Remove instructions that appear after an unconditional jump (goto)
@@ -132,7 +136,10 @@ class TACOptimizer:
 
             # Replace the binop with a plain assign
             dest = instr["dest"]
-            self.instructions[i] = {"op": "assign", "dest": dest, "src": str(result)}
+            folded = {"op": "assign", "dest": dest, "src": str(result)}
+            if "line" in instr:
+                folded["line"] = instr["line"]
+            self.instructions[i] = folded
             self.stats["constant_folds"] += 1
             self.log.append(
                 f"Constant fold: {dest} = {left_val} {operator} {right_val}  →  {dest} = {result}"
@@ -233,6 +240,9 @@ class TACOptimizer:
 
         Transformation: replace the binop/unary dest with x directly,
         and remove the assign instruction.
+
+        A temp copied into an array element (array_store) is kept: the
+        store has no expression form to fold the binop into.
         """
         # Count uses of every name as a SOURCE across the instruction list
         use_count: Dict[str, int] = {}
@@ -241,8 +251,8 @@ class TACOptimizer:
                 val = instr.get(field)
                 if isinstance(val, str):
                     use_count[val] = use_count.get(val, 0) + 1
-            # Also count uses in view/write args
-            for a in instr.get("args", []):
+            # Also count uses in view/write args and array subscripts
+            for a in instr.get("args", []) + instr.get("indices", []):
                 if isinstance(a, str):
                     use_count[a] = use_count.get(a, 0) + 1
 
@@ -1,7 +1,12 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 import re
 import math
 
+from .budget import CHECK_INTERVAL, Clock, ExecutionBudget, LimitExceeded, limit_report
+from .ir import _NOT_LITERAL, _TYPED_BINOPS, Const, Global, Indexed, Instr, Member, Program, Temp, Var, lower
+from .profiler import Profiler
+from .run_state import STATE_VERSION, StateReader, StateWriter
+
 
 # ---------------------------------------------------------------------------
 # ActivationRecord  —  one stack frame for a function call
@@ -17,8 +22,12 @@ class ActivationRecord:
     return_addr  — instruction index to resume after this call returns.
     return_dest  — name of the caller's temporary to store the return value.
     return_value — the value produced by 'home' (return), or None.
+    cells        — memory cells in use when the call was made; the ones
+                   counted while it ran are released when it returns.
     """
 
+    cells = 0
+
     def __init__(self, func_name: str, return_addr: int, return_dest: Optional[str]):
         self.func_name = func_name
         self.local_memory: Dict[str, Any] = {}
@@ -27,6 +36,86 @@ class ActivationRecord:
         self.return_value = None
 
 
+# ---------------------------------------------------------------------------
+# Flat-key index  —  which element/member keys exist for a base variable
+#
+# Struct members (and arrays inside structs) are stored under flat keys such
+# as "s.x" or "s.arr[2]".  Deciding whether such a key belongs to global
+# memory needs "does global memory hold any key starting with s. / arr[",
+# so the global mapping indexes every flat key under its prefix (the key up
+# to and including its first "[" or ".") as it is stored.
+# ---------------------------------------------------------------------------
+
+def flat_prefix(key: str) -> Optional[str]:
+    """"arr[" for "arr[3]", "s." for "s.arr[1]"; None for a plain name."""
+    i = key.find("[")
+    j = key.find(".")
+    if i < 0:
+        i = j
+    elif 0 <= j < i:
+        i = j
+    return None if i < 0 else key[:i + 1]
+
+
+class GlobalMemory(dict):
+    """The global variable dict, with an index of its flat keys.
+
+    prefixes maps "arr[" / "s." to the set of flat keys stored under that
+    prefix, so the number of elements/members of a base variable held in
+    global memory is len(prefixes.get(prefix, ())).  Only item assignment
+    and deletion are used on global memory, and both keep the index current.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.prefixes: Dict[str, Set[str]] = {}
+
+    def __setitem__(self, key, value):
+        if "[" in key or "." in key:
+            self.prefixes.setdefault(flat_prefix(key), set()).add(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        if "[" in key or "." in key:
+            self.prefixes[flat_prefix(key)].discard(key)
+
+
+# ---------------------------------------------------------------------------
+# Suspended  —  pausing a run and picking it up again
+#
+# step(n) runs the program in slices: the run stops after n instructions
+# (at a budget checkpoint placed there), or when a write() finds no input
+# left.  Stopping raises Suspended, which unwinds the run loops; everything
+# needed to continue is interpreter state already (pc, call stack,
+# memories, stdin queue, iteration count), plus how far the global
+# initialisation got — which is also what snapshot() saves.  Continuing
+# re-enters the run loop at pc, whatever the call depth, so execution —
+# iteration accounting included — is the same as a run that never paused.
+# A write() that paused is run again, from the start, once it has all its
+# input.  stream() is step() in a generator.
+# ---------------------------------------------------------------------------
+
+class Suspended(Exception):
+    """Unwinds the run loops when a run pauses.
+
+    prompt is the input request of the write() that paused, or None for a
+    pause between two instructions.  The run loop that catches it first
+    rewinds pc and the iteration count to the instruction to run next and
+    sets saved.
+    """
+
+    def __init__(self, prompt: Optional[dict] = None):
+        super().__init__()
+        self.prompt = prompt
+        self.saved = False
+
+
+class RuntimeFault(Exception):
+    """An error that halts the run: a bad array subscript.  Its message is
+    the run's last runtime error; the output printed before it is kept."""
+
+
 # ---------------------------------------------------------------------------
 # TACInterpreter
 # ---------------------------------------------------------------------------
@@ -34,38 +123,82 @@ class ActivationRecord:
 class TACInterpreter:
     """Executes a list of TAC instruction dicts produced by TACGenerator.
 
+    The dicts are lowered to typed, linked instructions (see ir.py) once,
+    here; the run loop executes those.  pc indexes that code, which has no
+    label / func_begin: those are not executed, nor counted as executed.
+
     Usage
     -----
         interp = TACInterpreter(instructions)
         result = interp.run()
         print(result["output"])   # list of output lines
         print(result["memory"])   # final global memory state
+
+        for event, data in TACInterpreter(instructions).stream():
+            ...                   # output as it is produced, input on demand
+
+        status = interp.step(10_000)     # or run in slices, saving the state
+        state = interp.snapshot()        # between them (see step / snapshot)
+
+    An ExecutionBudget (see budget.py) bounds the run; without one only
+    MAX_ITERATIONS applies.  With profile=True the result also has a
+    "profile" (see profiler.py).
     """
 
     # Maximum loop iterations before the interpreter aborts (infinite loop guard)
     MAX_ITERATIONS = 10_000_000
 
-    def __init__(self, instructions: List[dict], stdin: List[str] = []):
+    # Maximum active calls when the budget sets no max_call_depth
+    MAX_CALL_DEPTH = 10_000
+
+    # Instructions stream() runs between two looks for output
+    STREAM_SLICE = 65_536
+
+    def __init__(self, instructions: List[dict], stdin: List[str] = [],
+                 budget: Optional[ExecutionBudget] = None, profile: bool = False):
         self.instructions = instructions
 
         # ── runtime state ─────────────────────────────────────────────────
-        self.global_memory: Dict[str, Any] = {}   # global variables
+        self.global_memory: Dict[str, Any] = GlobalMemory()   # global variables
         self.call_stack: List[ActivationRecord] = []  # function call stack
         self.output: List[str] = []               # accumulated view() output
         self.runtime_errors: List[str] = []       # non-fatal runtime errors
         self._stdin: List[str] = list(stdin)          # pre-supplied input values (queue)
 
         # ── control flow ──────────────────────────────────────────────────
-        self.pc: int = 0                          # program counter (index into instructions)
+        self.pc: int = 0                          # program counter (index into the linked code)
         self._iteration_count: int = 0
-
-        # Pre-build a label → pc index map for O(1) jump resolution
+        self._stage: str = "new"                  # → "globals" → "blueprint" → "done"
+        self._global_pc: int = 0                  # next global initialisation instruction (code index)
+
+        # ── pausing (see step()) ──────────────────────────────────────────
+        self._pausing: bool = False               # write() waits for input instead of defaulting
+        self._pause_at: Optional[int] = None      # iteration count the current step ends at
+        self._streamed: int = 0                   # output lines already passed on
+
+        # ── execution budget ──────────────────────────────────────────────
+        self.budget: ExecutionBudget = budget or ExecutionBudget()
+        self.limit: Optional[dict] = None         # report of the limit hit, if any
+        self._faulted = False                     # halted by a RuntimeFault
+        self._max_instructions: int = (self.MAX_ITERATIONS
+                                       if self.budget.max_instructions is None
+                                       else self.budget.max_instructions)
+        self._max_cells: Optional[int] = self.budget.max_memory_cells
+        self._cells: int = 0      # cells in use, counted under a memory limit
+        self._max_depth: int = (self.MAX_CALL_DEPTH
+                                if self.budget.max_call_depth is None
+                                else self.budget.max_call_depth)
+        self._clock: Optional[Clock] = None       # set by run() under a time limit
+        self._check_at: int = self._max_instructions
+        self._output_bytes: int = 0
+
+        # label → index in instructions (jumps are linked from it)
         self._label_map: Dict[str, int] = {}
         for idx, instr in enumerate(instructions):
             if instr.get("op") == "label":
                 self._label_map[instr["name"]] = idx
 
-        # Pre-build a func_name → pc index map for O(1) function lookup
+        # func_name → index of its func_begin in instructions
         self._func_map: Dict[str, int] = {}
         for idx, instr in enumerate(instructions):
             if instr.get("op") == "func_begin":
@@ -84,6 +217,15 @@ class TACInterpreter:
         # on every instruction execution inside tight loops.
         self._literal_cache: Dict[str, Any] = {}
 
+        # The instructions with their operands classified, literals parsed
+        # and jumps linked
+        self._program: Program = lower(instructions, self._literal)
+        self._ir: List[Instr] = self._program.code
+
+        # ── profiling ─────────────────────────────────────────────────────
+        self.profiler: Optional[Profiler] = (Profiler(len(self._ir))
+                                             if profile else None)
+
     # ── public entry point ────────────────────────────────────────────────────
 
     def run(self) -> dict:
@@ -93,29 +235,251 @@ class TACInterpreter:
         -------
         {
             "output":  list[str]   — lines printed by view()
-            "memory":  dict        — final global memory state
+            "memory":  dict        — final global memory state, arrays
+                                     under flat keys (arr[0], ...)
             "errors":  list[str]   — runtime error messages
+            "limit":   dict | None — the budget limit that was hit
+                                     (see budget.limit_report)
+            "profile": dict        — profile=True only (see Profiler.report)
         }
         """
-        self.pc = 0
-        self._iteration_count = 0
+        self._start()
+        try:
+            self._execute_program()
+        except LimitExceeded as exc:
+            self._limit_exceeded(exc)
+        except RuntimeFault as exc:
+            self._fault(exc)
+        if self.profiler is not None:
+            self.profiler.pause()
+        return self._result()
+
+    def stream(self):
+        """Execute all instructions as a generator of events.
+
+        Yields
+        ------
+        ("output", list[str])  — view() lines produced since the last event
+        ("input",  dict)       — a write() argument has no input left:
+                                 {"name": <variable>, "spec": "#d", ...};
+                                 send() the raw input string to continue
+        ("done",   dict)       — the result dict of run(), last
+
+        Pre-supplied stdin is used first.  The program runs STREAM_SLICE
+        instructions at a time and output is passed on after each slice,
+        so a long-running program's output arrives while it runs.  Time
+        spent waiting for input does not count against the time limit.
+        """
+        while True:
+            status = self.step(self.STREAM_SLICE)
+            if status["output"]:
+                yield ("output", status["output"])
+            if status["status"] == "done":
+                break
+            if status["status"] == "input":
+                self.send_input((yield ("input", status["prompt"])))
+        yield ("done", status["result"])
 
-        # Execute globals first (instructions before any func_begin)
-        # Then look for blueprint() and call it as the entry point.
-        self._execute_globals()
-        self._call_blueprint()
+    def step(self, max_steps: int) -> dict:
+        """Run at most `max_steps` more instructions, then pause.
 
-        # If runtime errors occurred, discard the output — it is incomplete
-        # or produced from invalid state and would mislead the user.
-        final_output = [] if self.runtime_errors else list(self.output)
+        The first call starts the run; a write() with no input left pauses
+        it early.  Between calls the interpreter can be saved with
+        snapshot() and continued elsewhere with restore().
 
+        Returns
+        -------
+        {
+            "status":  "running" | "input" | "done"
+            "output":  list[str]   — view() lines produced during this step
+            "prompt":  dict | None — "input": the write() argument waiting,
+                                     {"name": ..., "spec": ...}; send_input()
+                                     and step again
+            "result":  dict | None — "done": the result dict of run()
+        }
+        """
+        if self._stage == "new":
+            self._pausing = True
+            self._start()
+        prompt = None
+        if self._stage != "done":
+            self._pause_at = self._iteration_count + max_steps
+            self._check_at = self._next_check(self._iteration_count)
+            if self._clock is not None:
+                self._clock.resume()
+            if self.profiler is not None:
+                self.profiler.resume(self.call_stack)
+            try:
+                self._execute_program()
+            except Suspended as exc:
+                prompt = exc.prompt
+            except LimitExceeded as exc:
+                self._limit_exceeded(exc)
+                self._stage = "done"
+            except RuntimeFault as exc:
+                self._fault(exc)
+                self._stage = "done"
+            finally:
+                self._pause_at = None
+                if self._clock is not None:
+                    self._clock.pause()
+                if self.profiler is not None:
+                    self.profiler.pause()
+
+        output = self.output[self._streamed:]
+        self._streamed = len(self.output)
+        done = self._stage == "done"
         return {
+            "status": "done" if done else "input" if prompt is not None else "running",
+            "output": output,
+            "prompt": prompt,
+            "result": self._result() if done else None,
+        }
+
+    def send_input(self, value: Any):
+        """Queue one input value (as typed) for write()."""
+        self._stdin.append("" if value is None else str(value))
+
+    def snapshot(self) -> dict:
+        """The state of a run that is paused between steps, as
+        JSON-compatible data (see run_state.py).
+
+        Covers the memories, call stack, pc, remaining stdin, output and
+        counters; not the instructions (restore onto an interpreter built
+        from the same ones), rand()'s generator nor the profile.  Positions
+        (pc, return addresses) are indexes into the instruction list, not
+        into the linked code.
+        """
+        writer = StateWriter()
+        state = {
+            "version":    STATE_VERSION,
+            "stage":      self._stage,
+            "global_pc":  self._program.index(self._global_pc),
+            "pc":         self._program.index(self.pc),
+            "iterations": self._iteration_count,
+            "elapsed":    self._clock.elapsed() if self._clock is not None else 0.0,
+            "stdin":      list(self._stdin),
+            "output":     list(self.output),
+            "streamed":   self._streamed,
+            "output_bytes": self._output_bytes,
+            "errors":     list(self.runtime_errors),
+            "limit":      self.limit,
+            "faulted":    self._faulted,
+            "cells":      self._cells,
+            "globals":    writer.memory(self.global_memory),
+            "calls":      [{"func":        record.func_name,
+                            "return_addr": self._program.index(record.return_addr),
+                            "return_dest": record.return_dest,
+                            "cells":       record.cells,
+                            "memory":      writer.memory(record.local_memory)}
+                           for record in self.call_stack],
+        }
+        state["arrays"] = writer.arrays
+        return state
+
+    def restore(self, state: dict):
+        """Continue a snapshot() on this interpreter, which must be new and
+        built from the same instructions; step() goes on from there."""
+        if state.get("version") != STATE_VERSION:
+            raise ValueError(f"unsupported run state version {state.get('version')!r}")
+        reader = StateReader(state["arrays"])
+        self._pausing = True
+        self._stage = state["stage"]
+        self._global_pc = self._program.pcs[state["global_pc"]]
+        self.pc = self._program.pcs[state["pc"]]
+        self._iteration_count = state["iterations"]
+        if self.budget.max_seconds is not None:
+            self._clock = Clock(self.budget.max_seconds, state["elapsed"])
+            self._clock.pause()
+        # In place: compiled code holds on to these lists.
+        self._stdin[:] = state["stdin"]
+        self.output[:] = state["output"]
+        self._streamed = state["streamed"]
+        self._output_bytes = state["output_bytes"]
+        self.runtime_errors[:] = state["errors"]
+        self.limit = state["limit"]
+        self._faulted = state.get("faulted", False)
+        self._cells = state.get("cells", 0)
+        reader.memory(state["globals"], self.global_memory)
+        for call in state["calls"]:
+            record = self._new_record(call["func"], self._program.pcs[call["return_addr"]],
+                                      call["return_dest"])
+            record.cells = call.get("cells", 0)
+            reader.memory(call["memory"], record.local_memory)
+            self.call_stack.append(record)
+
+    @property
+    def executed(self) -> int:
+        """Instructions executed so far (the global initialisation is not counted)."""
+        return self._iteration_count
+
+    def _start(self):
+        self.pc = 0
+        self._iteration_count = 0
+        self.limit = None
+        self._faulted = False
+        self._stage = "globals"
+        self._global_pc = 0
+        if self.budget.max_seconds is not None:
+            self._clock = Clock(self.budget.max_seconds)
+        if self.profiler is not None:
+            self.profiler.resume(self.call_stack)
+        self._check_at = self._next_check(0)
+
+    def _limit_exceeded(self, exc: LimitExceeded):
+        if self.limit is None:
+            self.limit = exc.report
+        self.runtime_errors.append(str(exc))
+
+    def _fault(self, exc: RuntimeFault):
+        self.runtime_errors.append(str(exc))
+        self._faulted = True
+
+    def _result(self) -> dict:
+        # If runtime errors occurred, discard the output — it is incomplete
+        # or produced from invalid state and would mislead the user.  The
+        # fault a run halted at does not count: everything before it ran
+        # normally.
+        errors = self.runtime_errors[:-1] if self._faulted else self.runtime_errors
+        final_output = [] if errors else list(self.output)
+
+        # Arrays are reported element by element, under their flat keys
+        # (arr[0], grid[1][2], ...), as before they were stored as lists.
+        memory: Dict[str, Any] = {}
+        for k, v in self.global_memory.items():
+            if not k.startswith("t"):               # hide temporaries
+                self._flatten(k, v, memory)
+
+        result = {
             "output": final_output,
-            "memory": {k: self._serialize(v)
-                       for k, v in self.global_memory.items()
-                       if not k.startswith("t")},   # hide temporaries
+            "memory": memory,
             "errors": list(self.runtime_errors),
+            "limit": self.limit,
         }
+        if self.profiler is not None:
+            result["profile"] = self.profiler.report(self.instructions,
+                                                     self._program.members)
+        return result
+
+    # ── program ───────────────────────────────────────────────────────────────
+
+    def _execute_program(self):
+        """Execute globals first (instructions before any func_begin), then
+        look for blueprint() and call it as the entry point.
+
+        After a Suspended, calling it again continues where the run paused.
+        """
+        if self.call_stack:
+            # Paused inside a call: finish it, then go on from the
+            # instruction (a global initialiser, or blueprint) that made it.
+            self._resume()
+            if self._stage == "globals":
+                self._global_pc += 1
+        if self._stage == "globals":
+            self._execute_globals()
+            self._stage = "blueprint"
+            self._call_blueprint()
+        self._stage = "done"
 
     # ── global initialisation ─────────────────────────────────────────────────
 
@@ -125,16 +489,21 @@ class TACInterpreter:
         These are global variable initialisations emitted by TACGenerator
         for the 'roof' declarations.
         """
-        for idx, instr in enumerate(self.instructions):
-            if instr.get("op") == "func_begin":
-                break
+        while self._global_pc < self._program.globals_end:
+            instr = self._ir[self._global_pc]
+            if self.profiler is not None:
+                self.profiler.hits[self._global_pc] += 1
             self._execute_one(instr, self.global_memory)
+            if self.call_stack:
+                # An initialiser called a function: run it to completion.
+                self._run_calls(1)
+            self._global_pc += 1
 
     def _call_blueprint(self):
         """Find and call the blueprint() entry point, if it exists."""
         if "blueprint" not in self._func_map:
             return
-        self._call_function("blueprint", [], dest=None, return_addr=len(self.instructions))
+        self._call_function("blueprint", [], dest=None, return_addr=len(self._ir))
 
     # ── main execution loop ───────────────────────────────────────────────────
 
@@ -142,38 +511,92 @@ class TACInterpreter:
                        dest: Optional[str], return_addr: int):
         """Set up an activation record and run the function body.
 
-        This is a direct (non-recursive) interpreter loop — function bodies
-        are executed inline by manipulating self.pc, not by recursing in Python.
-        We push an ActivationRecord and then continue the main loop.
+        Used for the entry point; the call instruction only pushes the
+        record (see _run_calls).
+        """
+        if self._push_call(func_name, args, dest, return_addr):
+            # Run until the call stack is back to its pre-call depth
+            self._run_calls(len(self.call_stack))
+
+    def _push_call(self, func_name: str, args: List[Any],
+                   dest: Optional[str], return_addr: int) -> bool:
+        """Push the activation record of a call and point pc at its body.
+
+        Returns False, with a runtime error, for an undefined function.
         """
         if func_name not in self._func_map:
             self.runtime_errors.append(f"Runtime error: undefined function '{func_name}'")
-            return
+            return False
 
         func_pc = self._func_map[func_name]
         func_instr = self.instructions[func_pc]
         param_names = func_instr.get("params", [])
+        self._check_depth(len(self.call_stack) + 1)
 
-        record = ActivationRecord(func_name, return_addr, dest)
+        record = self._new_record(func_name, return_addr, dest)
         # Bind arguments to parameter names
         for i, pname in enumerate(param_names):
             record.local_memory[pname] = args[i] if i < len(args) else 0
 
         self.call_stack.append(record)
-        self.pc = func_pc + 1  # start executing just after func_begin
-
-        # Run until the call stack is back to its pre-call depth
-        depth = len(self.call_stack)
-        while self.pc < len(self.instructions) and len(self.call_stack) >= depth:
-            self._iteration_count += 1
-            if self._iteration_count > self.MAX_ITERATIONS:
-                self.runtime_errors.append(
-                    "Infinite loop detected"
-                )
-                break
-            instr = self.instructions[self.pc]
-            self.pc += 1
-            self._execute_one(instr, self._current_memory())
+        if self.profiler is not None:
+            self.profiler.switch(self.call_stack)
+        self.pc = self._program.entry[func_name]  # the body, after func_begin
+        return True
+
+    def _run_calls(self, depth: int):
+        """Run from self.pc until the call stack drops below `depth` (the
+        call at that depth has returned) or the program ends.
+
+        This is the only run loop, whatever the call depth: call pushes an
+        ActivationRecord and points pc at the callee's body, return and
+        func_end pop it and point pc back at the caller, so an arCh call
+        costs no Python frame and recursion is bounded by the call depth
+        limit, not by Python's stack."""
+        hits = self.profiler.hits if self.profiler is not None else None
+        code = self._ir
+        try:
+            while self.pc < len(code) and len(self.call_stack) >= depth:
+                self._iteration_count += 1
+                if self._iteration_count > self._check_at:
+                    if self._check_budget(self._iteration_count):
+                        self._loop_detected(self._iteration_count, depth)
+                        break
+                    self._check_at = self._next_check(self._iteration_count)
+                instr = code[self.pc]
+                if hits is not None:
+                    hits[self.pc] += 1
+                self.pc += 1
+                self._execute_one(instr, self._current_memory())
+        except Suspended as exc:
+            if not exc.saved:
+                exc.saved = True
+                self._iteration_count -= 1
+                if exc.prompt is not None:
+                    self.pc -= 1        # the write() runs again
+                    if hits is not None:
+                        hits[self.pc] -= 1
+            raise
+
+    def _resume(self):
+        """Continue a paused run: re-enter the run loop at pc."""
+        self._run_calls(1)
+
+    def _loop_detected(self, count: int, depth: int):
+        """The instruction limit was hit at iteration `count`: report
+        "Infinite loop detected" once per call active since the run loop
+        started at `depth`, each taking one more tick — as when every call
+        had a run loop of its own."""
+        frames = len(self.call_stack) - depth + 1
+        self.runtime_errors.extend(["Infinite loop detected"] * frames)
+        self._iteration_count = count + frames - 1
+
+    def _new_record(self, func_name: str, return_addr: int,
+                    return_dest: Optional[str]) -> ActivationRecord:
+        """An empty activation record for a call to `func_name`."""
+        record = ActivationRecord(func_name, return_addr, return_dest)
+        record.cells = self._cells
+        return record
 
     def _current_memory(self) -> Dict[str, Any]:
         """Return the local memory dict of the current activation record."""
@@ -181,66 +604,167 @@ class TACInterpreter:
             return self.call_stack[-1].local_memory
         return self.global_memory
 
+    # ── execution budget ──────────────────────────────────────────────────────
+
+    def _next_check(self, count: int) -> int:
+        """The iteration count past which the run loop calls _check_budget.
+
+        Without a time limit that is the instruction limit itself (or the
+        end of the current step), so the loop does no more work than the
+        plain MAX_ITERATIONS guard."""
+        check = self._max_instructions
+        if self._pause_at is not None:
+            check = min(check, self._pause_at)
+        if self._clock is not None:
+            check = min(check, count + CHECK_INTERVAL)
+        return check
+
+    def _check_budget(self, count: int) -> bool:
+        """Called once the iteration count passes the checkpoint.
+
+        Returns True when the instruction limit is exceeded — the run loop
+        then reports "Infinite loop detected" and stops, as before.  Raises
+        LimitExceeded when the time limit is, and Suspended at the end of a
+        step."""
+        if count > self._max_instructions:
+            if self.limit is None:
+                self.limit = limit_report("max_instructions", self._max_instructions,
+                                          self._max_instructions)
+            return True
+        if self._pause_at is not None and count > self._pause_at:
+            raise Suspended()
+        if self._clock is not None:
+            self._clock.check()
+        return False
+
+    def _check_depth(self, depth: int):
+        """Raise LimitExceeded when `depth` active calls exceed the budget
+        (or MAX_CALL_DEPTH)."""
+        if depth > self._max_depth:
+            raise LimitExceeded("max_call_depth", self._max_depth, depth)
+
+    def _check_cells(self, cells: int):
+        """Count `cells` new cells as in use until the running call returns;
+        raise LimitExceeded when the cells in use exceed the budget."""
+        if self._max_cells is not None:
+            self._cells += cells
+            if self._cells > self._max_cells:
+                raise LimitExceeded("max_memory_cells", self._max_cells, self._cells)
+
+    def _check_size(self, value: Any):
+        """_check_cells for a value built at run time (strings, lists)."""
+        if isinstance(value, (str, list)):
+            self._check_cells(len(value))
+
+    def _emit(self, line: str):
+        """Append one line of view() output, within the output budget."""
+        budget = self.budget
+        if budget.max_output_lines is not None and len(self.output) >= budget.max_output_lines:
+            raise LimitExceeded("max_output_lines", budget.max_output_lines,
+                                len(self.output) + 1)
+        if budget.max_output_bytes is not None:
+            self._output_bytes += len(line.encode("utf-8"))
+            if self._output_bytes > budget.max_output_bytes:
+                raise LimitExceeded("max_output_bytes", budget.max_output_bytes,
+                                    self._output_bytes)
+        self.output.append(line)
+
     # ── single instruction execution ─────────────────────────────────────────
 
-    def _execute_one(self, instr: dict, mem: Dict[str, Any]):
-        """Execute one TAC instruction dict in the context of `mem`."""
-        op = instr.get("op", "")
+    def _execute_one(self, instr: Instr, mem: Dict[str, Any]):
+        """Execute one lowered TAC instruction in the context of `mem`."""
+        op = instr.op
 
         # ── data movement ─────────────────────────────────────────────────
         if op == "assign":
-            dest = instr["dest"]
-            val = self._resolve(instr["src"], mem)
-            # If dest contains subscripts with variable indices (e.g. "arr[i]"),
-            # resolve the index variables to build the correct flat key.
-            if "[" in dest:
-                dest = self._resolve_dest_key(dest, mem)
+            dest = instr.dest
+            val = self._value(instr.src, mem)
+            # A subscripted dest (e.g. "arr[i]") resolves its index
+            # variables to build the correct flat key.
+            target, key = self._dest(dest, mem)
             # Implicit type conversion when dest_type annotation is present
-            dest_type = instr.get("dest_type")
-            if dest_type:
-                val = self._coerce_to_type(val, dest_type)
-            self._target_mem(dest, mem)[dest] = val
+            if instr.dest_type:
+                val = self._coerce_to_type(val, instr.dest_type)
+            target[key] = val
+
+        elif op in _TYPED_BINOPS:
+            # Both operand types known statically (see ir.py): skip
+            # _apply_binop's type dispatch when the values agree.
+            left  = self._value(instr.left,  mem)
+            right = self._value(instr.right, mem)
+            result = self._apply_typed(instr, left, right)
+            dest = instr.dest
+            if dest.__class__ is Temp:
+                mem[dest.name] = result
+            else:
+                target, key = self._dest(dest, mem)
+                target[key] = result
 
         elif op == "binop":
-            left  = self._resolve(instr["left"],  mem)
-            right = self._resolve(instr["right"], mem)
-            result = self._apply_binop(instr["operator"], left, right)
-            dest = instr["dest"]
-            if "[" in dest:
-                dest = self._resolve_dest_key(dest, mem)
-            self._target_mem(dest, mem)[dest] = result
+            left  = self._value(instr.left,  mem)
+            right = self._value(instr.right, mem)
+            result = self._apply_binop(instr.operator, left, right)
+            dest = instr.dest
+            if dest.__class__ is Temp:
+                mem[dest.name] = result
+            else:
+                target, key = self._dest(dest, mem)
+                target[key] = result
 
         elif op == "unary":
-            operand = self._resolve(instr["operand"], mem)
-            result  = self._apply_unary(instr["operator"], operand)
-            dest = instr["dest"]
-            if "[" in dest:
-                dest = self._resolve_dest_key(dest, mem)
-            self._target_mem(dest, mem)[dest] = result
+            operand = self._value(instr.operand, mem)
+            result  = self._apply_unary(instr.operator, operand)
+            target, key = self._dest(instr.dest, mem)
+            target[key] = result
 
         # ── control flow ──────────────────────────────────────────────────
-        elif op == "label":
-            pass  # labels are no-ops during execution
-
+        # (labels are linked away: see ir.lower)
         elif op == "jump":
-            self._jump_to(instr["target"])
+            self._jump_to(instr.target)
 
         elif op == "jump_if":
-            cond = self._resolve(instr["cond"], mem)
+            cond = self._value(instr.cond, mem)
             if self._is_truthy(cond):
-                self._jump_to(instr["target"])
+                self._jump_to(instr.target)
 
         elif op == "jump_if_false":
-            cond = self._resolve(instr["cond"], mem)
+            cond = self._value(instr.cond, mem)
             if not self._is_truthy(cond):
-                self._jump_to(instr["target"])
+                self._jump_to(instr.target)
+
+        # ── fused sequences (see ir.lower) ────────────────────────────────
+        elif op == "cmp_jump":
+            left  = self._value(instr.left,  mem)
+            right = self._value(instr.right, mem)
+            if self._is_truthy(self._apply_typed(instr, left, right)) == instr.when:
+                self.pc = instr.target
+
+        elif op == "inc_var":
+            if instr.copy is not None:
+                self._value(instr.copy, mem)    # the dead copy still reads x
+            left = self._value(instr.left, mem)
+            step = instr.right.value
+            if left.__class__ is int and step.__class__ is int:
+                result = left + step if instr.operator == "+" else left - step
+            else:
+                result = self._apply_binop(instr.operator, left, step)
+            target, key = self._dest(instr.dest, mem)
+            target[key] = result
+            if instr.target is not None:
+                self.pc = instr.target
+
+        elif op == "binop_store":
+            left  = self._value(instr.left,  mem)
+            right = self._value(instr.right, mem)
+            val = self._apply_typed(instr, left, right)
+            indices = [self._value(i, mem) for i in instr.indices]
+            self._array_store(instr.array, self._value(instr.base, mem), indices, val)
 
         # ── function call ─────────────────────────────────────────────────
         elif op == "call":
-            func_name = instr["func"]
-            raw_args  = instr.get("args", [])
-            arg_vals  = [self._resolve(a, mem) for a in raw_args]
-            dest      = instr.get("dest")
+            func_name = instr.func
+            arg_vals  = [self._value(a, mem) for a in instr.args]
+            dest      = instr.dest
 
             result = self._try_builtin(func_name, arg_vals, mem)
             if result is not None:
@@ -248,18 +772,16 @@ class TACInterpreter:
                 if dest:
                     mem[dest] = result
             else:
-                # User-defined function — save current pc as return address
-                return_addr = self.pc
-                self._call_function(func_name, arg_vals, dest=dest,
-                                    return_addr=return_addr)
+                # User-defined function — save current pc as return address;
+                # the run loop goes on in the callee's body.
+                self._push_call(func_name, arg_vals, dest, self.pc)
 
         # ── I/O ───────────────────────────────────────────────────────────
         elif op == "view":
-            fmt      = instr.get("fmt", "")
-            raw_args = instr.get("args", [])
-            arg_vals = [self._resolve(a, mem) for a in raw_args]
+            fmt      = instr.fmt
+            arg_vals = [self._value(a, mem) for a in instr.args]
             line     = self._format_view(fmt, arg_vals)
-            self.output.append(line)
+            self._emit(line)
 
         elif op == "write":
             # ── write() handler ──────────────────────────────────────────────
@@ -269,12 +791,19 @@ class TACInterpreter:
             # Spec K.2 §13 / F.9 — brick array with #s:
             #   When #s is used with a bare brick array name (e.g. write("#s", chars)),
             #   the runtime reads a wall (string) input and stores each character
-            #   as ord(char) into sequential flat keys: chars[0], chars[1], ...
+            #   as ord(char) into the array's elements: chars[0], chars[1], ...
             #   This enables mutable character arrays for string manipulation.
-            raw_args = instr.get("args", [])
-            fmt = instr.get("fmt", "")
+            raw_args = instr.args
+            fmt = instr.fmt
             # Parse format specifiers to match each arg to its expected type
             specs = self._spec_re.findall(fmt)
+            if self._pausing and len(self._stdin) < len(raw_args):
+                # Streaming: wait until every argument has its input.
+                i = len(self._stdin)
+                raise Suspended({
+                    "name": (instr.names or raw_args)[i],
+                    "spec": specs[i] if i < len(specs) else specs[0] if specs else "#d",
+                })
             for i, arg in enumerate(raw_args):
                 # Resolve variable indices in destination key (e.g. "A[i]" → "A[3]")
                 dest = self._resolve_dest_key(arg, mem) if "[" in arg else arg
@@ -286,35 +815,25 @@ class TACInterpreter:
                 elif "[" in dest:
                     # For array flat keys, check if any existing key for this
                     # base lives in global memory (e.g. "arr[0]" already there)
-                    if base_name not in mem and any(
-                        k.startswith(base_name + "[") for k in self.global_memory
-                    ):
-                        target_mem = self.global_memory
-                # Also check for bare array name (no subscript) that has flat
-                # keys in memory — needed for brick[] #s detection below.
-                elif "[" not in dest:
-                    if any(k.startswith(dest + "[") for k in self.global_memory):
+                    if base_name not in mem and self.global_memory.prefixes.get(base_name + "["):
                         target_mem = self.global_memory
-                    elif any(k.startswith(dest + "[") for k in mem):
-                        pass  # target_mem stays as local mem
 
                 spec = specs[i] if i < len(specs) else specs[0] if specs else "#d"
                 kind = spec[-1]  # d, f, c, s, b
 
                 # ── Spec K.2 §13 / F.9: brick array with #s ──────────────────
-                # Detect: kind is 's' AND dest is a bare name (no subscript)
-                # AND flat keys like dest[0] exist in memory → brick array input.
-                # Store each character of the input string as ord(char) into
-                # sequential flat keys: dest[0], dest[1], ...
-                is_brick_array_s = False
+                # Detect: kind is 's' AND dest names an array (a list in
+                # local or global memory) → brick array input.  Store each
+                # character of the input string as ord(char) into the
+                # array's elements: dest[0], dest[1], ...
+                brick_array = None
                 if kind == "s" and "[" not in dest:
-                    # Check if flat keys for this array exist in target memory
-                    first_key = f"{dest}[0]"
-                    if first_key in target_mem:
-                        is_brick_array_s = True
-                    elif target_mem is not self.global_memory and first_key in self.global_memory:
-                        target_mem = self.global_memory
-                        is_brick_array_s = True
+                    value = mem.get(dest)
+                    if value is None and mem is not self.global_memory:
+                        value = self.global_memory.get(dest)
+                    if isinstance(value, list):
+                        brick_array = value
+                is_brick_array_s = brick_array is not None
 
                 if self._stdin:
                     raw = self._stdin.pop(0)
@@ -322,16 +841,9 @@ class TACInterpreter:
                         if is_brick_array_s:
                             # Spec K.2 §13 / F.5: store string char-by-char into brick array.
                             # Cap at the declared array size to prevent out-of-bounds writes.
-                            # The array size is determined by counting existing flat keys
-                            # (e.g. word[0]..word[5] → size 6) which were emitted by the
-                            # TAC generator's default-init pass.
-                            prefix = dest + "["
-                            arr_size = sum(1 for k in target_mem if k.startswith(prefix))
-                            if arr_size == 0:
-                                arr_size = len(raw)  # fallback: no limit known
-                            max_chars = min(len(raw), arr_size - 1)  # leave room for null terminator
+                            max_chars = min(len(raw), len(brick_array) - 1)  # leave room for null terminator
                             for ci in range(max_chars):
-                                target_mem[f"{dest}[{ci}]"] = ord(raw[ci])
+                                brick_array[ci] = ord(raw[ci])
                         elif kind == "s":
                             target_mem[dest] = raw
                         elif kind == "c":
@@ -370,11 +882,13 @@ class TACInterpreter:
 
         # ── return ────────────────────────────────────────────────────────
         elif op == "return":
-            val = instr.get("value")
-            ret_val = self._resolve(val, mem) if val is not None else None
+            ret_val = self._value(instr.value, mem)
 
             if self.call_stack:
                 record = self.call_stack.pop()
+                self._cells = record.cells
+                if self.profiler is not None:
+                    self.profiler.switch(self.call_stack)
                 record.return_value = ret_val
                 # Write return value into the caller's destination temp
                 if record.return_dest is not None:
@@ -383,25 +897,37 @@ class TACInterpreter:
                 # Resume at return address
                 self.pc = record.return_addr
 
-        # ── array / struct reads ─────────────────────────────────────────
-        elif op == "array_read":
-            src = instr["src"]
-            val = self._resolve_complex(src, mem)
-            mem[instr["dest"]] = val
-
-        elif op == "struct_read":
-            src = instr["src"]
-            val = self._resolve_complex(src, mem)
-            mem[instr["dest"]] = val
-
-        # ── function begin / end ─────────────────────────────────────────
-        elif op == "func_begin":
-            pass  # handled by _call_function setup
-
+        # ── arrays ────────────────────────────────────────────────────────
+        elif op == "array_alloc":
+            default = self._value(instr.default, mem)
+            mem[instr.dest] = self._new_array(instr.dims, default)
+
+        elif op == "array_load":
+            name = instr.array
+            indices = [self._value(i, mem) for i in instr.indices]
+            mem[instr.dest] = self._array_load(name, self._value(instr.base, mem), indices)
+
+        elif op == "array_store":
+            name = instr.array
+            val = self._value(instr.src, mem)
+            indices = [self._value(i, mem) for i in instr.indices]
+            if instr.dest_type:
+                val = self._coerce_to_type(val, instr.dest_type)
+            self._array_store(name, self._value(instr.base, mem), indices, val)
+
+        # ── array / struct reads (flat keys) ────────────────────────────
+        elif op == "array_read" or op == "struct_read":
+            val = self._read_complex(instr.src, mem)
+            mem[instr.dest] = val
+
+        # ── function end ─────────────────────────────────────────────────
         elif op == "func_end":
             # Implicit void return if we fall off the end
             if self.call_stack:
                 record = self.call_stack.pop()
+                self._cells = record.cells
+                if self.profiler is not None:
+                    self.profiler.switch(self.call_stack)
                 if record.return_dest is not None:
                     caller_mem = self._current_memory()
                     caller_mem[record.return_dest] = None
@@ -409,6 +935,19 @@ class TACInterpreter:
 
     # ── value resolution ──────────────────────────────────────────────────────
 
+    def _value(self, operand: Any, mem: Dict[str, Any]) -> Any:
+        """The runtime value of a lowered operand (see ir.py): _resolve,
+        minus the lookups its tag rules out."""
+        if operand.__class__ is Const:
+            return operand.value
+        name = operand.name
+        if operand.__class__ is Global:
+            if name in self.global_memory:
+                return self.global_memory[name]
+        elif name in mem:
+            return mem[name]
+        return self._resolve(name, mem)
+
     def _resolve(self, operand: Any, mem: Dict[str, Any]) -> Any:
         """Resolve a TAC operand string to its runtime value.
 
@@ -433,6 +972,19 @@ class TACInterpreter:
         if mem is not self.global_memory and operand in self.global_memory:
             return self.global_memory[operand]
 
+        val = self._literal(operand)
+        if val is not _NOT_LITERAL:
+            return val
+
+        # Unresolved name
+        self.runtime_errors.append(
+            f"Runtime error: undefined variable '{operand}'"
+        )
+        return 0
+
+    def _literal(self, operand: str) -> Any:
+        """Return the value of a literal operand (True / False, "wall",
+        'b', integer, float), or _NOT_LITERAL.  Results are cached."""
         # Check literal cache before re-parsing
         if operand in self._literal_cache:
             return self._literal_cache[operand]
@@ -475,12 +1027,22 @@ class TACInterpreter:
             return val
         except ValueError:
             pass
+        return _NOT_LITERAL
 
-        # Unresolved name
-        self.runtime_errors.append(
-            f"Runtime error: undefined variable '{operand}'"
-        )
-        return 0
+    def _dest(self, dest: Var, mem: Dict[str, Any]):
+        """(memory, key) that an assignment to the lowered `dest` writes."""
+        if dest.__class__ is Temp:
+            return mem, dest.name
+        key = self._dest_key(dest, mem) if dest.__class__ is Indexed else dest.name
+        return self._target_mem(key, mem), key
+
+    def _dest_key(self, dest: Indexed, mem: Dict[str, Any]) -> str:
+        """_resolve_dest_key for a lowered subscripted dest."""
+        resolved = []
+        for index in dest.indices:
+            idx = self._value(index, mem)
+            resolved.append(str(int(idx)) if isinstance(idx, (int, float)) else str(idx))
+        return dest.base + "".join(f"[{r}]" for r in resolved)
 
     def _resolve_dest_key(self, dest: str, mem: Dict[str, Any]) -> str:
         """Resolve variable indices in an assignment destination key.
@@ -523,50 +1085,41 @@ class TACInterpreter:
             return self.global_memory
         if "[" in dest or "." in dest:
             prefix = base + "[" if "[" in dest else base + "."
-            for k in self.global_memory:
-                if k.startswith(prefix):
-                    return self.global_memory
+            if self.global_memory.prefixes.get(prefix):
+                return self.global_memory
         return mem
 
-    def _resolve_complex(self, src: str, mem: Dict[str, Any]) -> Any:
-        """Resolve array subscript or struct member access strings.
+    def _read_complex(self, src: Any, mem: Dict[str, Any]) -> Any:
+        """Read the lowered src of array_read / struct_read.
 
-        "arr[2]"      → mem["arr"][2]   (or dict key if arr is a dict)
-        "arr[i]"      → mem["arr"][resolve("i")]
-        "arr[i][j]"   → nested access
-        "s.field"     → mem["s"]["field"]  or  mem["s.field"]
+        Member  "s.field"    → mem["s.field"]  or  mem["s"]["field"]
+        Indexed "arr[i][j]"  → mem["arr[3][1]"]  or nested access into
+                               mem["arr"] (a wall gives the ord of a char)
+        anything else        → a plain operand
         """
         # Struct access: name.member
-        if "." in src and "[" not in src:
+        if src.__class__ is Member:
             # First try: flat key "s.field" in local then global memory
-            if src in mem:
-                return mem[src]
-            if mem is not self.global_memory and src in self.global_memory:
-                return self.global_memory[src]
+            key = src.name
+            if key in mem:
+                return mem[key]
+            if mem is not self.global_memory and key in self.global_memory:
+                return self.global_memory[key]
             # Second try: base is a dict object
-            parts = src.split(".", 1)
-            base_val = mem.get(parts[0])
+            base_val = mem.get(src.base)
             if base_val is None and mem is not self.global_memory:
-                base_val = self.global_memory.get(parts[0])
+                base_val = self.global_memory.get(src.base)
             if isinstance(base_val, dict):
-                return base_val.get(parts[1], 0)
+                return base_val.get(src.member, 0)
             return 0
 
         # Array access: name[idx] or name[i][j]
-        match = re.match(r'^(\w+)((?:\[[^\]]+\])+)$', src)
-        if match:
-            base_name = match.group(1)
-            indices_str = match.group(2)
-            index_exprs = re.findall(r'\[([^\]]+)\]', indices_str)
-
+        if src.__class__ is Indexed:
             # First try: resolve indices and build a flat key for lookup.
             # TAC stores array elements as flat keys like "arr[0]" or "arr[1][2]".
-            resolved_indices = []
-            for idx_expr in index_exprs:
-                idx = self._resolve(idx_expr.strip(), mem)
-                resolved_indices.append(idx)
+            resolved_indices = [self._value(i, mem) for i in src.indices]
 
-            flat_key = base_name + "".join(f"[{i}]" for i in resolved_indices)
+            flat_key = src.base + "".join(f"[{i}]" for i in resolved_indices)
             # Check flat key in local memory, then global
             if flat_key in mem:
                 return mem[flat_key]
@@ -574,7 +1127,7 @@ class TACInterpreter:
                 return self.global_memory[flat_key]
 
             # Second try: base is an actual list/dict object in memory
-            base_val = self._resolve(base_name, mem)
+            base_val = self._resolve(src.base, mem)
 
             # Wall character indexing: wall[i] → ord of character at index
             if isinstance(base_val, str):
@@ -599,7 +1152,55 @@ class TACInterpreter:
             return 0
 
         # Plain name
-        return self._resolve(src, mem)
+        return self._value(src, mem)
+
+    # ── arrays ───────────────────────────────────────────────────────────────
+
+    def _new_array(self, dims: List[int], default: Any) -> list:
+        """A nested list of the given dimensions filled with `default`."""
+        if self._max_cells is not None:
+            self._check_cells(math.prod(dims))
+        return self._filled(dims, default)
+
+    def _filled(self, dims: List[int], default: Any) -> list:
+        if len(dims) == 1:
+            return [default] * dims[0]
+        return [self._filled(dims[1:], default) for _ in range(dims[0])]
+
+    def _array_index(self, name: str, container: Any, index: Any) -> int:
+        """Validate one subscript of `name`; raises RuntimeFault, which halts
+        the run, when it is not a usable index into `container`."""
+        if not isinstance(container, list):
+            raise RuntimeFault(f"Runtime error: '{name}' is not an array")
+        try:
+            i = int(index)
+        except (TypeError, ValueError):
+            raise RuntimeFault(f"Runtime error: invalid index '{index}' for '{name}'") from None
+        if not 0 <= i < len(container):
+            raise RuntimeFault(f"Runtime error: index {i} out of bounds for '{name}'")
+        return i
+
+    def _array_load(self, name: str, base: Any, indices: List[Any]) -> Any:
+        """arr[i] / arr[i][j]; a bad subscript halts the run (_array_index).
+
+        A wall value indexes its characters: wall[i] → ord of that character
+        (0 when out of range)."""
+        if isinstance(base, str):
+            try:
+                idx = int(indices[0])
+            except (TypeError, ValueError):
+                return 0
+            return ord(base[idx]) if 0 <= idx < len(base) else 0
+        for index in indices:
+            base = base[self._array_index(name, base, index)]
+        return base
+
+    def _array_store(self, name: str, base: Any, indices: List[Any], val: Any):
+        """arr[i] = val / arr[i][j] = val; a bad subscript halts the run
+        before anything is written."""
+        for index in indices[:-1]:
+            base = base[self._array_index(name, base, index)]
+        base[self._array_index(name, base, indices[-1])] = val
 
     # ── implicit type conversion ─────────────────────────────────────────────
 
@@ -663,12 +1264,20 @@ class TACInterpreter:
             if operator == "+":
                 # String concatenation if either operand is a str
                 if isinstance(left, str) or isinstance(right, str):
-                    return str(left) + str(right)
-                return left + right
+                    result = str(left) + str(right)
+                else:
+                    result = left + right
+                if self._max_cells is not None:
+                    self._check_size(result)
+                return result
             if operator == "-":
                 return left - right
             if operator == "*":
-                return left * right
+                # wall * tile repeats the wall
+                result = left * right
+                if self._max_cells is not None:
+                    self._check_size(result)
+                return result
             if operator == "/":
                 if right == 0:
                     self.runtime_errors.append(
@@ -712,6 +1321,21 @@ class TACInterpreter:
             return 0
         return 0
 
+    def _apply_typed(self, instr: Instr, left: Any, right: Any) -> Any:
+        """The binop of `instr` (a typed binop, cmp_jump or binop_store) by
+        its typed function when it has one and the operands are of its
+        class, else by _apply_binop."""
+        typed = instr.typed
+        if typed is not None and left.__class__ is typed[0] and right.__class__ is typed[0]:
+            try:
+                result = typed[1](left, right)
+            except (ZeroDivisionError, ValueError):
+                return self._apply_binop(instr.operator, left, right)
+            if typed[0] is str and self._max_cells is not None:
+                self._check_size(result)
+            return result
+        return self._apply_binop(instr.operator, left, right)
+
     def _apply_unary(self, operator: str, operand: Any) -> Any:
         """Apply a unary operator to a resolved Python value."""
         try:
@@ -738,14 +1362,13 @@ class TACInterpreter:
 
     # ── control flow helpers ──────────────────────────────────────────────────
 
-    def _jump_to(self, label: str):
-        """Set the program counter to the instruction after the named label."""
-        if label in self._label_map:
-            # pc will be incremented by the caller's loop, so point TO the label
-            # instruction (which is a no-op) — the next iteration will advance past it
-            self.pc = self._label_map[label]
+    def _jump_to(self, target: Any):
+        """Set the program counter to a linked jump target: the instruction
+        after the label, or the name of a label that is not defined."""
+        if target.__class__ is int:
+            self.pc = target
         else:
-            self.runtime_errors.append(f"Runtime error: undefined label '{label}'")
+            self.runtime_errors.append(f"Runtime error: undefined label '{target}'")
 
     # ── built-in function dispatch ────────────────────────────────────────────
 
@@ -769,7 +1392,7 @@ class TACInterpreter:
         if func_name == "view":
             fmt = str(args[0]) if args else ""
             line = self._format_view(fmt, args[1:])
-            self.output.append(line)
+            self._emit(line)
             return None  # void
 
         if func_name == "write":
@@ -908,6 +1531,14 @@ class TACInterpreter:
 
     # ── serialisation for the API response ───────────────────────────────────
 
+    def _flatten(self, key: str, value: Any, out: Dict[str, Any]):
+        """out[key] = the serialised value; a list under key[0], key[1], ..."""
+        if isinstance(value, list):
+            for i, element in enumerate(value):
+                self._flatten(f"{key}[{i}]", element, out)
+        else:
+            out[key] = self._serialize(value)
+
     def _serialize(self, value: Any) -> Any:
         """Convert a Python runtime value to a JSON-serialisable form."""
         if isinstance(value, bool):
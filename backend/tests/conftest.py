@@ -0,0 +1,46 @@
+import os
+import sys
+
+import pytest
+
+# The backend modules import each other flat (from tac.engines import ...),
+# as they do when the server is started from backend/.
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+PROGRAMS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "programs")
+
+
+def _program_names():
+    return sorted(name for name in os.listdir(PROGRAMS) if name.endswith(".arch"))
+
+
+def pytest_generate_tests(metafunc):
+    """A test that takes `source` runs once for each programs/*.arch file
+    (`name` is the file's name)."""
+    if "source" in metafunc.fixturenames:
+        names = _program_names()
+        sources = []
+        for name in names:
+            with open(os.path.join(PROGRAMS, name), encoding="utf-8") as f:
+                sources.append(f.read())
+        if "name" in metafunc.fixturenames:
+            metafunc.parametrize("name, source", list(zip(names, sources)), ids=names)
+        else:
+            metafunc.parametrize("source", sources, ids=names)
+
+
+@pytest.fixture
+def compiled():
+    """compiled(source) -> the CompileArtifacts of a source the pipeline
+    accepts (fails the test on compile errors)."""
+    import api
+    from compile_cache import CompileArtifacts, source_key
+
+    def compile_source(source: str):
+        entry = CompileArtifacts(source_key(source), source)
+        errors = api._compile(entry)
+        assert not errors, errors
+        return entry
+
+    return compile_source
@@ -0,0 +1,15 @@
+from artifact_store import ArtifactStore
+
+
+def test_overwriting_a_key_keeps_the_byte_count(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    record = {"tac": ["t1 = 1 + 2"], "summary": {"folded": 1}}
+    store.put("key", record)
+    written = store.stats()["bytes"]
+    assert written > 0
+
+    store.put("key", record)
+    assert store.stats()["bytes"] == written
+    assert store.stats()["writes"] == 2
+    assert store.get("key") == record
+    assert ArtifactStore(str(tmp_path)).stats()["bytes"] == written
@@ -0,0 +1,84 @@
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+from lexer.lexer import normalize_source
+
+client = TestClient(api.app)
+
+
+def _lex(**body):
+    response = client.post("/lex", json=body)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _edits(source: str, count: int, seed: int = 0):
+    """Random (start, deleted, inserted) edits, applied in turn to `source`:
+    typing, deleting and pasting pieces of the program back in.  Offsets
+    are into the normalized source, as the session keeps it."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        start = rng.randint(0, len(source))
+        deleted = rng.choice([0, 0, 1, 1, 2, 5, 20])
+        deleted = min(deleted, len(source) - start)
+        at = rng.randint(0, len(source))
+        inserted = rng.choice(["", "x", " ", "\n", ";", "1", "\"", "/*", "tile ",
+                               "\ufeff", source[at:at + rng.randint(1, 30)]])
+        source = normalize_source(source[:start] + inserted + source[start + deleted:])
+        yield start, deleted, inserted, source
+
+
+def test_session_edits_lex_like_whole_sources(source):
+    """Every edit returns exactly what /lex gives for the whole new source."""
+    opened = _lex(source=source, incremental=True)
+    plain = _lex(source=source)
+    assert opened["version"] == 0
+    assert (opened["tokens"], opened["errors"]) == (plain["tokens"], plain["errors"])
+    session = opened["session"]
+    for version, (start, deleted, inserted, edited) in enumerate(_edits(source, 60)):
+        result = _lex(session=session, version=version,
+                      edit={"start": start, "deleted": deleted, "inserted": inserted})
+        plain = _lex(source=edited)
+        assert result["session"] == session and result["version"] == version + 1
+        assert (result["tokens"], result["errors"]) == (plain["tokens"], plain["errors"])
+
+
+@pytest.mark.parametrize("text, edit", [
+    ("x\ufefftile a;", {"start": 0, "deleted": 1}),           # BOM moved to the front
+    ("tile a;", {"start": 0, "inserted": "\ufeff\ufeffx"}),  # inserted there
+    ("tile a;", {"start": 4, "inserted": "\ufeff"}),         # mid-source: kept
+])
+def test_edits_strip_a_leading_bom_like_whole_sources(text, edit):
+    session = _lex(source=text, incremental=True)["session"]
+    result = _lex(session=session, version=0, edit=edit)
+    start, deleted = edit["start"], edit.get("deleted", 0)
+    plain = _lex(source=text[:start] + edit.get("inserted", "") + text[start + deleted:])
+    assert (result["tokens"], result["errors"]) == (plain["tokens"], plain["errors"])
+
+
+def test_stale_unknown_and_bad_edits_are_refused():
+    session = _lex(source="tile x;", incremental=True)["session"]
+    edit = {"start": 0, "deleted": 4, "inserted": "glass"}
+    assert _lex(session=session, version=0, edit=edit)["version"] == 1
+
+    assert client.post("/lex", json={"session": session, "version": 0, "edit": edit}).status_code == 409
+    assert client.post("/lex", json={"session": "nope", "version": 0, "edit": edit}).status_code == 404
+    outside = {"start": 3, "deleted": 50}
+    assert client.post("/lex", json={"session": session, "version": 1, "edit": outside}).status_code == 422
+    assert client.post("/lex", json={"session": session, "edit": edit}).status_code == 422
+    assert client.post("/lex", json={}).status_code == 422
+
+    # A refused edit leaves the session where it was.
+    assert _lex(session=session, version=1, edit={"start": 0, "inserted": " "})["version"] == 2
+
+
+@pytest.mark.parametrize("field, value", [("start", -1), ("deleted", -2)])
+def test_negative_edit_offsets_get_422(field, value):
+    session = _lex(source="tile x;", incremental=True)["session"]
+    edit = {"start": 0, "deleted": 0, "inserted": ""}
+    edit[field] = value
+    response = client.post("/lex", json={"session": session, "version": 0, "edit": edit})
+    assert response.status_code == 422
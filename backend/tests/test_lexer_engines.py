@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from lexer.engines import LEXER_ENGINES
+from lexer.lexer import Lexer
+
+ENGINES = ["table", "regex"]
+
+# Pieces of arCh, near-misses and junk; random runs of them hit keyword
+# prefixes, number limits, unterminated literals and comments, and
+# characters outside the language.
+FRAGMENTS = [
+    "beam", "blueprint", "brick", "cement", "crack", "do", "door", "else",
+    "for", "field", "fragile", "glass", "ground", "home", "house", "if",
+    "mend", "roof", "room", "solid", "tile", "view", "wall", "while", "write",
+    "rite", "be", "bl", "wh", "x", "abc", "_a", "a1234567890123456789",
+    "abcdefghijklmnopqrstuvwxyz",
+    "0", "1", "007", "123", "12345678", "123456789012345", "1234567890123456",
+    "1.5", "0.0", "3.14159265", "1.00000000", "12345678.5", "9.", ".5",
+    "=", "==", "+", "++", "+=", "-", "--", "-=", "*", "*=", "/", "/=", "%",
+    "%=", ">", ">=", "<", "<=", "!", "!=", "&", "&&", "|", "||",
+    "{", "}", "(", ")", "[", "]", ".", ",", ":", ";",
+    " ", "  ", "\t", "\n", "\r\n",
+    "'a'", "'\\n'", "'ab'", "'\\q'", "'", "\"hi\"", "\"a\\nb\"", "\"\\q\"", "\"",
+    "//c\n", "// x", "/* c */", "/* \n */", "/*", "*/",
+    "@", "#", "$", "?", "\\", "^", "`", "~", "é", "€", "\u00a0", "\u200b", "\ufeff",
+]
+
+
+def _scan(cls, source):
+    lexer = cls(source)
+    tokens = lexer.scanTokens()
+    return (tokens, lexer.errors, lexer.id_table,
+            lexer.line, lexer.column, lexer.pos)
+
+
+def _fragments(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        sep = rng.choice(["", " "])
+        yield sep.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 25)))
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engine_matches_state_machine_on_programs(engine, source):
+    """Tokens, errors, identifier table and final position all equal the
+    hand-written machine's, on each program and each of its prefixes."""
+    cls = LEXER_ENGINES[engine]
+    for end in [len(source)] + list(range(0, len(source), 7)):
+        assert _scan(cls, source[:end]) == _scan(Lexer, source[:end])
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engine_matches_state_machine_on_fragments(engine):
+    cls = LEXER_ENGINES[engine]
+    for source in _fragments(3000):
+        assert _scan(cls, source) == _scan(Lexer, source), source
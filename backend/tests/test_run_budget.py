@@ -0,0 +1,22 @@
+import copy
+import os
+
+import pytest
+
+import api
+from tac.engines import RUNTIME_ENGINES, make_interpreter
+
+PROGRAMS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "programs")
+
+
+@pytest.mark.parametrize("engine", list(RUNTIME_ENGINES))
+def test_default_budget_reports_infinite_loops(compiled, engine):
+    """Under the default /run budget a non-terminating program runs into
+    the instruction limit, whatever the engine's speed: no time limit
+    pre-empts the loop detector."""
+    with open(os.path.join(PROGRAMS, "inf.arch"), encoding="utf-8") as f:
+        instructions = compiled(f.read()).opt_instructions
+    budget = api._run_budget(None)
+    result = make_interpreter(copy.deepcopy(instructions), [], engine, budget).run()
+    assert result["errors"] == ["Infinite loop detected"] * 2     # f() and blueprint()
+    assert result["limit"]["limit"] == "max_instructions"
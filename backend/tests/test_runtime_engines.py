@@ -0,0 +1,175 @@
+import copy
+import inspect
+import json
+import random
+from functools import partial
+
+import pytest
+
+from tac import ir, tac_runtime
+from tac.budget import ExecutionBudget
+from tac.engines import RUNTIME_ENGINES, make_interpreter
+
+# Input for write(); programs/inf.arch never stops, so every run is bounded.
+STDIN = ["5", "7", "abc", "1", "2", "3"]
+BUDGET = ExecutionBudget(max_instructions=20_000)
+
+FUSED_LOOP = """
+tile blueprint() {
+    tile a[4];
+    tile i = 0;
+    for (i = 0; i < 4; i++) {
+        a[i] = i * 2;
+    }
+    view("#d\\n", a[3]);
+    home 0;
+}
+"""
+
+
+def _final_state(interp, result):
+    return (result, interp.output, interp._iteration_count,
+            repr(interp.global_memory), len(interp.call_stack))
+
+
+def _run(instructions, engine):
+    random.seed(7)
+    interp = make_interpreter(copy.deepcopy(instructions), list(STDIN),
+                              engine, BUDGET)
+    return _final_state(interp, interp.run())
+
+
+def _listings(compiled, source):
+    entry = compiled(source)
+    return {"tac": entry.tac, "optimized": entry.opt_instructions}
+
+
+# ── fusion and engines ───────────────────────────────────────────────────
+
+@pytest.mark.parametrize("listing", ["tac", "optimized"])
+def test_engines_match_unfused_dict_engine(compiled, source, listing, monkeypatch):
+    """Fused sequences and the compiled engine change how a listing runs,
+    never what it does: the dict engine with fusion off is the reference.
+    A fused instruction counts as one, so only the instruction counts of
+    fused and unfused runs differ."""
+    instructions = _listings(compiled, source)[listing]
+    with monkeypatch.context() as m:
+        m.setattr(tac_runtime, "lower", partial(ir.lower, fuse=False))
+        reference = _run(instructions, "dict")
+        assert _run(instructions, "compiled") == reference
+    fused = _run(instructions, "dict")
+    assert _run(instructions, "compiled") == fused
+    assert fused[:2] + fused[3:] == reference[:2] + reference[3:]
+
+
+def test_loops_fuse(compiled):
+    """A counted loop storing into an array uses all three fused ops."""
+    instructions = compiled(FUSED_LOOP).opt_instructions
+    interp = RUNTIME_ENGINES["dict"](copy.deepcopy(instructions), [])
+    assert {"cmp_jump", "inc_var", "binop_store"} <= {ins.op for ins in interp._ir}
+
+
+TYPED_OPS = """
+glass ratio(glass x, glass y) {
+    home x / y;
+}
+
+tile blueprint() {
+    tile i = 0;
+    tile s = 0;
+    for (i = 1; i < 20; i++) {
+        s = s + i % 7;
+    }
+    view("#d #.2f\\n", s, ratio(3.0, 2.0));
+    home 0;
+}
+"""
+
+
+def _operator_of(interp, op):
+    """The operator function the compiled closure of the first `op`
+    instruction applies."""
+    pc = next(pc for pc, ins in enumerate(interp._ir) if ins.op == op)
+    return inspect.getclosurevars(interp._code[pc]).nonlocals["fn"]
+
+
+def test_compiled_engine_specializes_typed_binops(compiled):
+    instructions = compiled(TYPED_OPS).opt_instructions
+    interp = RUNTIME_ENGINES["compiled"](copy.deepcopy(instructions), [])
+    for op in ("mod_tile", "div_glass"):
+        assert _operator_of(interp, op).__name__ == "typed_op"
+
+    untyped = [{k: v for k, v in d.items() if k != "typed_op"} for d in instructions]
+    plain = RUNTIME_ENGINES["compiled"](copy.deepcopy(untyped), [])
+    assert _operator_of(plain, "binop").__name__ != "typed_op"
+    assert interp.run()["output"] == plain.run()["output"] == ["57 1.50\n"]
+
+
+# ── arrays ───────────────────────────────────────────────────────────────
+
+OUT_OF_BOUNDS = """
+roof tile g[2] = {4, 5};
+
+tile blueprint() {
+    tile a[3];
+    tile i = 0;
+    view("start\\n");
+    for (i = 0; i < 6; i++) {
+        a[i] = i;
+    }
+    view("never\\n");
+    home 0;
+}
+"""
+
+
+@pytest.mark.parametrize("engine", list(RUNTIME_ENGINES))
+def test_out_of_bounds_halts_the_run(compiled, engine):
+    """The first bad subscript is reported once and stops the run; the
+    output printed before it is kept."""
+    instructions = compiled(OUT_OF_BOUNDS).opt_instructions
+    result = make_interpreter(copy.deepcopy(instructions), [], engine).run()
+    assert result["errors"] == ["Runtime error: index 3 out of bounds for 'a'"]
+    assert result["output"] == ["start\n"]
+
+
+@pytest.mark.parametrize("engine", list(RUNTIME_ENGINES))
+def test_result_memory_keeps_flat_array_keys(compiled, engine):
+    instructions = compiled(OUT_OF_BOUNDS).opt_instructions
+    result = make_interpreter(copy.deepcopy(instructions), [], engine).run()
+    assert result["memory"] == {"g[0]": 4, "g[1]": 5}
+
+
+# ── snapshots ────────────────────────────────────────────────────────────
+
+def _sliced(instructions, engines, rng):
+    """Run in random slices of step(), moving the run to a new interpreter
+    through a JSON round trip of snapshot() after every slice."""
+    random.seed(7)
+    stdin = list(STDIN)
+    output = []
+    k = 0
+    interp = make_interpreter(copy.deepcopy(instructions), [], engines[0], BUDGET)
+    while True:
+        status = interp.step(rng.randint(1, 40))
+        output.extend(status["output"])
+        if status["status"] == "done":
+            break
+        if status["status"] == "input":
+            interp.send_input(stdin.pop(0) if stdin else "")
+        state = json.loads(json.dumps(interp.snapshot()))
+        k += 1
+        interp = make_interpreter(copy.deepcopy(instructions), [],
+                                  engines[k % 2], BUDGET)
+        interp.restore(state)
+    assert output == interp.output
+    return _final_state(interp, status["result"])
+
+
+@pytest.mark.parametrize("engines", [("dict", "dict"),
+                                     ("compiled", "compiled"),
+                                     ("dict", "compiled")])
+def test_snapshot_round_trip(compiled, source, engines):
+    instructions = compiled(source).opt_instructions
+    reference = _run(instructions, "dict")
+    assert _sliced(instructions, engines, random.Random(3)) == reference
@@ -0,0 +1,170 @@
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, Sequence
+
+# ---------------------------------------------------------------------------
+# Worker process pool for the compile / run pipelines.
+#
+# The lexer, parser, semantic analyzer and interpreter are CPU-bound pure
+# Python, so requests handled in uvicorn's threadpool serialize on the GIL.
+# A WorkerPool runs jobs (module-level functions and picklable arguments) in
+# separate processes instead, so throughput scales with cores.
+#
+# Workers are spawned (the same start method on every platform, and safe in
+# a threaded server) when the pool starts, and each imports the `warm`
+# modules up front, so the first request does not pay for loading the
+# compiler.  Workers are recycled to bound what a long-lived process
+# accumulates (its own compile cache, heap growth): after workers × max_jobs
+# jobs a fresh set is started and warmed in the background, then takes over
+# while the old set finishes the jobs it already has.  (The executor's own
+# max_tasks_per_child is not used: it can hang under concurrent load on
+# Python 3.11.)
+#
+# A worker that dies mid-job (killed for memory, crashed) breaks the whole
+# executor; the pool swaps in a fresh one and the jobs that were in flight
+# fail with WorkerCrashed.
+#
+# With a `collect` function, each job also runs collect() in the worker once
+# it is done and hands the result to merge() in the server: this is how the
+# workers' metrics reach the server's /metrics.
+# ---------------------------------------------------------------------------
+
+logger = logging.getLogger("arCh")
+
+
+class WorkerCrashed(RuntimeError):
+    """The worker process running a job died before finishing it."""
+
+
+def _init_worker(warm: Sequence[str]):
+    # Ctrl-C reaches the whole process group; shutting down is the server's job.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for name in warm:
+        importlib.import_module(name)
+
+
+def _ping() -> None:
+    return None
+
+
+def _job(fn: Callable[..., Any], args: tuple, collect: Callable[[], Any]):
+    return fn(*args), collect()
+
+
+class WorkerPool:
+    """Process pool with warm-started workers, recycled in sets.
+
+    Usage
+    -----
+        pool = WorkerPool(workers=4, max_jobs=1000, warm=["api"])
+        await pool.start()
+        result = await pool.run(api._run_pipeline, body)
+        pool.shutdown()
+
+    collect (a module-level function, run in the worker after each job) and
+    merge (run in the server with what collect returned) carry per-job
+    side data back, such as metrics.
+    """
+
+    def __init__(self, workers: int, max_jobs: int = 0, warm: Sequence[str] = (),
+                 collect: Optional[Callable[[], Any]] = None,
+                 merge: Optional[Callable[[Any], None]] = None):
+        self.workers = workers
+        self.max_jobs = max_jobs        # per worker; 0 = never recycle
+        self.warm = tuple(warm)
+        self.collect = collect
+        self.merge = merge
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._renewal: Optional[asyncio.Task] = None
+        self._since_renewal = 0
+        self._jobs = 0
+        self._renewals = 0
+        self._crashes = 0
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.warm,),
+        )
+
+    async def _started(self) -> ProcessPoolExecutor:
+        """A new executor with every worker up (imports done)."""
+        executor = self._new_executor()
+        # Each submit that finds no idle worker spawns one.
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.gather(*[loop.run_in_executor(executor, _ping)
+                                   for _ in range(self.workers)])
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        return executor
+
+    async def start(self):
+        self._executor = await self._started()
+        logger.info(f"Worker pool: {self.workers} processes ready")
+
+    def shutdown(self):
+        if self._renewal is not None:
+            self._renewal.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """fn(*args) in a worker process."""
+        executor = self._executor
+        self._jobs += 1
+        self._since_renewal += 1
+        if (self.max_jobs and self._renewal is None
+                and self._since_renewal >= self.max_jobs * self.workers):
+            self._renewal = asyncio.ensure_future(self._renew())
+        try:
+            if self.collect is None:
+                return await asyncio.wrap_future(executor.submit(fn, *args))
+            result, collected = await asyncio.wrap_future(
+                executor.submit(_job, fn, args, self.collect))
+        except BrokenProcessPool:
+            self._replace(executor)
+            raise WorkerCrashed("worker process died while running the job") from None
+        self.merge(collected)
+        return result
+
+    async def _renew(self):
+        try:
+            fresh = await self._started()
+        except BrokenProcessPool:
+            # The next job tries again.
+            logger.error("Worker pool: starting replacement workers failed")
+            return
+        finally:
+            self._renewal = None
+        old, self._executor = self._executor, fresh
+        self._since_renewal = 0
+        self._renewals += 1
+        old.shutdown(wait=False)    # its queued jobs still run
+
+    def _replace(self, broken: ProcessPoolExecutor):
+        if self._executor is not broken:
+            return          # another failed job already replaced it
+        self._crashes += 1
+        logger.error("Worker pool: a worker died; restarting the pool")
+        self._executor = self._new_executor()
+        self._since_renewal = 0
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_jobs": self.max_jobs,
+            "jobs": self._jobs,
+            "renewals": self._renewals,
+            "crashes": self._crashes,
+        }
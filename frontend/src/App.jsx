@@ -101,6 +101,7 @@ function createInterpreter(instructions, onOutput, onInput) {
   const runtimeErrors = [];
   let pc = 0;
   let iterCount = 0;
+  let halted = false;   // a bad array subscript stops the run (Python RuntimeFault)
   const MAX_ITER = 10_000_000;
 
   // ── value resolution ──────────────────────────────────────────────────────
@@ -174,6 +175,54 @@ function createInterpreter(instructions, onOutput, onInput) {
     return base + parts.map(p => `[${p}]`).join("");
   }
 
+  // ── arrays (mirrors Python _new_array / _array_load / _array_store) ──────
+  function newArray(dims, dflt) {
+    if (dims.length === 1) return new Array(dims[0]).fill(dflt);
+    return Array.from({ length: dims[0] }, () => newArray(dims.slice(1), dflt));
+  }
+
+  // Validate one subscript; null (after reporting and halting) when unusable
+  function fault(message) {
+    runtimeErrors.push(message);
+    halted = true;
+    return null;
+  }
+
+  function arrayIndex(name, container, index) {
+    if (!Array.isArray(container))
+      return fault(`Runtime error: '${name}' is not an array`);
+    const i = Math.trunc(Number(index));
+    if (index === "" || index === null || Number.isNaN(i))
+      return fault(`Runtime error: invalid index '${index}' for '${name}'`);
+    if (i < 0 || i >= container.length)
+      return fault(`Runtime error: index ${i} out of bounds for '${name}'`);
+    return i;
+  }
+
+  // arr[i] / arr[i][j]; a wall value indexes its characters (char code)
+  function arrayLoad(name, base, indices) {
+    if (typeof base === "string") {
+      const idx = Math.trunc(Number(indices[0]));
+      return idx >= 0 && idx < base.length ? base.charCodeAt(idx) : 0;
+    }
+    for (const index of indices) {
+      const i = arrayIndex(name, base, index);
+      if (i === null) return 0;
+      base = base[i];
+    }
+    return base;
+  }
+
+  function arrayStore(name, base, indices, val) {
+    for (const index of indices.slice(0, -1)) {
+      const i = arrayIndex(name, base, index);
+      if (i === null) return;
+      base = base[i];
+    }
+    const i = arrayIndex(name, base, indices[indices.length - 1]);
+    if (i !== null) base[i] = val;
+  }
+
   // ── arithmetic ────────────────────────────────────────────────────────────
   // The optional `resultType` parameter carries the arCh expression type
   // from the semantic analyzer (e.g. "tile", "glass").  It is attached to
@@ -364,13 +413,13 @@ function createInterpreter(instructions, onOutput, onInput) {
 
   async function* execGen() {
     // execute globals (before first func_begin)
-    for (let i = 0; i < instructions.length; i++) {
+    for (let i = 0; i < instructions.length && !halted; i++) {
       if (instructions[i].op === "func_begin") break;
       yield* execOne(instructions[i], globalMem);
     }
 
     // call blueprint()
-    if (!("blueprint" in funcMap)) return;
+    if (halted || !("blueprint" in funcMap)) return;
     pc = funcMap["blueprint"] + 1;
     callStack.push({
       name: "blueprint",
@@ -379,7 +428,7 @@ function createInterpreter(instructions, onOutput, onInput) {
       returnDest: null,
     });
 
-    while (pc < instructions.length && callStack.length > 0) {
+    while (pc < instructions.length && callStack.length > 0 && !halted) {
       iterCount++;
       if (iterCount > MAX_ITER) {
         runtimeErrors.push("Infinite loop detected");
@@ -464,7 +513,7 @@ function createInterpreter(instructions, onOutput, onInput) {
       // Spec K.2 §13 / F.9 — brick array with #s:
       //   When #s is used with a bare brick array name, the runtime reads a
       //   wall (string) input and stores each character as its char code into
-      //   sequential flat keys: chars[0], chars[1], chars[2], ...
+      //   the array's elements: chars[0], chars[1], chars[2], ...
       const args = instr.args || [];
       const fmt = instr.fmt || "";
       let cleanFmt = fmt;
@@ -480,34 +529,24 @@ function createInterpreter(instructions, onOutput, onInput) {
         const kind = spec[spec.length - 1];
 
         // ── Spec K.2 §13 / F.9: detect brick array with #s ──────────────
-        // If kind is 's' and dest is a bare name (no subscript) and flat keys
-        // like dest[0] exist in memory, this is a brick array string input.
-        let isBrickArrayS = false;
-        let brickTargetMem = mem;   // where the brick array flat keys live
+        // If kind is 's' and dest is a bare name holding an array (local or
+        // global), this is a brick array string input.
+        let brickArray = null;
         if (kind === "s" && !dest.includes("[")) {
-          const firstKey = `${dest}[0]`;
-          if (firstKey in mem) {
-            isBrickArrayS = true;
-          } else if (mem !== globalMem && firstKey in globalMem) {
-            isBrickArrayS = true;
-            brickTargetMem = globalMem;
-          }
+          const value = dest in mem ? mem[dest] : globalMem[dest];
+          if (Array.isArray(value)) brickArray = value;
         }
 
         // Suspend — UI will resume us with the raw string the user typed
-        const raw = yield { signal: "INPUT", varName: dest, spec };
+        const raw = yield { signal: "INPUT", varName: instr.names?.[i] ?? dest, spec };
 
-        if (isBrickArrayS) {
+        if (brickArray) {
           // Spec K.2 §13 / F.5: store string char-by-char into brick array.
           // Cap at declared array size to prevent out-of-bounds writes.
-          // Array size = count of existing flat keys (e.g. word[0]..word[5] → 6).
           const str = String(raw);
-          const prefix = dest + "[";
-          const arrSize = Object.keys(brickTargetMem).filter(k => k.startsWith(prefix)).length
-                       || str.length; // fallback if no keys found
-          const maxChars = Math.min(str.length, arrSize - 1); // leave room for null terminator
+          const maxChars = Math.min(str.length, brickArray.length - 1); // leave room for null terminator
           for (let ci = 0; ci < maxChars; ci++) {
-            brickTargetMem[`${dest}[${ci}]`] = str.charCodeAt(ci);
+            brickArray[ci] = str.charCodeAt(ci);
           }
         } else {
           // Standard conversion per format specifier type
@@ -565,6 +604,18 @@ function createInterpreter(instructions, onOutput, onInput) {
         val = resolve(src, mem);
       }
       mem[instr.dest] = val;
+    } else if (op === "array_alloc") {
+      mem[instr.dest] = newArray(instr.dims, resolve(instr.default, mem));
+    } else if (op === "array_load") {
+      const indices = instr.indices.map((x) => resolve(x, mem));
+      const base = resolve(instr.array, mem);
+      mem[instr.dest] = arrayLoad(instr.array, base, indices);
+    } else if (op === "array_store") {
+      let val = resolve(instr.src, mem);
+      const indices = instr.indices.map((x) => resolve(x, mem));
+      if (instr.dest_type) val = coerceToType(val, instr.dest_type);
+      const base = resolve(instr.array, mem);
+      arrayStore(instr.array, base, indices, val);
     }
   }
 